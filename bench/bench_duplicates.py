@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+"""Benchmark for the duplicate finder on synthetic Genlog exports.
+
+Usage: bench_duplicates.py [number-of-records]
+
+Runs the duplicate finder on corpora of growing size, up to the
+given number of records (default: 100000), and prints the time
+per record, which should stay about the same.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License
+(https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from duplicates import find_duplicates
+from genlog_corpus import make_rtf
+from parse_family_data import parse_lines
+from strip_rtf import sanitize_links
+from striprtf.striprtf import rtf_to_text
+
+STEPS = 4
+
+
+def main(records=100000):
+    for step in range(1, STEPS + 1):
+        count = records * step // STEPS
+        people = parse_lines(rtf_to_text(sanitize_links(make_rtf(count))).split('\n'))
+        start = time.perf_counter()
+        candidates = find_duplicates(people)
+        elapsed = time.perf_counter() - start
+        print(f'{count:8} Datensätze: {elapsed:8.3f} s  {elapsed / count * 1e6:6.1f} µs/Datensatz  {len(candidates)} Kandidaten')
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
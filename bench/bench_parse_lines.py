@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""Benchmark for the record parser on a synthetic Genlog export.
+
+Usage: bench_parse_lines.py [number-of-records]
+
+Compares the table-driven parser with the former chain 
+of startswith tests on the text converted from a corpus with 
+the given number of records (default: 100000). 
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License 
+(https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from genlog_corpus import make_rtf
+from parse_family_data import EXPECT_CHILDREN
+from parse_family_data import EXPECT_DESC
+from parse_family_data import EXPECT_DOCUMENTS
+from parse_family_data import EXPECT_FATHER
+from parse_family_data import EXPECT_MOTHER
+from parse_family_data import EXPECT_NAME
+from parse_family_data import EXPECT_PROFESSION
+from parse_family_data import IMAGE_MARKER
+from parse_family_data import RECORD_MARKER
+from parse_family_data import Person
+from parse_family_data import append_item
+from parse_family_data import image_pattern
+from parse_family_data import iter_people
+from strip_rtf import sanitize_links
+from striprtf.striprtf import rtf_to_text
+
+
+def legacy_leave_state(state, person, text):
+    if state == EXPECT_NAME:
+        if text:
+            person.name = text.strip()
+    elif state == EXPECT_PROFESSION:
+        if text:
+            person.profession = text.strip()
+    elif state == EXPECT_DESC:
+        if text:
+            text = text.strip()
+            if text:
+                person.desc = append_item(person.desc, text)
+    elif state == EXPECT_FATHER:
+        if text:
+            person.father = sys.intern(text.strip())
+    elif state == EXPECT_MOTHER:
+        if text:
+            person.mother = sys.intern(text.strip())
+    elif state == EXPECT_CHILDREN:
+        if text:
+            person.children = [sys.intern(child) for child in text.split('\n')]
+    elif state == EXPECT_DOCUMENTS:
+        if text:
+            person.documents = [sys.intern(document) for document in text.split('\n')]
+
+
+def legacy_iter_people(lines, personClass=Person):
+    # The former parser, with a chain of startswith tests.
+    state = None
+    text = []
+    key = None
+    person = None
+    image = None
+    for line in lines:
+        if line.startswith(RECORD_MARKER):
+            if key:
+                yield key, person
+            person = personClass()
+            key = sys.intern(line[len(RECORD_MARKER):].strip())
+            legacy_leave_state(state, person, '')
+            state = EXPECT_NAME
+        elif line.startswith(IMAGE_MARKER):
+            image = image_pattern.search(line).group(1)
+            if image:
+                person.image = f'{image}.jpg'
+        elif line.startswith('oo'):
+            legacy_leave_state(state, person, '\n'.join(text))
+            state = EXPECT_DESC
+            text.clear()
+            person.spouses = append_item(person.spouses, sys.intern(line[2:].strip()))
+        elif line.startswith('*') and not person.birth:
+            legacy_leave_state(state, person, '\n'.join(text))
+            state = EXPECT_DESC
+            text.clear()
+            person.birth = line[1:].strip()
+        elif line.startswith('+') and not person.death:
+            legacy_leave_state(state, person, '\n'.join(text))
+            state = EXPECT_DESC
+            text.clear()
+            person.death = line[1:].strip()
+        elif line.startswith('Vater:'):
+            legacy_leave_state(state, person, '\n'.join(text))
+            state = EXPECT_FATHER
+            text.clear()
+        elif line.startswith('Mutter:'):
+            legacy_leave_state(state, person, '\n'.join(text))
+            state = EXPECT_MOTHER
+            text.clear()
+        elif line.startswith('Kinder:'):
+            legacy_leave_state(state, person, '\n'.join(text))
+            state = EXPECT_CHILDREN
+            text.clear()
+        elif line.startswith('Dokumente:'):
+            legacy_leave_state(state, person, '\n'.join(text))
+            state = EXPECT_DOCUMENTS
+            text.clear()
+        elif line and state == EXPECT_NAME:
+            legacy_leave_state(state, person, line)
+            state = EXPECT_PROFESSION
+            text.clear()
+        elif line and state == EXPECT_PROFESSION:
+            legacy_leave_state(state, person, line)
+            state = EXPECT_DESC
+            text.clear()
+        elif not line and state != EXPECT_NAME:
+            legacy_leave_state(state, person, '\n'.join(text))
+            state = EXPECT_DESC
+            text.clear()
+        else:
+            text.append(line)
+    if key:
+        yield key, person
+
+
+def measure(function, lines):
+    start = time.perf_counter()
+    records = list(function(lines))
+    return time.perf_counter() - start, records
+
+
+def get_fields(records):
+    return [(key, [getattr(person, name) for name in Person.__slots__]) for key, person in records]
+
+
+def main(records=100000):
+    lines = rtf_to_text(sanitize_links(make_rtf(records))).split('\n')
+    print(f'{records} Datensätze, {len(lines)} Zeilen')
+    legacy_time, legacy_records = measure(legacy_iter_people, lines)
+    fast_time, fast_records = measure(iter_people, lines)
+    if get_fields(fast_records) != get_fields(legacy_records):
+        sys.exit('Results differ!')
+
+    print(f'startswith chain: {legacy_time:8.3f} s')
+    print(f'table-driven:     {fast_time:8.3f} s')
+    print(f'speedup:          {legacy_time / fast_time:8.1f} x')
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""Benchmark for the parallel record parser on a synthetic Genlog export.
+
+Usage: bench_parse_parallel.py [number-of-records]
+
+Compares the serial parser with the process pool parser
+for 1 up to the number of CPUs, on the text converted from a corpus
+with the given number of records (default: 100000).
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License
+(https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from genlog_corpus import make_rtf
+from parse_family_data import Person
+from parse_family_data import parse_lines
+from parse_family_data import parse_text_parallel
+from strip_rtf import sanitize_links
+from striprtf.striprtf import rtf_to_text
+
+
+def get_fields(people):
+    return [(key, [getattr(person, name) for name in Person.__slots__]) for key, person in people.items()]
+
+
+def main(records=100000):
+    text = rtf_to_text(sanitize_links(make_rtf(records)))
+    cpus = os.cpu_count() or 1
+    print(f'{records} Datensätze, {cpus} CPUs')
+    start = time.perf_counter()
+    serial_people = parse_lines(text.split('\n'))
+    serial_time = time.perf_counter() - start
+    print(f'seriell:       {serial_time:8.3f} s')
+    for workers in range(1, cpus + 1):
+        start = time.perf_counter()
+        people = parse_text_parallel(text, workers=workers)
+        parallel_time = time.perf_counter() - start
+        if get_fields(people) != get_fields(serial_people):
+            sys.exit('Results differ!')
+
+        print(f'{workers:2} Prozesse:  {parallel_time:8.3f} s  ({serial_time / parallel_time:.1f} x)')
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""Measures the memory used per parsed person.
+
+Usage: bench_person_memory.py [number-of-persons]
+
+Parses a synthetic Genlog text export with the given number 
+of records (default: 100000) with the compact Person class 
+and with a plain class with instance dictionary and empty lists, 
+and prints the traced memory per person. 
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License 
+(https://opensource.org/licenses/mit-license.php)
+"""
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from parse_family_data import Person
+from parse_family_data import parse_lines
+
+
+class DictPerson:
+    # The former Person layout, with an instance dictionary and empty lists.
+
+    def __init__(self):
+        self.name = None
+        self.profession = None
+        self.desc = []
+        self.children = []
+        self.father = None
+        self.mother = None
+        self.birth = None
+        self.death = None
+        self.documents = []
+        self.spouses = []
+        self.image = None
+
+
+def make_lines(count):
+    rng = random.Random(1)
+    lines = []
+    for i in range(count):
+        lines.append(f'$#K Person_{i}')
+        lines.append(f'Nachname{i % 5000}, Vorname{i % 300}')
+        lines.append('Landwirt')
+        lines.append(f'* {rng.randint(1, 28)}.{rng.randint(1, 12)}.{rng.randint(1700, 1900)}')
+        lines.append(f'oo [[Person,{rng.randrange(count)}]]')
+        lines.append('Vater:')
+        lines.append(f'[[Person,{rng.randrange(count)}]]')
+        lines.append('Mutter:')
+        lines.append(f'[[Person,{rng.randrange(count)}]]')
+        lines.append('Kinder:')
+        for _ in range(rng.randint(0, 4)):
+            lines.append(f'[[Person,{rng.randrange(count)}]]')
+        lines.append('')
+    return lines
+
+
+def measure(lines, person_class):
+    # Return the memory retained by the parsed people, in bytes.
+    gc.collect()
+    tracemalloc.start()
+    people = parse_lines(lines, person_class)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del people
+    return size
+
+
+def main(count=100000):
+    lines = make_lines(count)
+    print(f'{count} Personen')
+
+    # A first round fills the table of interned strings and the allocator pools.
+    for person_class in (DictPerson, Person):
+        measure(lines, person_class)
+    for person_class in (DictPerson, Person):
+        size = measure(lines, person_class)
+        print(f'{person_class.__name__:12}: {size / count:8.0f} Bytes/Person')
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
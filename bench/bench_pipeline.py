@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+"""Benchmarks the conversion stages on a synthetic Genlog corpus.
+
+Usage: bench_pipeline.py [-n records] [-r rounds] [--baseline file] [--save-baseline] [--no-memory]
+
+Generates a corpus with the given number of records (default: 10000) 
+and runs the stages one after the other, each on the result of the 
+previous one. For each stage, the best wall time of the given number 
+of rounds (default: 3), the throughput, and the peak of the memory 
+allocated by Python (traced in an extra round) are printed.
+
+With --baseline, the results are compared with a baseline file 
+written by an earlier run with the same number of records 
+(default: baseline.json beside this script); stages that are slower
+by more than the tolerance are reported, and the exit status is 1. 
+With --save-baseline, the results are written to the baseline file.
+The results record the git commit of the measured sources, marked 
+as dirty if the sources have uncommitted changes.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License 
+(https://opensource.org/licenses/mit-license.php)
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+SRC_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_FOLDER)
+from genlog_corpus import make_rtf
+from parse_family_data import parse_lines
+from parse_family_data import serialize_people
+from parse_family_data import write_obsidian_notes
+from strip_rtf import sanitize_links
+from striprtf.striprtf import remove_pict_groups
+from striprtf.striprtf import rtf_to_text
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+TOLERANCE = 1.25
+ROUNDS = 3
+
+# Throughput units.
+MEGABYTES = 'MB/s'
+RECORDS = 'Datensätze/s'
+
+
+def get_commit():
+    # Return the abbreviated commit of the sources, or None outside a git work tree.
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=SRC_FOLDER, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        changes = subprocess.run(
+            ['git', 'status', '--porcelain', '--', '.'],
+            cwd=SRC_FOLDER, capture_output=True, text=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    if changes:
+        commit = f'{commit}-dirty'
+    return commit
+
+
+def get_stages(note_folder, workers):
+    # Return a list of (stage name, function, unit) tuples.
+    # Each function takes the result of the previous one.
+    return [
+        ('sanitize_links', sanitize_links, MEGABYTES),
+        ('remove_pict_groups', remove_pict_groups, MEGABYTES),
+        ('rtf_to_text', rtf_to_text, MEGABYTES),
+        ('parse_lines', lambda text: parse_lines(text.split('\n')), RECORDS),
+        ('serialize_people', lambda people: (serialize_people(people), people)[1], RECORDS),
+        ('write_obsidian_notes', lambda people: write_obsidian_notes(note_folder, people, workers=workers), RECORDS),
+    ]
+
+
+def get_size(data, unit, records):
+    # Return the size of the stage input in the throughput unit.
+    if unit == MEGABYTES:
+        return len(data) / 1024 / 1024
+
+    return records
+
+
+def run_stages(stages, rtf, records, trace):
+    # Return {stage name: (seconds, peak bytes or None, input size)}.
+    results = {}
+    data = rtf
+    for name, function, unit in stages:
+        gc.collect()
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = function(data)
+        seconds = time.perf_counter() - start
+        peak = None
+        if trace:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        results[name] = (seconds, peak, get_size(data, unit, records))
+        data = result
+    return results
+
+
+def benchmark(records, workers=0, memory=True, rounds=ROUNDS):
+    rtf = make_rtf(records)
+    with tempfile.TemporaryDirectory() as note_folder:
+        stages = get_stages(note_folder, workers)
+        timings = run_stages(stages, rtf, records, trace=False)
+        for __ in range(rounds - 1):
+            for name, timing in run_stages(stages, rtf, records, trace=False).items():
+                if timing[0] < timings[name][0]:
+                    timings[name] = timing
+        peaks = {}
+        if memory:
+            with tempfile.TemporaryDirectory() as trace_folder:
+                peaks = run_stages(get_stages(trace_folder, workers), rtf, records, trace=True)
+
+    stage_results = {}
+    for name, function, unit in stages:
+        seconds, __, size = timings[name]
+        stage_results[name] = {
+            'seconds': seconds,
+            'throughput': size / seconds if seconds else None,
+            'unit': unit,
+            'peak_bytes': peaks[name][1] if memory else None,
+        }
+    return {
+        'records': records,
+        'python': platform.python_version(),
+        'commit': get_commit(),
+        'stages': stage_results,
+    }
+
+
+def print_results(results):
+    print(f'{results["records"]} Datensätze, Python {results["python"]}, Commit {results["commit"]}')
+    for name, stage in results['stages'].items():
+        line = f'{name:22} {stage["seconds"]:9.3f} s {stage["throughput"]:12.1f} {stage["unit"]}'
+        if stage['peak_bytes'] is not None:
+            line = f'{line:60} {stage["peak_bytes"] / 1024 / 1024:9.1f} MB Spitze'
+        print(line)
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    # Print the time ratios to the baseline; return the names of the slower stages.
+    if baseline['records'] != results['records']:
+        print(f'Die Baseline hat {baseline["records"]} Datensätze; kein Vergleich')
+        return []
+
+    print(f'Baseline von Commit {baseline.get("commit")}')
+    slower = []
+    for name, stage in results['stages'].items():
+        base = baseline['stages'].get(name)
+        if base is None or not base['seconds']:
+            continue
+
+        ratio = stage['seconds'] / base['seconds']
+        mark = ''
+        if ratio > tolerance:
+            slower.append(name)
+            mark = ' LANGSAMER'
+        print(f'{name:22} {ratio:6.2f} x Baseline{mark}')
+    return slower
+
+
+def main(records=10000, baseline_file=None, save_baseline=False, memory=True, workers=0, tolerance=TOLERANCE, rounds=ROUNDS):
+    results = benchmark(records, workers, memory, rounds)
+    print_results(results)
+    slower = []
+    if baseline_file and os.path.isfile(baseline_file) and not save_baseline:
+        with open(baseline_file, encoding='utf-8') as f:
+            slower = compare(results, json.load(f), tolerance)
+    if save_baseline:
+        with open(baseline_file, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return slower
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the conversion stages.')
+    parser.add_argument(
+        '-n', '--records',
+        type=int,
+        default=10000,
+        help='number of records (default: 10000)'
+    )
+    parser.add_argument(
+        '-r', '--rounds',
+        type=int,
+        default=ROUNDS,
+        help=f'number of timed rounds; the best time counts (default: {ROUNDS})'
+    )
+    parser.add_argument(
+        '--baseline',
+        default=BASELINE_FILE,
+        help='baseline file (default: baseline.json beside this script)'
+    )
+    parser.add_argument(
+        '--save-baseline',
+        action='store_true',
+        help='write the results to the baseline file'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=TOLERANCE,
+        help=f'time ratio above which a stage counts as slower (default: {TOLERANCE})'
+    )
+    parser.add_argument(
+        '--no-memory',
+        action='store_true',
+        help='skip the traced run for the peak memory'
+    )
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        default=0,
+        help='number of threads writing the notes (default: 0)'
+    )
+    args = parser.parse_args()
+    if main(
+        args.records,
+        args.baseline,
+        args.save_baseline,
+        not args.no_memory,
+        args.workers,
+        args.tolerance,
+        args.rounds,
+    ):
+        sys.exit(1)
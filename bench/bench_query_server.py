@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""Load test for the query server on a synthetic Genlog export.
+
+Usage: bench_query_server.py [-n records] [-c clients] [-r requests] [-d depth]
+
+Starts the query server on a free local port, with a corpus of the 
+given number of records (default: 10000), and lets the given number 
+of concurrent clients (default: 8) send the given number of requests 
+each (default: 500) for random persons and views, over keep-alive 
+connections. Prints the throughput, and the p50 and p99 latency, for 
+a cold and a warm view cache.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License
+(https://opensource.org/licenses/mit-license.php)
+"""
+import argparse
+from http.client import HTTPConnection
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import quote
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from genlog_corpus import get_person_id
+from genlog_corpus import make_rtf
+from query_server import DESCENDANTS
+from query_server import NEIGHBOURS
+from query_server import PEDIGREE
+from query_server import PERSON
+from query_server import FamilyData
+from query_server import make_server
+from strip_rtf import sanitize_links
+from striprtf.striprtf import rtf_to_text
+
+VIEWS = (PERSON, NEIGHBOURS, PEDIGREE, DESCENDANTS)
+
+
+def run_client(port, paths, latencies):
+    connection = HTTPConnection('127.0.0.1', port)
+    try:
+        for path in paths:
+            start = time.perf_counter()
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+            latencies.append(time.perf_counter() - start)
+            if response.status != 200:
+                sys.exit(f'HTTP {response.status} for {path}')
+    finally:
+        connection.close()
+
+
+def get_percentile(values, percent):
+    return values[min(len(values) - 1, len(values) * percent // 100)]
+
+
+def run_round(port, client_paths):
+    # Return the sorted latencies, and the elapsed time.
+    latencies = []
+    threads = [threading.Thread(target=run_client, args=(port, paths, latencies)) for paths in client_paths]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return latencies, elapsed
+
+
+def main(records=10000, clients=8, requests=500, depth=4):
+    rng = random.Random(1)
+    client_paths = []
+    for __ in range(clients):
+        paths = []
+        for __ in range(requests):
+            view = rng.choice(VIEWS)
+            path = f'/{view}/{quote(get_person_id(rng.randrange(records)))}'
+            if view in (PEDIGREE, DESCENDANTS):
+                path = f'{path}?depth={depth}'
+            paths.append(path)
+        client_paths.append(paths)
+
+    with tempfile.TemporaryDirectory() as folder:
+        txt_file = os.path.join(folder, 'genlog.txt')
+        with open(txt_file, 'w', encoding='utf-8') as f:
+            f.write(rtf_to_text(sanitize_links(make_rtf(records))))
+        server = make_server(FamilyData(txt_file), port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            print(f'{records} Datensätze, {clients} Clients, {clients * requests} Anfragen pro Runde')
+            for name in ('kalter Cache', 'warmer Cache'):
+                latencies, elapsed = run_round(server.server_port, client_paths)
+                print(
+                    f'{name:13} {len(latencies) / elapsed:8.0f} Anfragen/s  '
+                    f'p50 {get_percentile(latencies, 50) * 1000:7.2f} ms  '
+                    f'p99 {get_percentile(latencies, 99) * 1000:7.2f} ms'
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Load test for the query server.')
+    parser.add_argument('-n', '--records', type=int, default=10000, help='number of records (default: 10000)')
+    parser.add_argument('-c', '--clients', type=int, default=8, help='number of concurrent clients (default: 8)')
+    parser.add_argument('-r', '--requests', type=int, default=500, help='number of requests per client (default: 500)')
+    parser.add_argument('-d', '--depth', type=int, default=4, help='depth of the pedigree views (default: 4)')
+    args = parser.parse_args()
+    main(args.records, args.clients, args.requests, args.depth)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""Benchmark for striprtf.remove_pict_groups on image-heavy RTF.
+
+Usage: bench_remove_pict_groups.py [size-in-MB]
+
+Compares the search-and-slice implementation with the former
+character-by-character loop on a synthetic RTF text of the
+given size (default: 4 MB), half of which is binary picture data. 
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License 
+(https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from striprtf.striprtf import remove_pict_groups
+
+
+def legacy_remove_pict_groups(rtf_text):
+    # The former character-by-character implementation.
+    if "\\pict" not in rtf_text or "\\bin" not in rtf_text:
+        return rtf_text
+    result = []
+    i = 0
+    n = len(rtf_text)
+    in_pict = False
+    while i < n:
+        if not in_pict and rtf_text.startswith("\\pict", i):
+            in_pict = True
+            i += len("\\pict")
+            continue
+        if in_pict:
+            if rtf_text.startswith("\\bin", i):
+                i += len("\\bin")
+                length_str = ""
+                while i < n and rtf_text[i].isdigit():
+                    length_str += rtf_text[i]
+                    i += 1
+                i += int(length_str)
+                continue
+            elif rtf_text[i] == "}":
+                in_pict = False
+                i += 1
+                continue
+        if not in_pict:
+            result.append(rtf_text[i])
+        i += 1
+    return "".join(result)
+
+
+# Picture data without digits, which would extend the \bin length.
+BLOB_CHARS = [chr(c) for c in range(0x3a, 0x7f)] + [chr(c) for c in range(0xc0, 0x100)]
+
+
+def make_rtf(size):
+    rng = random.Random(1)
+    parts = ['{\\rtf1\\ansi\\deff0']
+    length = 0
+    record = 0
+    while length < size:
+        record += 1
+        text = (
+            f'\\par $#K Person_{record}\\par Nachname, Vorname\\par * {rng.randint(1700, 1900)}'
+            f'\\par \\uldb Vater,{record}\\plain\\fs20 {{\\v Vater_{record}>main}}\\par '
+        )
+        blob = ''.join(rng.choice(BLOB_CHARS) for _ in range(rng.randint(200, 2000)))
+        pict = f'{{\\*\\shppict{{\\pict\\dibitmap0\\picw64\\pich64\\bin{len(blob)}{blob}}}}}'
+        parts.append(text)
+        parts.append(pict)
+        length += len(text) + len(pict)
+    parts.append('}')
+    return ''.join(parts)
+
+
+def measure(function, text):
+    start = time.perf_counter()
+    result = function(text)
+    return time.perf_counter() - start, result
+
+
+def main(megabytes=4.0):
+    text = make_rtf(int(megabytes * 1024 * 1024))
+    print(f'Input: {len(text) / 1024 / 1024:.1f} MB, {text.count(chr(92) + "pict")} picture groups')
+    legacy_time, legacy_result = measure(legacy_remove_pict_groups, text)
+    fast_time, fast_result = measure(remove_pict_groups, text)
+    if fast_result != legacy_result:
+        sys.exit('Results differ!')
+
+    print(f'character loop:   {legacy_time:8.3f} s')
+    print(f'search-and-slice: {fast_time:8.3f} s')
+    print(f'speedup:          {legacy_time / fast_time:8.1f} x')
+
+
+if __name__ == "__main__":
+    main(*[float(arg) for arg in sys.argv[1:2]])
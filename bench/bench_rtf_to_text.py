@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+"""Benchmark for striprtf.rtf_to_text on a synthetic Genlog corpus.
+
+Usage: bench_rtf_to_text.py [number-of-records]
+
+Compares the table-driven tokenizer, which matches plain text 
+in runs, with the former implementation, which matched one token 
+per character, on a corpus with the given number of records 
+(default: 10000), as str and as bytes. 
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License 
+(https://opensource.org/licenses/mit-license.php)
+"""
+import codecs
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+from genlog_corpus import make_rtf
+from strip_rtf import sanitize_links
+from striprtf.striprtf import CHUNK_SIZE
+from striprtf.striprtf import FONTTABLE
+from striprtf.striprtf import FONTTABLE_BYTES
+from striprtf.striprtf import PATTERN
+from striprtf.striprtf import charset_map
+from striprtf.striprtf import destinations
+from striprtf.striprtf import expand_hyperlinks
+from striprtf.striprtf import remove_pict_groups
+from striprtf.striprtf import rtf_to_text_chunks
+from striprtf.striprtf import sectionchars
+from striprtf.striprtf import specialchars
+
+# Byte string variant of PATTERN, for RTF read as bytes.
+PATTERN_BYTES = re.compile(PATTERN.pattern.encode('ascii'), re.IGNORECASE)
+
+
+def legacy_rtf_to_text_chunks(text, encoding="cp1252", errors="strict", chunk_size=CHUNK_SIZE):
+    # The former implementation, with one match per plain-text character.
+    binary = not isinstance(text, str)
+    if binary:
+        pattern, fonttable = PATTERN_BYTES, FONTTABLE_BYTES
+    else:
+        pattern, fonttable = PATTERN, FONTTABLE
+
+    # Preprocess the RTF text to remove \pict groups
+    text = remove_pict_groups(text)
+
+    text = expand_hyperlinks(text)  # captures links like link_text(http://link_dest)
+    stack = []
+    fonttbl = {}
+    default_font = None
+    current_font = None
+    ignorable = False  # Whether this group (and all inside it) are "ignorable".
+    suppress_output = False  # Whether this group (and all inside it) are "ignorable".
+    ucskip = 1  # Number of ASCII characters to skip after a unicode character.
+    curskip = 0  # Number of ASCII characters left to skip
+    hexes = None
+    out = []
+
+    # Simplified font table regex
+    fonttbl_matches = fonttable.findall(text)
+    for font_id, fcharset, font_name in fonttbl_matches:
+        if binary:
+            font_id, fcharset, font_name = (
+                font_id.decode("latin-1"),
+                fcharset.decode("latin-1"),
+                font_name.decode("latin-1"),
+            )
+        fonttbl[font_id] = {
+            "name": font_name.strip(),
+            "charset": fcharset,
+            "encoding": charset_map.get(int(fcharset), encoding),
+        }
+    for match in pattern.finditer(text):
+        if len(out) >= chunk_size:
+            yield "".join(out)
+            out.clear()
+        if binary:
+            word, arg, _hex, char, brace, tchar = [
+                group.decode("latin-1") if group is not None else None
+                for group in match.groups()
+            ]
+            if tchar and tchar > "\x7f":
+                # Raw 8-bit character: decode it like a \'xx escape
+                _hex = f"{ord(tchar):02x}"
+                tchar = None
+        else:
+            word, arg, _hex, char, brace, tchar = match.groups()
+        if hexes and not _hex:
+            # Decode accumulated hexes
+            out.append(
+                bytes.fromhex(hexes).decode(
+                    encoding=fonttbl.get(current_font, {"encoding": encoding}).get(
+                        "encoding", encoding
+                    ),
+                    errors=errors,
+                )
+            )
+            hexes = None
+        if brace:
+            curskip = 0
+            if brace == "{":
+                # Push state
+                stack.append((ucskip, ignorable, suppress_output))
+            elif brace == "}":
+                # Pop state
+                if stack:
+                    ucskip, ignorable, suppress_output = stack.pop()
+                # sample_3.rtf throws an IndexError because of stack being empty.
+                # don't know right now how this could happen, so for now this is
+                # a ugly hack to prevent it
+                else:
+                    ucskip = 0
+                    ignorable = True
+        elif char:  # \x (not a letter)
+            curskip = 0
+            if char in specialchars:
+                if char in sectionchars:
+                    current_font = default_font
+                if not ignorable:
+                    out.append(specialchars[char])
+            elif char == "*":
+                ignorable = True
+        elif word:  # \foo
+            curskip = 0
+            if word in destinations:
+                ignorable = True
+            # http://www.biblioscape.com/rtf15_spec.htm#Heading8
+            elif word == "ansicpg":
+                encoding = f"cp{arg}"
+                try:
+                    codecs.lookup(encoding)
+                except LookupError:
+                    encoding = "utf8"
+            if ignorable or suppress_output:
+                pass
+            elif word in specialchars:
+                out.append(specialchars[word])
+            elif word == "uc":
+                ucskip = int(arg)
+            elif word == "u":
+                # because of https://github.com/joshy/striprtf/issues/6
+                if arg is None:
+                    curskip = ucskip
+                else:
+                    c = int(arg)
+                    if c < 0:
+                        c += 0x10000
+                    out.append(chr(c))
+                    curskip = ucskip
+            elif word == "f":
+                current_font = arg
+            elif word == "deff":
+                default_font = arg
+            elif word == "fonttbl":
+                suppress_output = True
+            elif word == "colortbl":
+                suppress_output = True
+
+        elif _hex:  # \'xx
+            if curskip > 0:
+                curskip -= 1
+            elif not ignorable:
+                # Accumulate hex characters to decode later
+                if not hexes:
+                    hexes = _hex
+                else:
+                    hexes += _hex
+        elif tchar:
+            if curskip > 0:
+                curskip -= 1
+            elif not ignorable and not suppress_output:
+                out.append(tchar)
+
+    if out:
+        yield "".join(out)
+
+
+def measure(function, text):
+    start = time.perf_counter()
+    result = ''.join(function(text))
+    return time.perf_counter() - start, result
+
+
+def main(records=10000):
+    rtf = sanitize_links(make_rtf(records))
+    print(f'{records} Datensätze, {len(rtf) / 1024 / 1024:.1f} MB')
+    for label, text in (('str', rtf), ('bytes', rtf.encode('utf-8'))):
+        legacy_time, legacy_result = measure(legacy_rtf_to_text_chunks, text)
+        fast_time, fast_result = measure(rtf_to_text_chunks, text)
+        if fast_result != legacy_result:
+            sys.exit('Results differ!')
+
+        print(f'{label:5} one match per character: {legacy_time:8.3f} s')
+        print(f'{label:5} table-driven, text runs:  {fast_time:8.3f} s')
+        print(f'{label:5} speedup:                  {legacy_time / fast_time:8.1f} x')
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""Generates a synthetic Genlog corpus for tests and benchmarks.
+
+Usage: genlog_corpus.py [-n records] [--seed seed] path-to-rtf-file
+
+Writes an RTF file shaped like a decompiled Genlog help file, 
+with the given number of records (default: 1000): 
+record markers, names with hex-escaped umlauts, birth, death, 
+and marriage lines, topic and document jumps, image references,
+and binary picture groups. 
+
+The records link to each other by ID, so the parsed 
+records resolve like a real family tree.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License 
+(https://opensource.org/licenses/mit-license.php)
+"""
+import argparse
+import random
+
+RTF_HEADER = (
+    '{\\rtf1\\ansi\\ansicpg1252\\deff0\n'
+    '{\\fonttbl{\\f0\\fswiss\\fcharset0 Arial;}}\n'
+)
+RTF_FOOTER = '}\n'
+
+SURNAMES = ('M\\\'fcller', 'Schmidt', 'Schneider', 'Fischer', 'Wei\\\'df', 'M\\\'e4rz', 'Becker', 'Hoffmann', 'Sch\\\'e4fer', 'Kr\\\'fcger')
+GIVEN_NAMES = ('Hans', 'J\\\'fcrgen', 'Anna', 'Maria', 'Gretchen', 'Wilhelm', 'Karl', 'B\\\'e4rbel', 'Otto', 'Ludwig')
+PROFESSIONS = ('Landwirt', 'Schmied', 'M\\\'fcller', 'Pfarrer', 'Lehrerin', 'Kaufmann', 'B\\\'e4cker')
+PLACES = ('K\\\'f6ln', 'M\\\'fcnchen', 'Ulm', 'L\\\'fcbeck', 'D\\\'fcsseldorf', 'Hamburg')
+DESC_WORDS = ('lebte', 'in', 'auf', 'dem', 'Hof', 'sp\\\'e4ter', 'zog', 'nach', 'und', 'gr\\\'fcndete', 'eine', 'Familie')
+
+# Picture data without digits, which would extend the \bin length.
+# It is ASCII, so that the \bin length is the same in characters and bytes.
+BLOB_CHARS = [chr(c) for c in range(0x3a, 0x7f)]
+
+IMAGE_RATE = 0.1
+DOCUMENT_RATE = 0.2
+GENERATION_SIZE = 200
+
+
+def get_person_id(i):
+    return f'Person_{i}_{1700 + (i // GENERATION_SIZE) % 300}'
+
+
+def topic_link(person_id):
+    return f'\\uldb {person_id}\\plain\\fs20 {{\\v {person_id}>main}}'
+
+
+def document_link(title):
+    return f'\\uldb {title}\\plain\\fs20 {{\\v 2GNTK0>main@{title}.HLP}}'
+
+
+def iter_records(count, seed=1):
+    # Yield the RTF text of the records, one string per record.
+    # Parents are taken from the previous generation, so the tree has no cycles.
+    rng = random.Random(seed)
+    for i in range(count):
+        person_id = get_person_id(i)
+        year = 1700 + (i // GENERATION_SIZE) % 300
+        lines = [f'$#K {person_id}']
+        lines.append(f'{rng.choice(SURNAMES)}, {rng.choice(GIVEN_NAMES)}')
+        lines.append(rng.choice(PROFESSIONS))
+        if rng.random() < IMAGE_RATE:
+            lines.append(f'\\{{bmc {person_id}.BMP\\}}')
+        lines.append(f'* {rng.randint(1, 28)}.{rng.randint(1, 12)}.{year} in {rng.choice(PLACES)}')
+        if rng.random() < 0.7:
+            lines.append(f'+ {rng.randint(1, 28)}.{rng.randint(1, 12)}.{year + rng.randint(20, 80)}')
+        if rng.random() < 0.6:
+            lines.append(f'oo {topic_link(get_person_id(rng.randrange(count)))}')
+        if i >= GENERATION_SIZE:
+            generation_start = (i // GENERATION_SIZE - 1) * GENERATION_SIZE
+            lines.append('Vater:')
+            lines.append(topic_link(get_person_id(generation_start + rng.randrange(GENERATION_SIZE))))
+            lines.append('Mutter:')
+            lines.append(topic_link(get_person_id(generation_start + rng.randrange(GENERATION_SIZE))))
+        children = rng.randint(0, 4)
+        if children:
+            lines.append('Kinder:')
+            generation_start = (i // GENERATION_SIZE + 1) * GENERATION_SIZE
+            for __ in range(children):
+                lines.append(topic_link(get_person_id(generation_start + rng.randrange(GENERATION_SIZE))))
+        if rng.random() < DOCUMENT_RATE:
+            lines.append('Dokumente:')
+            lines.append(document_link(f'Urkunde{rng.randrange(1000)}'))
+        lines.append('')
+        lines.append(' '.join(rng.choice(DESC_WORDS) for __ in range(rng.randint(5, 40))))
+        lines.append('')
+        text = '\\par\n'.join(lines)
+        if rng.random() < IMAGE_RATE:
+            blob = ''.join(rng.choices(BLOB_CHARS, k=rng.randint(200, 2000)))
+            # remove_pict_groups removes the group up to its closing brace, but keeps the opening
+            # brace; so the group is closed twice, as in the converted help files.
+            text = f'{text}{{\\pict\\dibitmap0\\picw64\\pich64\\bin{len(blob)}{blob}}}}}'
+        yield f'\\page\n\\plain\\f0\\fs20 {text}\\par\n'
+
+
+def iter_rtf(count, seed=1):
+    # Yield the RTF document in pieces.
+    yield RTF_HEADER
+    yield from iter_records(count, seed)
+    yield RTF_FOOTER
+
+
+def make_rtf(count, seed=1):
+    return ''.join(iter_rtf(count, seed))
+
+
+def write_rtf(rtf_file, count, seed=1):
+    # The pieces are written as they are generated, so large corpora are not held in memory.
+    with open(rtf_file, 'w', encoding='utf-8') as f:
+        for piece in iter_rtf(count, seed):
+            f.write(piece)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate a synthetic Genlog RTF corpus.')
+    parser.add_argument('path', help='RTF file to write')
+    parser.add_argument(
+        '-n', '--records',
+        type=int,
+        default=1000,
+        help='number of records (default: 1000)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=1,
+        help='random seed (default: 1)'
+    )
+    args = parser.parse_args()
+    write_rtf(args.path, args.records, args.seed)
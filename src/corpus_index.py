@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+"""Indexes a whole HELPDECO output tree.
+
+Usage: corpus_index.py [-j workers] [--index file] [--vault folder] path-to-directory
+
+Scans all RTF files in the directory tree for topic IDs, topic jumps,
+document jumps, and image references, and prints a report of the
+jumps whose target is missing in the tree:
+document jumps to HLP files that were not decompiled, images
+without a BMP or JPG file, and topic jumps without a topic in their file.
+
+The index is kept in a file (default: .cnv_genlog_index.json
+in the directory), so that on the next run only new or changed
+RTF files are scanned again.
+
+With --vault, the linked documents are converted into notes
+in the documents folder of the given Obsidian vault,
+where the document links of the record notes point.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License
+(https://opensource.org/licenses/mit-license.php)
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from manifest import Manifest
+from manifest import hash_file
+import metrics
+from note_writer import NoteWriter
+from parse_family_data import RECORD_MARKER
+from parse_family_data import image_pattern
+from parse_family_data import link_pattern
+from parse_family_data import sanitize_title
+from strip_rtf import RTF_EXTENSION
+from strip_rtf import sanitize_links
+from striprtf.striprtf import rtf_to_text
+
+INDEX_FILE = '.cnv_genlog_index.json'
+IMAGE_EXTENSIONS = ('.bmp', '.jpg')
+
+# The document links written by sanitize_links are [[documents/<HLP file name>.md]].
+DOCUMENT_FOLDER = 'documents'
+DOCUMENT_PREFIX = f'{DOCUMENT_FOLDER}/'
+DOCUMENT_SUFFIX = '.md'
+
+# Issue kinds.
+DOCUMENT_MISSING = 'Dokument fehlt'
+IMAGE_MISSING = 'Bild fehlt'
+TOPIC_MISSING = 'Verweis ohne Ziel'
+
+
+def get_key(name):
+    # File names are compared the way Windows does, since the HLP files come from there.
+    return name.casefold()
+
+
+def collect_files(root):
+    # Return the sorted RTF file paths relative to root, and the keys of the image file names.
+    rtf_files = []
+    images = set()
+    for folder, __, files in os.walk(root):
+        for file_name in files:
+            stem, extension = os.path.splitext(file_name)
+            extension = extension.lower()
+            if extension == RTF_EXTENSION:
+                rtf_files.append(os.path.relpath(os.path.join(folder, file_name), root).replace(os.sep, '/'))
+            elif extension in IMAGE_EXTENSIONS:
+                images.add(get_key(stem))
+    rtf_files.sort()
+    return rtf_files, images
+
+
+def convert_document(rtf_file):
+    with open(rtf_file, 'r', encoding='utf-8') as f:
+        return rtf_to_text(sanitize_links(f.read()))
+
+
+def scan_text(text):
+    # Return an index entry with the topic IDs, the topic and document link targets, and the images of a text.
+    topics = []
+    for line in text.split('\n'):
+        if line.startswith(RECORD_MARKER):
+            topics.append(line[len(RECORD_MARKER):].strip())
+    links = set()
+    documents = set()
+    for target in link_pattern.findall(text):
+        if target.startswith(DOCUMENT_PREFIX) and target.endswith(DOCUMENT_SUFFIX):
+            documents.add(target[len(DOCUMENT_PREFIX):-len(DOCUMENT_SUFFIX)])
+        else:
+            links.add(target)
+    return {
+        'topics': topics,
+        'links': sorted(links),
+        'documents': sorted(documents),
+        'images': sorted(set(image_pattern.findall(text))),
+    }
+
+
+def _scan_file(rtf_file):
+    # Worker function; errors are returned as text, so that a bad file does not stop the scan.
+    try:
+        entry = scan_text(convert_document(rtf_file))
+    except Exception as ex:
+        return None, f'{type(ex).__name__}: {ex}'
+
+    return entry, None
+
+
+class CorpusIndex:
+
+    def __init__(self, root, index_file=None):
+        self.root = root
+        if index_file is None:
+            index_file = os.path.join(root, INDEX_FILE)
+        self.manifest = Manifest(index_file)
+
+        # Relative paths of the RTF files scanned by the last update.
+        self.scanned = []
+
+        # Relative path: error message, for the files that could not be scanned.
+        self.errors = {}
+
+        # Keys of the image file names found by the last update.
+        self.images = set()
+
+    def update(self, workers=None):
+        # Bring the index up to date with the tree; files with unchanged size, time, or content are not scanned.
+        rtf_files, self.images = collect_files(self.root)
+        for rtf_file in set(self.manifest.entries).difference(rtf_files):
+            self.manifest.remove(rtf_file)
+
+        changed = {}
+        for rtf_file in rtf_files:
+            file_path = os.path.join(self.root, rtf_file)
+            status = os.stat(file_path)
+            entry = self.manifest.get(rtf_file)
+            if entry is not None and entry['size'] == status.st_size and entry['mtime'] == status.st_mtime_ns:
+                continue
+
+            source_hash = hash_file(file_path)
+            if entry is not None and entry['source'] == source_hash:
+                self.manifest.set(rtf_file, {**entry, 'size': status.st_size, 'mtime': status.st_mtime_ns})
+                continue
+
+            changed[rtf_file] = {'source': source_hash, 'size': status.st_size, 'mtime': status.st_mtime_ns}
+
+        self.scanned = list(changed)
+        self.errors = {}
+        if not changed:
+            return
+
+        file_paths = [os.path.join(self.root, rtf_file) for rtf_file in changed]
+        with metrics.stage('scan_corpus'):
+            if workers == 0:
+                results = map(_scan_file, file_paths)
+                self._store(changed, results)
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    self._store(changed, executor.map(_scan_file, file_paths))
+        metrics.add('files', len(changed))
+
+    def _store(self, changed, results):
+        for (rtf_file, status), (entry, error) in zip(changed.items(), results):
+            if error is None:
+                self.manifest.set(rtf_file, {**status, **entry})
+            else:
+                # The entry is dropped, so that the file is scanned again on the next run.
+                self.errors[rtf_file] = error
+                self.manifest.remove(rtf_file)
+
+    def write(self):
+        self.manifest.write()
+
+    def get_documents(self):
+        # Return {document key: relative path of the RTF file}, for all RTF files in the index.
+        documents = {}
+        for rtf_file in sorted(self.manifest.entries):
+            stem = os.path.splitext(os.path.basename(rtf_file))[0]
+            documents.setdefault(get_key(stem), rtf_file)
+        return documents
+
+    def get_linked_documents(self):
+        # Return {document title as linked: relative path of the RTF file, or None if it is missing}.
+        documents = self.get_documents()
+        linked = {}
+        for entry in self.manifest.entries.values():
+            for title in entry['documents']:
+                linked.setdefault(title, documents.get(get_key(title)))
+        return linked
+
+    def check(self):
+        # Return a list of (issue kind, RTF file, link target) tuples.
+        documents = self.get_documents()
+        issues = []
+        for rtf_file, entry in sorted(self.manifest.entries.items()):
+            topics = set(sanitize_title(topic) for topic in entry['topics'])
+            for target in entry['links']:
+                if sanitize_title(target) not in topics:
+                    issues.append((TOPIC_MISSING, rtf_file, target))
+            for title in entry['documents']:
+                if get_key(title) not in documents:
+                    issues.append((DOCUMENT_MISSING, rtf_file, f'{title}.HLP'))
+            for image in entry['images']:
+                if get_key(image) not in self.images:
+                    issues.append((IMAGE_MISSING, rtf_file, f'{image}.BMP'))
+        return issues
+
+
+def write_document_notes(index, vault_path, workers=0):
+    # Write the linked documents as notes; return the NoteWriter with the statistics.
+    # Only the documents scanned by the last update, and those without a note, are converted.
+    folder_path = os.path.join(vault_path, DOCUMENT_FOLDER)
+    os.makedirs(folder_path, exist_ok=True)
+    scanned = set(index.scanned)
+    with NoteWriter(folder_path, workers) as writer:
+        for title, rtf_file in sorted(index.get_linked_documents().items()):
+            if rtf_file is None:
+                continue
+
+            title = sanitize_title(title)
+            if not writer.claim(title, rtf_file):
+                continue
+
+            if rtf_file not in scanned and os.path.isfile(os.path.join(folder_path, f'{title}.md')):
+                continue
+
+            writer.write(title, convert_document(os.path.join(index.root, rtf_file)))
+    return writer
+
+
+def print_report(index, issues):
+    for rtf_file, error in index.errors.items():
+        print(f'FEHLER {rtf_file}: {error}')
+    for kind, rtf_file, target in issues:
+        print(f'{kind}: {rtf_file} -> {target}')
+    print(f'{len(index.manifest.entries)} Dateien im Index, {len(index.scanned)} neu eingelesen')
+    print(f'{len(issues)} Probleme gefunden')
+
+
+def main(path, index_file=None, vault_path=None, workers=None):
+    index = CorpusIndex(path, index_file)
+    index.update(workers)
+    index.write()
+    print_report(index, index.check())
+    if vault_path:
+        writer = write_document_notes(index, vault_path)
+        print(f'{writer.written} Dokumente geschrieben')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Index the RTF files of a HELPDECO output tree.')
+    parser.add_argument('path', help='directory')
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        default=None,
+        help='number of processes scanning the files (default: number of CPUs; 0 scans in the main process)'
+    )
+    parser.add_argument(
+        '--index',
+        default=None,
+        help=f'index file (default: {INDEX_FILE} in the directory)'
+    )
+    parser.add_argument(
+        '--vault',
+        default=None,
+        help='Obsidian vault for the document notes'
+    )
+    args = parser.parse_args()
+    main(args.path, args.index, args.vault, args.workers)
@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+"""Finds records that may describe the same person.
+
+Usage: duplicates.py [--threshold score] [--window size] path-to-txt-file
+
+Prints a ranked report of merge candidates, with the best match first.
+
+The records are not compared pairwise. They are grouped into blocks
+by their normalized surname and birth year, and by the phonetic codes
+(Kölner Phonetik) of their surname and first given name. Only the
+records within a block are compared; blocks exceeding the window size
+are sorted by name, and each record is compared with its neighbours
+within the window.
+
+A pair is scored by the similarity of the names, and by the agreement
+of the birth and death dates and the parent links, as far as both
+records have them.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License
+(https://opensource.org/licenses/mit-license.php)
+"""
+import argparse
+from difflib import SequenceMatcher
+import re
+
+from parse_family_data import get_link_title
+from parse_family_data import get_year
+from parse_family_data import iter_lines
+from parse_family_data import parse_lines
+
+THRESHOLD = 0.85
+WINDOW = 50
+
+# Score weights.
+NAME_WEIGHT = 3
+BIRTH_WEIGHT = 2
+DEATH_WEIGHT = 1
+PARENT_WEIGHT = 1
+
+# Date scores, for the same date, the same year, and adjacent years.
+SAME_DATE = 1.0
+SAME_YEAR = 0.8
+NEXT_YEAR = 0.4
+
+UMLAUTS = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss', 'é': 'e', 'è': 'e'})
+PHONETIC_UMLAUTS = str.maketrans({'Ä': 'A', 'Ö': 'O', 'Ü': 'U', 'ß': 'S', 'É': 'E', 'È': 'E'})
+non_letter_pattern = re.compile(r'[^a-z ]+')
+
+# Kölner Phonetik letter classes.
+VOWELS = frozenset('AEIJOUY')
+C_START_HARD = frozenset('AHKLOQRUX')
+C_HARD = frozenset('AHKOQUX')
+DT_SOFT = frozenset('CSZ')
+X_AFTER = frozenset('CKQ')
+SZ = frozenset('SZ')
+LETTER_CODES = dict(
+    B='1', F='3', V='3', W='3', G='4', K='4', Q='4', L='5', M='6', N='6', R='7', S='8', Z='8'
+)
+
+
+def cologne_phonetic(word):
+    # Return the Kölner Phonetik code of a word, e.g. '65752682' for 'Müller-Lüdenscheidt'.
+    letters = [c for c in word.upper().translate(PHONETIC_UMLAUTS) if 'A' <= c <= 'Z']
+    digits = []
+    for i, c in enumerate(letters):
+        before = letters[i - 1] if i else ''
+        after = letters[i + 1] if i + 1 < len(letters) else ''
+        if c in VOWELS:
+            code = '0'
+        elif c == 'H':
+            continue
+        elif c == 'P':
+            code = '3' if after == 'H' else '1'
+        elif c in 'DT':
+            code = '8' if after and after in DT_SOFT else '2'
+        elif c == 'C':
+            if i == 0:
+                code = '4' if after and after in C_START_HARD else '8'
+            elif before in SZ or not after or after not in C_HARD:
+                code = '8'
+            else:
+                code = '4'
+        elif c == 'X':
+            code = '8' if before and before in X_AFTER else '48'
+        else:
+            code = LETTER_CODES[c]
+        for digit in code:
+            if not digits or digits[-1] != digit:
+                digits.append(digit)
+    return ''.join(digits[:1] + [digit for digit in digits[1:] if digit != '0'])
+
+
+def normalize(text):
+    # Return the text in lower case, with umlauts transliterated, and without punctuation.
+    return ' '.join(non_letter_pattern.sub(' ', text.casefold().translate(UMLAUTS)).split())
+
+
+def normalize_date(text):
+    if not text:
+        return ''
+
+    return ' '.join(text.casefold().split())
+
+
+def split_name(name):
+    # Return the normalized surname and given names of a "Surname, Given names" name.
+    surname, __, given = (name or '').partition(',')
+    return normalize(surname), normalize(given)
+
+
+class Candidate:
+    # The comparison data of a record.
+    __slots__ = (
+        'person_id',
+        'surname',
+        'given',
+        'name',
+        'birth',
+        'birth_year',
+        'death',
+        'death_year',
+        'father',
+        'mother',
+    )
+
+    def __init__(self, person_id, person):
+        self.person_id = person_id
+        self.surname, self.given = split_name(person.name)
+        self.name = f'{self.surname} {self.given}'.strip()
+        self.birth = normalize_date(person.birth)
+        self.birth_year = get_year(person.birth)
+        self.death = normalize_date(person.death)
+        self.death_year = get_year(person.death)
+        self.father = get_parent(person.father)
+        self.mother = get_parent(person.mother)
+
+    def get_blocking_keys(self):
+        keys = [(0, self.surname, self.birth_year)]
+        surname_code = cologne_phonetic(self.surname)
+        given_code = cologne_phonetic(self.given.partition(' ')[0])
+        if surname_code or given_code:
+            keys.append((1, surname_code, given_code))
+        return keys
+
+
+def get_parent(text):
+    if not text:
+        return None
+
+    title = get_link_title(text)
+    if title is None:
+        return normalize(text)
+
+    return title
+
+
+def get_date_score(date, year, other_date, other_year):
+    # Return the date score, or None if a date is missing.
+    if not date or not other_date:
+        return None
+
+    if date == other_date:
+        return SAME_DATE
+
+    if year is None or other_year is None:
+        return 0.0
+
+    difference = abs(year - other_year)
+    if difference == 0:
+        return SAME_YEAR
+
+    if difference == 1:
+        return NEXT_YEAR
+
+    return 0.0
+
+
+def get_parent_score(parent, other_parent):
+    if parent is None or other_parent is None:
+        return None
+
+    return 1.0 if parent == other_parent else 0.0
+
+
+def score_pair(a, b, matcher, threshold=THRESHOLD):
+    # Return the score of a pair of candidates between 0 and 1, or None if it is below the threshold.
+    # The matcher has b.name as its second sequence; the costly name ratio is skipped
+    # if even one of its upper bounds cannot lift the score above the threshold.
+    total = 0.0
+    weights = NAME_WEIGHT
+    for weight, score in (
+        (BIRTH_WEIGHT, get_date_score(a.birth, a.birth_year, b.birth, b.birth_year)),
+        (DEATH_WEIGHT, get_date_score(a.death, a.death_year, b.death, b.death_year)),
+        (PARENT_WEIGHT, get_parent_score(a.father, b.father)),
+        (PARENT_WEIGHT, get_parent_score(a.mother, b.mother)),
+    ):
+        if score is not None:
+            total += weight * score
+            weights += weight
+    if (total + NAME_WEIGHT) / weights < threshold:
+        return None
+
+    matcher.set_seq1(a.name)
+    if (total + NAME_WEIGHT * matcher.real_quick_ratio()) / weights < threshold:
+        return None
+
+    if (total + NAME_WEIGHT * matcher.quick_ratio()) / weights < threshold:
+        return None
+
+    score = (total + NAME_WEIGHT * matcher.ratio()) / weights
+    if score < threshold:
+        return None
+
+    return score
+
+
+def find_duplicates(people, threshold=THRESHOLD, window=WINDOW):
+    # Return a list of (score, person ID, other person ID) tuples, with the best match first.
+    blocks = {}
+    for person_id, person in people.items():
+        candidate = Candidate(person_id, person)
+        for key in candidate.get_blocking_keys():
+            blocks.setdefault(key, []).append(candidate)
+
+    pairs = {}
+    matcher = SequenceMatcher(autojunk=False)
+    for block in blocks.values():
+        if len(block) < 2:
+            continue
+
+        block.sort(key=lambda candidate: candidate.name)
+        for i, b in enumerate(block):
+            matcher.set_seq2(b.name)
+            for a in block[max(i - window, 0):i]:
+                # Pairs sharing both blocks are scored twice, which is cheaper than keeping all pairs.
+                score = score_pair(a, b, matcher, threshold)
+                if score is not None:
+                    pair = (a.person_id, b.person_id) if a.person_id < b.person_id else (b.person_id, a.person_id)
+                    pairs[pair] = score
+    candidates = [(score, *pair) for pair, score in pairs.items()]
+    candidates.sort(key=lambda candidate: (-candidate[0], candidate[1], candidate[2]))
+    return candidates
+
+
+def print_report(candidates):
+    for score, person_id, other_id in candidates:
+        print(f'{score:.2f}  {person_id} = {other_id}')
+    print(f'{len(candidates)} mögliche Dubletten gefunden')
+
+
+def main(file_path, threshold=THRESHOLD, window=WINDOW):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        people = parse_lines(iter_lines(f))
+    print_report(find_duplicates(people, threshold, window))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Find records that may describe the same person.')
+    parser.add_argument('path', help='text file')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=THRESHOLD,
+        help=f'minimum score of a candidate pair (default: {THRESHOLD})'
+    )
+    parser.add_argument(
+        '--window',
+        type=int,
+        default=WINDOW,
+        help=f'number of neighbours compared within large blocks (default: {WINDOW})'
+    )
+    args = parser.parse_args()
+    main(args.path, args.threshold, args.window)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+"""Family tree queries over parsed genlog records.
+
+Usage: family_tree.py [-d depth] [--descendants | --path other-id] path-to-txt-file person-id
+
+Prints the ancestors (default) or descendants of a person, 
+with their generation, or the relationship path between two persons.
+
+Parents and children are taken from both sides of the link,
+so that a relation is found even if only one record states it.
+Cycles and links without target are tolerated.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License 
+(https://opensource.org/licenses/mit-license.php)
+"""
+import argparse
+from collections import OrderedDict
+from collections import deque
+
+from link_index import CHILD
+from link_index import SPOUSE
+from link_index import LinkIndex
+from parse_family_data import iter_lines
+from parse_family_data import parse_lines
+
+PARENT = 'Elternteil'
+CACHE_SIZE = 4096
+
+
+class LruCache:
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        # Return the cached value, or None.
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FamilyTree:
+
+    def __init__(self, people, cache_size=CACHE_SIZE, index=None):
+        if index is None:
+            index = LinkIndex(people)
+        self.index = index
+
+        # Person ID: tuple of person IDs.
+        self.parents = self._merge(index.fathers, index.mothers, index.cited_as_child)
+        self.children = self._merge(index.children, index.cited_as_parent)
+        self.spouses = self._merge(index.spouses, index.cited_as_spouse)
+
+        self._ancestor_cache = LruCache(cache_size)
+        self._descendant_cache = LruCache(cache_size)
+        self._path_cache = LruCache(cache_size)
+
+    def ancestors(self, person_id, depth=None):
+        # Return a dict {ancestor ID: generation}, ordered by generation.
+        # A depth of None means all generations.
+        return dict(self._closure(person_id, depth, self.parents, self._ancestor_cache))
+
+    def descendants(self, person_id, depth=None):
+        # Return a dict {descendant ID: generation}, ordered by generation.
+        return dict(self._closure(person_id, depth, self.children, self._descendant_cache))
+
+    def relationship_path(self, person_id, other_id):
+        # Return the shortest list of (person ID, relation) steps leading from
+        # person_id to other_id, or None if they are not related.
+        # The relation tells what the person is to the one before.
+        key = (person_id, other_id)
+        path = self._path_cache.get(key)
+        if path is None:
+            path = self._find_path(person_id, other_id)
+            self._path_cache.set(key, path)
+        if not path and person_id != other_id:
+            return None
+
+        return list(path)
+
+    def clear_cache(self):
+        self._ancestor_cache.clear()
+        self._descendant_cache.clear()
+        self._path_cache.clear()
+
+    def _closure(self, person_id, depth, edges, cache):
+        # Return a tuple of (ID, generation) pairs, breadth first.
+        # Subtrees already in the cache are merged instead of traversed again.
+        # A person is expanded again only if reached by a shorter path,
+        # so that cycles terminate.
+        key = (person_id, depth)
+        result = cache.get(key)
+        if result is not None:
+            return result
+
+        generations = {}
+        queue = deque([(person_id, 0)])
+        while queue:
+            current_id, generation = queue.popleft()
+            if depth is not None and generation >= depth:
+                continue
+
+            if generation and current_id != person_id:
+                remaining = None if depth is None else depth - generation
+                subtree = cache.get((current_id, remaining))
+                if subtree is not None:
+                    for other_id, other_generation in subtree:
+                        other_generation += generation
+                        if other_generation < generations.get(other_id, other_generation + 1):
+                            generations[other_id] = other_generation
+                    continue
+
+            for next_id in edges.get(current_id, ()):
+                next_generation = generation + 1
+                if next_generation < generations.get(next_id, next_generation + 1):
+                    generations[next_id] = next_generation
+                    queue.append((next_id, next_generation))
+        result = tuple(sorted(generations.items(), key=lambda item: item[1]))
+        cache.set(key, result)
+        return result
+
+    def _find_path(self, person_id, other_id):
+        # Breadth-first search over parents, children, and spouses.
+        if person_id == other_id:
+            return ()
+
+        previous = {person_id: None}
+        queue = deque([person_id])
+        while queue:
+            current_id = queue.popleft()
+            for relation, edges in ((PARENT, self.parents), (CHILD, self.children), (SPOUSE, self.spouses)):
+                for next_id in edges.get(current_id, ()):
+                    if next_id in previous:
+                        continue
+
+                    previous[next_id] = (current_id, relation)
+                    if next_id == other_id:
+                        return self._get_steps(previous, other_id)
+
+                    queue.append(next_id)
+        return ()
+
+    def _get_steps(self, previous, person_id):
+        steps = []
+        while previous[person_id] is not None:
+            current_id, relation = previous[person_id]
+            steps.append((person_id, relation))
+            person_id = current_id
+        steps.reverse()
+        return tuple(steps)
+
+    def _merge(self, *adjacencies):
+        merged = {}
+        for adjacency in adjacencies:
+            for person_id, targets in adjacency.items():
+                if isinstance(targets, str):
+                    targets = (targets,)
+                ids = merged.setdefault(person_id, [])
+                for target in targets:
+                    if target not in ids:
+                        ids.append(target)
+        return {person_id: tuple(ids) for person_id, ids in merged.items()}
+
+
+def print_generations(generations):
+    for person_id, generation in generations.items():
+        print(f'{generation:3d} {person_id}')
+    print(f'{len(generations)} Personen gefunden')
+
+
+def print_path(person_id, steps):
+    if steps is None:
+        print('Keine Verwandtschaft gefunden')
+        return
+
+    print(person_id)
+    for step_id, relation in steps:
+        print(f'  -> {relation}: {step_id}')
+
+
+def main(file_path, person_id, depth=None, descendants=False, other_id=None):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        people = parse_lines(iter_lines(f))
+    tree = FamilyTree(people)
+    if other_id:
+        print_path(person_id, tree.relationship_path(person_id, other_id))
+    elif descendants:
+        print_generations(tree.descendants(person_id, depth))
+    else:
+        print_generations(tree.ancestors(person_id, depth))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Family tree queries over genlog records.')
+    parser.add_argument('path', help='text file with the genlog records')
+    parser.add_argument('person_id', help='ID of the root person')
+    parser.add_argument(
+        '-d', '--depth',
+        type=int,
+        default=None,
+        help='number of generations (default: all)'
+    )
+    parser.add_argument(
+        '--descendants',
+        action='store_true',
+        help='list the descendants instead of the ancestors'
+    )
+    parser.add_argument(
+        '--path',
+        dest='other_id',
+        default=None,
+        help='print the relationship path to the person with this ID'
+    )
+    args = parser.parse_args()
+    main(args.path, args.person_id, args.depth, args.descendants, args.other_id)
@@ -0,0 +1,337 @@
+#!/usr/bin/env python
+"""Exports parsed genlog records as GEDCOM 5.5.1.
+
+Usage: gedcom.py path-to-txt-file
+
+Creates a utf-8 encoded GEDCOM file 
+with the same file name, but .ged extension.
+
+The text file is parsed twice. The first pass collects the 
+families from the father, mother, children, and spouse links. 
+The second pass writes the INDI records with their FAMC and 
+FAMS pointers as the records are parsed, followed by the FAM 
+records, and by placeholder INDI records for link targets 
+without a record of their own. Only the links are kept in 
+memory, not the records.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License 
+(https://opensource.org/licenses/mit-license.php)
+"""
+import re
+import os
+import sys
+
+from parse_family_data import count_record_ids
+from parse_family_data import get_link
+from parse_family_data import get_link_title
+from parse_family_data import iter_file_people
+from parse_family_data import iter_lines
+from parse_family_data import iter_records
+from parse_family_data import sanitize_title
+
+GEDCOM_EXTENSION = '.ged'
+MAX_LINE_LENGTH = 248
+MONTHS = ('JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC')
+date_pattern = re.compile(r'(?:(\d{1,2})\.)?(?:(\d{1,2})\.)?(\d{3,4})$')
+
+SUBMITTER_XREF = '@SUBM@'
+
+# Family roles.
+HUSBAND = 'HUSB'
+WIFE = 'WIFE'
+
+
+class GedcomWriter:
+    # The records are passed twice: to add_person, for the xrefs and the families,
+    # and to write_person, for the INDI records with their FAMC and FAMS pointers.
+
+    def __init__(self, f):
+        self._f = f
+
+        # Sanitized title: xref.
+        self._xrefs = {}
+
+        # Xrefs of the INDI records to be written.
+        self._defined = set()
+
+        # Xref: role, as known from father and mother links.
+        self._roles = {}
+
+        # Child xref: list of at most two parent xrefs.
+        self._parents = {}
+
+        # Couple xrefs, as frozenset: None.
+        # A dict keeps the order in which the couples occur.
+        self._couples = {}
+
+        # Xref: sanitized title, for placeholders.
+        self._placeholders = {}
+
+        # List of (family xref, parent xrefs, child xrefs).
+        self._families = []
+
+        # Xref: lines of the FAMC and FAMS pointers.
+        self._family_links = {}
+
+        self.individuals = 0
+        self.families = 0
+        self.duplicates = []
+
+    def add_person(self, person_id, person):
+        # First pass: assign the xrefs, and collect the parents and couples.
+        title = sanitize_title(person_id)
+        xref = self._get_xref(title)
+        if xref in self._defined:
+            # Another record has the same sanitized title.
+            self.duplicates.append(person_id)
+            return
+
+        self._defined.add(xref)
+        self._placeholders.pop(xref, None)
+
+        # The parents named by the record itself take precedence
+        # over the parents that listed it as a child before.
+        parents = []
+        for role, parent in ((HUSBAND, person.father), (WIFE, person.mother)):
+            parent_xref = self._get_link_xref(parent)
+            if parent_xref is not None:
+                self._roles.setdefault(parent_xref, role)
+                self._add_parent(parents, parent_xref)
+        for parent_xref in self._parents.get(xref, ()):
+            self._add_parent(parents, parent_xref)
+        self._parents[xref] = parents
+        for child in person.children:
+            child_xref = self._get_link_xref(child)
+            if child_xref is not None:
+                self._add_parent(self._parents.setdefault(child_xref, []), xref)
+        for spouse in person.spouses:
+            spouse_xref = self._get_link_xref(spouse)
+            if spouse_xref is not None and spouse_xref != xref:
+                self._couples[frozenset((xref, spouse_xref))] = None
+
+    def link_families(self):
+        # Group the children by their parents; a couple is a family even without children.
+        # Assign the family xrefs, and collect the pointers of the individuals to their families.
+        families = dict.fromkeys(self._couples, ())
+        for child_xref, parents in self._parents.items():
+            if parents:
+                key = frozenset(parents)
+                children = families.get(key)
+                if not children:
+                    children = families[key] = []
+                children.append(child_xref)
+        self._parents.clear()
+        self._couples.clear()
+        for i, (parents, children) in enumerate(families.items(), 1):
+            family_xref = f'@F{i}@'
+            self._families.append((family_xref, parents, children))
+            for child_xref in children:
+                self._family_links.setdefault(child_xref, []).append(f'1 FAMC {family_xref}\n')
+            for role, parent_xref in self._get_roles(parents):
+                self._family_links.setdefault(parent_xref, []).append(f'1 FAMS {family_xref}\n')
+
+    def write_header(self):
+        self._write(0, 'HEAD')
+        self._write(1, 'SOUR', 'cnv_genlog')
+        self._write(1, 'GEDC')
+        self._write(2, 'VERS', '5.5.1')
+        self._write(2, 'FORM', 'LINEAGE-LINKED')
+        self._write(1, 'CHAR', 'UTF-8')
+        self._write_pointer(1, 'SUBM', SUBMITTER_XREF)
+        self._write(0, 'SUBM', xref=SUBMITTER_XREF)
+        self._write(1, 'NAME', 'cnv_genlog')
+
+    def write_person(self, person_id, person):
+        # Second pass: write the INDI record, unless another record with the same title came first.
+        xref = self._xrefs[sanitize_title(person_id)]
+        if xref not in self._defined:
+            return
+
+        self._defined.remove(xref)
+        self.individuals += 1
+        self._write(0, 'INDI', xref=xref)
+        self._write(1, 'NAME', get_name(person.name or person_id))
+        self._write(1, 'REFN', person_id)
+        if person.profession:
+            self._write(1, 'OCCU', person.profession)
+        if person.birth:
+            self._write_event('BIRT', person.birth)
+        if person.death:
+            self._write_event('DEAT', person.death)
+        if person.image:
+            self._write(1, 'OBJE')
+            self._write(2, 'FILE', f'images/{person.image}')
+            self._write(3, 'FORM', os.path.splitext(person.image)[1][1:].lower())
+        if person.desc:
+            self._write_text(1, 'NOTE', '\n'.join(person.desc))
+        for document in person.documents:
+            link = get_link(document)
+            self._write_text(1, 'NOTE', f'Dokument: {link or document}')
+        self._f.writelines(self._family_links.pop(xref, ()))
+
+    def write_families(self):
+        for family_xref, parents, children in self._families:
+            self.families += 1
+            self._write(0, 'FAM', xref=family_xref)
+            for role, parent_xref in self._get_roles(parents):
+                self._write_pointer(1, role, parent_xref)
+            for child_xref in children:
+                self._write_pointer(1, 'CHIL', child_xref)
+        self._families.clear()
+
+    def write_placeholders(self):
+        # Write an INDI record for each link target without a record.
+        for xref, title in self._placeholders.items():
+            self.individuals += 1
+            self._write(0, 'INDI', xref=xref)
+            self._write(1, 'NAME', title)
+            self._write(1, 'NOTE', 'Kein Datensatz')
+            self._f.writelines(self._family_links.pop(xref, ()))
+        self._placeholders.clear()
+
+    def write_trailer(self):
+        self._write(0, 'TRLR')
+
+    def _add_parent(self, parents, parent_xref):
+        # Bad data may name more than two parents; the first two are kept.
+        if parent_xref not in parents and len(parents) < 2:
+            parents.append(parent_xref)
+
+    def _get_roles(self, parents):
+        # Return (role, xref) pairs, ordered by xref number.
+        parents = sorted(parents, key=lambda xref: int(xref[2:-1]))
+        if len(parents) == 1:
+            return [(self._roles.get(parents[0], HUSBAND), parents[0])]
+
+        first, second = parents
+        if self._roles.get(first) == WIFE or self._roles.get(second) == HUSBAND:
+            first, second = second, first
+        return [(HUSBAND, first), (WIFE, second)]
+
+    def _get_xref(self, title):
+        # Xrefs are assigned on first sight, either as a record ID or as a link target.
+        xref = self._xrefs.get(title)
+        if xref is None:
+            xref = self._xrefs[title] = f'@I{len(self._xrefs) + 1}@'
+            self._placeholders[xref] = title
+        return xref
+
+    def _get_link_xref(self, text):
+        if not text:
+            return None
+
+        title = get_link_title(text)
+        if title is None or title.startswith('documents'):
+            # Plain text, or a link to a document.
+            return None
+
+        return self._get_xref(title)
+
+    def _write_event(self, tag, text):
+        self._write(1, tag)
+        date, place = get_date_and_place(text)
+        if date:
+            self._write(2, 'DATE', date)
+        if place:
+            self._write(2, 'PLAC', place)
+
+    def _write_text(self, level, tag, text):
+        # Write multi-line text with CONT, and long lines with CONC.
+        for i, line in enumerate(text.split('\n')):
+            chunks = [line[j:j + MAX_LINE_LENGTH] for j in range(0, len(line), MAX_LINE_LENGTH)] or ['']
+            if i:
+                self._write(level + 1, 'CONT', chunks[0])
+            else:
+                self._write(level, tag, chunks[0])
+            for chunk in chunks[1:]:
+                self._write(level + 1, 'CONC', chunk)
+
+    def _write(self, level, tag, value=None, xref=None):
+        if xref:
+            self._f.write(f'{level} {xref} {tag}\n')
+        elif value:
+            # An "@" in a line value must be doubled.
+            value = value.replace('@', '@@')
+            self._f.write(f'{level} {tag} {value}\n')
+        else:
+            self._f.write(f'{level} {tag}\n')
+
+    def _write_pointer(self, level, tag, xref):
+        self._f.write(f'{level} {tag} {xref}\n')
+
+
+def get_name(name):
+    # Return a GEDCOM personal name; "Surname, Given names" becomes "Given names /Surname/".
+    name = name.replace('/', '')
+    if ',' not in name:
+        return name
+
+    surname, given = name.split(',', 1)
+    return f'{given.strip()} /{surname.strip()}/'.strip()
+
+
+def get_date_and_place(text):
+    # Return a GEDCOM date and a place from free text like "18.11.1928 in Hollywood".
+    # Dates that are not day.month.year, month.year, or year are kept as date phrases.
+    date, separator, place = text.partition(' in ')
+    date = date.strip()
+    place = place.strip()
+    if not separator and not date[:1].isdigit():
+        return f'({date})', ''
+
+    if not date:
+        return '', place
+
+    match = date_pattern.match(date)
+    if match is None:
+        return f'({date})', place
+
+    first, second, year = match.groups()
+    day, month = (first, second) if second else (None, first)
+    if month and not 1 <= int(month) <= 12:
+        return f'({date})', place
+
+    parts = []
+    if day:
+        parts.append(str(int(day)))
+    if month:
+        parts.append(MONTHS[int(month) - 1])
+    parts.append(year)
+    return ' '.join(parts), place
+
+
+def write_gedcom(f, people):
+    # Write the records to an open text file; return the GedcomWriter with the statistics.
+    # The records are read twice; people is a people dict, or a function returning a new record stream.
+    if callable(people):
+        get_records = people
+    else:
+        get_records = lambda: iter_records(people)
+    writer = GedcomWriter(f)
+    for person_id, person in get_records():
+        writer.add_person(person_id, person)
+    writer.link_families()
+    writer.write_header()
+    for person_id, person in get_records():
+        writer.write_person(person_id, person)
+    writer.write_families()
+    writer.write_placeholders()
+    writer.write_trailer()
+    return writer
+
+
+def main(file_path):
+    root, extension = os.path.splitext(file_path)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        duplicates = count_record_ids(iter_lines(f))
+    with open(f'{root}{GEDCOM_EXTENSION}', 'w', encoding='utf-8') as out:
+        writer = write_gedcom(out, lambda: iter_file_people(file_path, duplicates=duplicates))
+    for person_id in writer.duplicates:
+        print(f'Titelkollision: {person_id}')
+    print(f'{writer.individuals} Personen, {writer.families} Familien geschrieben')
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+"""Converts the bitmaps referenced by the family records into JPEG images.
+
+Usage: image_stage.py [-j workers] path-to-txt-file path-to-bmp-directory
+
+Parses the text file, looks up the BMP files referenced by
+the records in the directory tree, and converts them into the
+images folder of the Obsidian vault written by parse_family_data.py,
+where the image embeds of the notes point.
+
+Byte-identical bitmaps are converted only once; the other
+images are copied from the first one. Images whose bitmap is
+unchanged since the last run are skipped. Bitmaps missing in
+the directory tree are reported.
+
+Requires the Pillow package.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License
+(https://opensource.org/licenses/mit-license.php)
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import os
+import shutil
+import sys
+
+from manifest import Manifest
+from manifest import hash_file
+import metrics
+from parse_family_data import IMAGE_SUBDIR
+from parse_family_data import iter_lines
+from parse_family_data import iter_records
+from parse_family_data import parse_lines
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+BITMAP_EXTENSION = '.bmp'
+IMAGE_MANIFEST_FILE = '.cnv_genlog_images.json'
+JPEG_QUALITY = 90
+
+# Results besides None for a converted image, and an error message.
+UNCHANGED = 'unchanged'
+COPIED = 'copied'
+MISSING = 'missing'
+
+
+def convert_bitmap(bmp_file, jpg_file):
+    # Write a temporary file first, so that Obsidian never sees a half-written image.
+    # On failure, the temporary file is removed, so that no stale files are left in the vault.
+    temp_path = f'{jpg_file}.tmp'
+    try:
+        with Image.open(bmp_file) as image:
+            image.convert('RGB').save(temp_path, 'JPEG', quality=JPEG_QUALITY)
+        os.replace(temp_path, jpg_file)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _convert_item(bmp_file, jpg_file, converter):
+    # Worker function; errors are returned as text, so that a bad bitmap does not stop the batch.
+    try:
+        converter(bmp_file, jpg_file)
+    except Exception as ex:
+        return f'{type(ex).__name__}: {ex}'
+
+    return None
+
+
+def collect_images(people):
+    # Return the sorted names of the images referenced by a people dict or a record stream.
+    images = set()
+    for __, person in iter_records(people):
+        if person.image:
+            images.add(person.image)
+    return sorted(images)
+
+
+def find_bitmaps(folder_path):
+    # Return {bitmap key: path} for the BMP files in the directory tree.
+    # File names are compared the way Windows does, since HELPDECO runs there.
+    bitmaps = {}
+    for folder, __, files in os.walk(folder_path):
+        for file_name in sorted(files):
+            stem, extension = os.path.splitext(file_name)
+            if extension.lower() == BITMAP_EXTENSION:
+                bitmaps.setdefault(stem.casefold(), os.path.join(folder, file_name))
+    return bitmaps
+
+
+def convert_images(images, bmp_folder, image_folder, workers=None, converter=convert_bitmap):
+    # Convert the bitmaps of the images (e.g. 'X.jpg' for X.BMP) in a process pool.
+    # Return a dict {image: None, UNCHANGED, COPIED, MISSING, or error message}.
+    # The converter must be picklable, i.e. defined at module level; with workers=0, it runs in the main process.
+    os.makedirs(image_folder, exist_ok=True)
+    manifest = Manifest(os.path.join(image_folder, IMAGE_MANIFEST_FILE))
+    bitmaps = find_bitmaps(bmp_folder)
+    results = {}
+
+    # Source hash: [bitmap path, image, ...], for the images to be written.
+    pending = {}
+    with metrics.stage('hash_bitmaps'):
+        for image in images:
+            bmp_file = bitmaps.get(os.path.splitext(image)[0].casefold())
+            if bmp_file is None:
+                results[image] = MISSING
+                continue
+
+            source_hash = hash_file(bmp_file)
+            if manifest.get(image) == source_hash and os.path.isfile(os.path.join(image_folder, image)):
+                results[image] = UNCHANGED
+                continue
+
+            pending.setdefault(source_hash, [bmp_file]).append(image)
+
+    sources = [items[0] for items in pending.values()]
+    targets = [os.path.join(image_folder, items[1]) for items in pending.values()]
+    with metrics.stage('convert_images'):
+        if workers == 0:
+            errors = map(_convert_item, sources, targets, repeat(converter))
+            _store_results(pending, errors, image_folder, manifest, results)
+        elif pending:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                errors = executor.map(_convert_item, sources, targets, repeat(converter))
+                _store_results(pending, errors, image_folder, manifest, results)
+    metrics.add('images', len(sources))
+    manifest.write()
+    return {image: results[image] for image in images}
+
+
+def _store_results(pending, errors, image_folder, manifest, results):
+    for (source_hash, (__, first, *duplicates)), error in zip(pending.items(), errors):
+        if error is not None:
+            # The manifest entries are dropped, so that the images are converted again on the next run.
+            for image in (first, *duplicates):
+                results[image] = error
+                manifest.remove(image)
+            continue
+
+        results[first] = None
+        manifest.set(first, source_hash)
+        for image in duplicates:
+            shutil.copyfile(os.path.join(image_folder, first), os.path.join(image_folder, image))
+            results[image] = COPIED
+            manifest.set(image, source_hash)
+
+
+def print_summary(results):
+    # Return the number of missing and failed images.
+    counts = dict.fromkeys((None, COPIED, UNCHANGED, MISSING), 0)
+    errors = 0
+    for image, result in results.items():
+        if result == MISSING:
+            print(f'Bild fehlt: {os.path.splitext(image)[0]}.BMP')
+        if result in counts:
+            counts[result] += 1
+        else:
+            errors += 1
+            print(f'FEHLER {image}: {result}')
+    print(
+        f'{len(results)} Bilder: {counts[None]} konvertiert, {counts[COPIED]} kopiert, '
+        f'{counts[UNCHANGED]} unverändert, {counts[MISSING]} fehlen, {errors} Fehler'
+    )
+    return errors + counts[MISSING]
+
+
+def main(file_path, bmp_folder, workers=None):
+    if Image is None:
+        sys.exit('Für die Bildkonversion wird das Paket Pillow benötigt.')
+
+    root, extension = os.path.splitext(file_path)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        people = parse_lines(iter_lines(f))
+    image_folder = os.path.join(f'{root}_vault', IMAGE_SUBDIR)
+    return print_summary(convert_images(collect_images(people), bmp_folder, image_folder, workers))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Convert the bitmaps referenced by the records into JPEG images.')
+    parser.add_argument('path', help='text file')
+    parser.add_argument('bitmaps', help='directory with the BMP files')
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        default=None,
+        help='number of processes converting the images (default: number of CPUs; 0 converts in the main process)'
+    )
+    args = parser.parse_args()
+    main(args.path, args.bitmaps, args.workers)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""Resolves the links between parsed family records.
+
+Usage: link_index.py path-to-txt-file
+
+Prints a report of dangling and asymmetric links.
+
+Links are resolved the way Obsidian resolves them in the vault:
+a link points to the record whose sanitized ID equals the 
+sanitized link target.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License 
+(https://opensource.org/licenses/mit-license.php)
+"""
+import sys
+
+from parse_family_data import get_link_title
+from parse_family_data import iter_lines
+from parse_family_data import parse_lines
+from parse_family_data import sanitize_title
+
+# Link kinds.
+FATHER = 'Vater'
+MOTHER = 'Mutter'
+SPOUSE = 'Ehepartner'
+CHILD = 'Kind'
+
+# Issue kinds.
+DANGLING = 'Verweis ohne Ziel'
+PARENT_MISSING = 'Kind nennt Elternteil nicht'
+CHILD_MISSING = 'Elternteil nennt Kind nicht'
+SPOUSE_MISSING = 'Ehepartner nennt Person nicht'
+
+
+class LinkIndex:
+
+    def __init__(self, people):
+        self.people = people
+
+        # Sanitized title: person ID.
+        self.ids = {}
+        for person_id in people:
+            self.ids.setdefault(sanitize_title(person_id), person_id)
+
+        # Forward adjacency: person ID: resolved IDs.
+        self.fathers = {}
+        self.mothers = {}
+        self.spouses = {}
+        self.children = {}
+
+        # Reverse adjacency: person ID: IDs of the records citing it.
+        self.cited_as_parent = {}
+        self.cited_as_spouse = {}
+        self.cited_as_child = {}
+
+        # (person ID, link kind, link text) for links whose target is not a record.
+        self.dangling = []
+
+        for person_id, person in people.items():
+            father = self._resolve(person_id, FATHER, person.father)
+            if father is not None:
+                self.fathers[person_id] = father
+                self.cited_as_parent.setdefault(father, []).append(person_id)
+            mother = self._resolve(person_id, MOTHER, person.mother)
+            if mother is not None:
+                self.mothers[person_id] = mother
+                self.cited_as_parent.setdefault(mother, []).append(person_id)
+            spouses = self._resolve_all(person_id, SPOUSE, person.spouses)
+            if spouses:
+                self.spouses[person_id] = spouses
+                for spouse in spouses:
+                    self.cited_as_spouse.setdefault(spouse, []).append(person_id)
+            children = self._resolve_all(person_id, CHILD, person.children)
+            if children:
+                self.children[person_id] = children
+                for child in children:
+                    self.cited_as_child.setdefault(child, []).append(person_id)
+
+    def resolve(self, text):
+        # Return the ID of the record the text links to, or None.
+        if not text:
+            return None
+
+        title = get_link_title(text)
+        if title is None:
+            return None
+
+        return self.ids.get(title)
+
+    def get_parents(self, person_id):
+        # Return the IDs of the parents, as linked by the record itself.
+        parents = []
+        for parent in (self.fathers.get(person_id), self.mothers.get(person_id)):
+            if parent is not None:
+                parents.append(parent)
+        return parents
+
+    def check(self):
+        # Return a list of (issue kind, person ID, detail) tuples.
+        issues = []
+        for person_id, kind, text in self.dangling:
+            issues.append((DANGLING, person_id, f'{kind}: {text}'))
+        for person_id, children in self.children.items():
+            for child in children:
+                if person_id not in self.get_parents(child):
+                    issues.append((PARENT_MISSING, person_id, child))
+        for person_id in self.fathers.keys() | self.mothers.keys():
+            for parent in self.get_parents(person_id):
+                if person_id not in self.children.get(parent, ()):
+                    issues.append((CHILD_MISSING, person_id, parent))
+        for person_id, spouses in self.spouses.items():
+            for spouse in spouses:
+                if person_id not in self.spouses.get(spouse, ()):
+                    issues.append((SPOUSE_MISSING, person_id, spouse))
+        return issues
+
+    def _resolve(self, person_id, kind, text):
+        if not text:
+            return None
+
+        if get_link_title(text) is None:
+            # Plain text, e.g. a name without a record.
+            return None
+
+        target = self.resolve(text)
+        if target is None:
+            self.dangling.append((person_id, kind, text))
+        return target
+
+    def _resolve_all(self, person_id, kind, texts):
+        targets = []
+        for text in texts:
+            target = self._resolve(person_id, kind, text)
+            if target is not None:
+                targets.append(target)
+        return targets
+
+
+def print_report(issues):
+    for kind, person_id, detail in issues:
+        print(f'{kind}: {person_id} -> {detail}')
+    print(f'{len(issues)} Probleme gefunden')
+
+
+def main(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        people = parse_lines(iter_lines(f))
+    print_report(LinkIndex(people).check())
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
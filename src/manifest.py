@@ -0,0 +1,73 @@
+"""Provides a manifest of content hashes for incremental rebuilds.
+
+A manifest maps keys (e.g. file paths or note titles) to the hashes 
+of the content they were built from, so that unchanged items can be 
+skipped on the next run. 
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License 
+(https://opensource.org/licenses/mit-license.php)
+"""
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 1
+BLOCK_SIZE = 1 << 20
+
+
+def hash_text(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def hash_file(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Manifest:
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.entries = {}
+        self.modified = False
+        self.read()
+
+    def read(self):
+        # A missing, damaged, or outdated manifest means a full rebuild.
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if isinstance(data, dict) and data.get('version') == MANIFEST_VERSION:
+            self.entries = data.get('entries', {})
+
+    def write(self):
+        if not self.modified:
+            return
+
+        # Write a temporary file first, so that an aborted run leaves the old manifest intact.
+        temp_path = f'{self.file_path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'entries': self.entries}, f, indent=1)
+        os.replace(temp_path, self.file_path)
+        self.modified = False
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, value):
+        if self.entries.get(key) != value:
+            self.entries[key] = value
+            self.modified = True
+
+    def remove(self, key):
+        if key in self.entries:
+            del self.entries[key]
+            self.modified = True
@@ -0,0 +1,221 @@
+"""Provides opt-in metrics and profiling for the conversion stages.
+
+The stage functions report to the active Metrics object, if any.
+Without one, the hooks cost a function call and a None check.
+
+Stage times are exclusive: the time spent in a nested stage, 
+e.g. parsing records while the notes are written, 
+is attributed to the nested stage only. 
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License 
+(https://opensource.org/licenses/mit-license.php)
+"""
+import cProfile
+import io
+import json
+import linecache
+import pstats
+import time
+import tracemalloc
+
+REPORT_VERSION = 1
+TOP_ENTRIES = 20
+
+_active = None
+
+
+class Metrics:
+
+    def __init__(self):
+        # Stage name: {'calls', 'wall', 'cpu', 'bytes_in', 'bytes_out'}.
+        self.stages = {}
+
+        # Counter name: value, e.g. records, notes, or token kinds.
+        self.counters = {}
+        self._stack = []
+
+    def stage(self, name, bytes_in=0):
+        return Stage(self, name, bytes_in)
+
+    def iter_stage(self, name, iterable, counter=None, bytes_in=0):
+        # Yield the items, attributing the time spent producing them to the stage.
+        # With counter, the items are counted under that name.
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name, bytes_in):
+                bytes_in = 0
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+
+            if counter:
+                self.add(counter)
+            yield item
+
+    def add(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_counts(self, counts):
+        for name, value in counts.items():
+            self.add(name, value)
+
+    def split_stage(self, name, nested_name, wall):
+        # Move time measured within a stage, e.g. by the converter itself, to a nested stage.
+        # The nested work is taken as pure computation, i.e. its CPU time as its wall time.
+        entry = self.stages[name]
+        entry['wall'] = max(entry['wall'] - wall, 0.0)
+        entry['cpu'] = max(entry['cpu'] - wall, 0.0)
+        nested = self.stages.get(nested_name)
+        if nested is None:
+            nested = self.stages[nested_name] = dict(calls=0, wall=0.0, cpu=0.0, bytes_in=0, bytes_out=0)
+        nested['calls'] += 1
+        nested['wall'] += wall
+        nested['cpu'] += wall
+
+    def merge(self, other):
+        # Add the stages and counters of another Metrics object, e.g. from a worker process.
+        for name, other_entry in other.stages.items():
+            entry = self.stages.setdefault(name, dict.fromkeys(other_entry, 0))
+            for key, value in other_entry.items():
+                entry[key] += value
+        self.add_counts(other.counters)
+
+    def get_report(self):
+        return {
+            'version': REPORT_VERSION,
+            'stages': self.stages,
+            'counters': self.counters,
+        }
+
+    def write(self, file_path):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.get_report(), f, indent=2)
+
+    def _enter(self, stage):
+        self._stack.append(stage)
+
+    def _exit(self, stage, wall, cpu):
+        # Subtract the time of the nested stages, and add the rest to the stage totals.
+        self._stack.pop()
+        if self._stack:
+            parent = self._stack[-1]
+            parent.nested_wall += wall
+            parent.nested_cpu += cpu
+        entry = self.stages.get(stage.name)
+        if entry is None:
+            entry = self.stages[stage.name] = dict(calls=0, wall=0.0, cpu=0.0, bytes_in=0, bytes_out=0)
+        entry['calls'] += 1
+        entry['wall'] += wall - stage.nested_wall
+        entry['cpu'] += cpu - stage.nested_cpu
+        entry['bytes_in'] += stage.bytes_in
+        entry['bytes_out'] += stage.bytes_out
+
+
+class Stage:
+    # Context manager timing a single stage run.
+    # The caller may set bytes_out, and add to bytes_in, before the stage is left.
+    # For str data, the sizes are counted in characters.
+
+    def __init__(self, metrics, name, bytes_in=0):
+        self.metrics = metrics
+        self.name = name
+        self.bytes_in = bytes_in
+        self.bytes_out = 0
+        self.nested_wall = 0.0
+        self.nested_cpu = 0.0
+
+    def __enter__(self):
+        self.metrics._enter(self)
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        self.metrics._exit(self, wall, cpu)
+
+
+class NullStage:
+    # Stand-in for Stage, if no metrics are collected.
+    bytes_in = 0
+    bytes_out = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def __setattr__(self, name, value):
+        pass
+
+
+NULL_STAGE = NullStage()
+
+
+def enable(metrics=None):
+    # Activate a Metrics object, and return it.
+    global _active
+    if metrics is None:
+        metrics = Metrics()
+    _active = metrics
+    return metrics
+
+
+def disable():
+    global _active
+    _active = None
+
+
+def get_active():
+    return _active
+
+
+def stage(name, bytes_in=0):
+    # Return a context manager for the stage.
+    if _active is None:
+        return NULL_STAGE
+
+    return _active.stage(name, bytes_in)
+
+
+def iter_stage(name, iterable, counter=None, bytes_in=0):
+    if _active is None:
+        return iterable
+
+    return _active.iter_stage(name, iterable, counter, bytes_in)
+
+
+def add(name, value=1):
+    if _active is not None:
+        _active.add(name, value)
+
+
+def profile(function, *args, top=TOP_ENTRIES, **kwargs):
+    # Run the function with cProfile and tracemalloc, and print the top hotspots.
+    # Return the result of the function.
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    try:
+        result = profiler.runcall(function, *args, **kwargs)
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+    print(stream.getvalue())
+
+    print(f'Speicher: {peak / 1024 / 1024:.1f} MB Spitze')
+    for statistic in snapshot.statistics('lineno')[:top]:
+        frame = statistic.traceback[0]
+        line = linecache.getline(frame.filename, frame.lineno).strip()
+        print(f'{statistic.size / 1024:10.1f} KB {statistic.count:8d} x {frame.filename}:{frame.lineno}: {line}')
+    return result
@@ -0,0 +1,121 @@
+"""Provides a concurrent, atomic writer for Obsidian notes.
+
+Notes are written to a temporary file first and then renamed, 
+so that Obsidian never sees a half-written note. 
+With workers, the files are written by a bounded thread pool, 
+which hides the per-file latency of network shares.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License 
+(https://opensource.org/licenses/mit-license.php)
+"""
+from concurrent.futures import ThreadPoolExecutor
+import os
+import tempfile
+import threading
+import time
+
+# Number of pending notes per worker thread.
+QUEUE_FACTOR = 4
+
+
+def get_file_mode():
+    # Return the mode of a file created by open(), i.e. 0o666 restricted by the umask.
+    # The umask can only be read by setting it; this is done once, on import, before any threads write.
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# The temporary files are created owner-only; the notes get the usual mode.
+FILE_MODE = get_file_mode()
+
+
+class NoteWriter:
+
+    def __init__(self, folder_path, workers=0):
+        # With workers=0, the notes are written in the calling thread.
+        self.folder_path = folder_path
+        self.owners = {}
+        self.collisions = []
+        self.written = 0
+        self.errors = []
+        self._lock = threading.Lock()
+        self._executor = None
+        if workers > 0:
+            self._executor = ThreadPoolExecutor(max_workers=workers)
+            self._slots = threading.BoundedSemaphore(workers * QUEUE_FACTOR)
+        self._start = time.perf_counter()
+        self.elapsed = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def claim(self, title, owner):
+        # Reserve a note title for a record; return False if another record already has it.
+        first_owner = self.owners.setdefault(title, owner)
+        if first_owner != owner:
+            self.collisions.append((title, first_owner, owner))
+            return False
+
+        return True
+
+    def write(self, title, content):
+        if self._executor is None:
+            self._write_note(title, content)
+            return
+
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(self._write_note, title, content)
+        except:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(self._release)
+
+    def close(self):
+        # Wait for the pending notes; raise the first write error, if any.
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        if self.elapsed is None:
+            self.elapsed = time.perf_counter() - self._start
+        if self.errors:
+            raise self.errors[0]
+
+    def get_throughput(self):
+        # Return the number of notes written per second.
+        elapsed = self.elapsed
+        if elapsed is None:
+            elapsed = time.perf_counter() - self._start
+        if elapsed <= 0:
+            return 0.0
+
+        return self.written / elapsed
+
+    def _release(self, future):
+        self._slots.release()
+        error = future.exception()
+        if error is not None:
+            with self._lock:
+                self.errors.append(error)
+
+    def _write_note(self, title, content):
+        note_path = os.path.join(self.folder_path, f'{title}.md')
+        fd, temp_path = tempfile.mkstemp(suffix='.tmp', prefix='.', dir=self.folder_path)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.chmod(temp_path, FILE_MODE)
+            os.replace(temp_path, note_path)
+        except:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self._lock:
+            self.written += 1
@@ -1,22 +1,62 @@
 #!/usr/bin/env python
 """Parses a text file extracted and converted from a genlog HLP file.
 
-Usage: parse-family_data.py path-to-txt-file
+Usage: parse-family_data.py [--incremental] [-j workers] [-p workers] [--snapshot] [--metrics file] [--profile] path-to-txt-file
+
+With --incremental, a manifest of the note hashes is kept in the vault; 
+only changed notes are written, and notes of vanished records are removed.
+With -j, the notes are written by the given number of threads.
+With -p, the whole file is read, and the records are parsed by the given 
+number of processes before the notes are written.
+With --snapshot, the parsed records are kept in a snapshot file next to 
+the text file, and loaded from there as long as the text and 
+the parser are unchanged.
+With --metrics, the time of the stages and the numbers of records and notes
+are written to the given file as a JSON report. 
+With --profile, the run is profiled, and the hotspots are printed.
 
 Copyright (c) 2025 Peter Triesberger
 For further information see https://github.com/peter88213/cnv_genlog
 Published under the MIT License 
 (https://opensource.org/licenses/mit-license.php)
 """
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from functools import wraps
+from itertools import repeat
 import os
-import sys
 import re
+import sys
+
+from manifest import Manifest
+from manifest import hash_file
+from manifest import hash_text
+import metrics
+from note_writer import NoteWriter
+from snapshot import Snapshot
+from snapshot import is_slotted
 
 RECORD_MARKER = '$#K'
 IMAGE_MARKER = '{bmc '
 link_pattern = re.compile(r'\[\[(.*?)\]\]')
 image_pattern = re.compile(r'{bmc (.*?)\.BMP}')
+year_pattern = re.compile(r'\b(\d{3,4})\b')
 IMAGE_SUBDIR = 'images'
+MANIFEST_FILE = '.cnv_genlog_manifest.json'
+
+# Number of characters collected before the serialized records are written.
+BUFFER_SIZE = 1 << 16
+
+# Least number of results kept by each of the memoized link helpers.
+# There is about one distinct link per record; when a corpus is parsed or loaded,
+# the caches are sized from the number of records, see set_link_cache_size.
+LINK_CACHE_SIZE = 1 << 15
+
+# To be increased whenever a change of the parser changes its results, which invalidates the snapshots.
+PARSER_VERSION = 1
+SNAPSHOT_SUFFIX = '.snapshot'
 
 # Parser states.
 EXPECT_NAME = 0
@@ -27,20 +67,86 @@ EXPECT_CHILDREN = 4
 EXPECT_PROFESSION = 5
 EXPECT_DOCUMENTS = 6
 
+# The line markers of a Genlog export.
+# Markers are checked in this order; a variant schema may replace any of them.
+DEFAULT_SCHEMA = dict(
+    record=RECORD_MARKER,
+    image=IMAGE_MARKER,
+    spouse='oo',
+    birth='*',
+    death='+',
+    father='Vater:',
+    mother='Mutter:',
+    children='Kinder:',
+    documents='Dokumente:',
+)
+
+# Marker actions.
+RECORD = 0
+IMAGE = 1
+SPOUSE = 2
+BIRTH = 3
+DEATH = 4
+FIELD = 5
+
+# Schema key: (marker action, state to enter).
+MARKER_ACTIONS = dict(
+    record=(RECORD, EXPECT_NAME),
+    image=(IMAGE, None),
+    spouse=(SPOUSE, EXPECT_DESC),
+    birth=(BIRTH, EXPECT_DESC),
+    death=(DEATH, EXPECT_DESC),
+    father=(FIELD, EXPECT_FATHER),
+    mother=(FIELD, EXPECT_MOTHER),
+    children=(FIELD, EXPECT_CHILDREN),
+    documents=(FIELD, EXPECT_DOCUMENTS),
+)
+
+# How the text collected in a state is stored.
+SET_TEXT = 0
+SET_LINK = 1
+ADD_DESC = 2
+SET_LINKS = 3
+
+# State: (Person attribute, how to store).
+LEAVE_ACTIONS = {
+    EXPECT_NAME: ('name', SET_TEXT),
+    EXPECT_PROFESSION: ('profession', SET_TEXT),
+    EXPECT_DESC: ('desc', ADD_DESC),
+    EXPECT_FATHER: ('father', SET_LINK),
+    EXPECT_MOTHER: ('mother', SET_LINK),
+    EXPECT_CHILDREN: ('children', SET_LINKS),
+    EXPECT_DOCUMENTS: ('documents', SET_LINKS),
+}
+
 
 class Person:
+    __slots__ = (
+        'name',
+        'profession',
+        'desc',
+        'children',
+        'father',
+        'mother',
+        'birth',
+        'death',
+        'documents',
+        'spouses',
+        'image',
+    )
 
     def __init__(self):
         self.name = None
         self.profession = None
-        self.desc = []
-        self.children = []
+        # Empty tuples are shared, so records without items don't carry empty lists.
+        self.desc = ()
+        self.children = ()
         self.father = None
         self.mother = None
         self.birth = None
         self.death = None
-        self.documents = []
-        self.spouses = []
+        self.documents = ()
+        self.spouses = ()
         self.image = None
 
     def get_record(self, person_id=None):
@@ -86,56 +192,200 @@ class Person:
         if self.spouses:
             lines.append('### Verheiratet:')
             for spouse in self.spouses:
-                if '[[' in spouse:
-                    link = link_pattern.search(spouse).group(1)
-                    spouse = spouse.replace(link, sanitize_title(link))
-                lines.append(f'  - {spouse}')
+                lines.append(f'  - {sanitize_link_text(spouse)}')
 
         return lines
 
 
-def extract_link(text):
+# The link helpers are memoized, because the same links
+# occur in many records, and records may be serialized repeatedly.
+# The caches are bounded, so that a long-running process,
+# e.g. the query server reloading changed files, does not grow.
+_link_helpers = []
+
+
+def memoize_link(func):
+    # Return func memoized in a bounded cache that set_link_cache_size can replace.
+    # The returned function keeps its identity, so modules that imported it use the new cache.
+    cached = lru_cache(maxsize=LINK_CACHE_SIZE)(func)
+
+    @wraps(func)
+    def memoized(text):
+        return cached(text)
+
+    def resize(maxsize):
+        nonlocal cached
+        cached = lru_cache(maxsize=maxsize)(func)
+
+    memoized.cache_info = lambda: cached.cache_info()
+    memoized.cache_clear = lambda: cached.cache_clear()
+    memoized.resize = resize
+    _link_helpers.append(memoized)
+    return memoized
+
+
+def set_link_cache_size(records):
+    # Size the caches of the link helpers for a corpus with the given number of records.
+    # The size is rounded up to a power of two, with room for twice as many links,
+    # so that a corpus reloaded with a few more or less records keeps the cached results.
+    maxsize = max(LINK_CACHE_SIZE, 1 << (records * 2).bit_length())
+    for helper in _link_helpers:
+        if helper.cache_info().maxsize != maxsize:
+            helper.resize(maxsize)
+
+@memoize_link
+def get_link(text):
+    # Return the first wiki link target in the text, or None.
     if not '[[' in text:
+        return None
+
+    return link_pattern.search(text).group(1)
+
+
+@memoize_link
+def get_link_title(text):
+    # Return the sanitized title of the first wiki link in the text, or None.
+    link = get_link(text)
+    if link is None:
+        return None
+
+    return sanitize_title(link)
+
+
+@memoize_link
+def extract_link(text):
+    title = get_link_title(text)
+    if title is None:
         return text
 
-    link = link_pattern.search(text).group(1)
-    return f'[[{sanitize_title(link)}]]'
+    return f'[[{title}]]'
+
+
+@memoize_link
+def sanitize_link_text(text):
+    # Return the text with the first wiki link target sanitized.
+    link = get_link(text)
+    if link is None:
+        return text
+
+    return text.replace(link, sanitize_title(link))
+
+
+def iter_records(people):
+    # Return (person_id, person) pairs from a people dict or from a record stream.
+    if isinstance(people, dict):
+        return iter(people.items())
+
+    return iter(people)
 
 
 def serialize_people(people):
     lines = []
-    for i, person_id in enumerate(people):
-        lines.extend(people[person_id].get_record(person_id))
+    count = 0
+    for person_id, person in iter_records(people):
+        lines.extend(person.get_record(person_id))
         lines.append('')
-    lines.append(f'{i} Datensätze gefunden')
+        count += 1
+    lines.append(get_summary(count))
     return lines
 
 
-def print_people(people):
-    lines = serialize_people(people)
-    for line in lines:
-        print(line)
+def get_summary(count):
+    # The number given is one less than the number of records; it is kept for compatible output.
+    return f'{max(count - 1, 0)} Datensätze gefunden'
+
+
+def write_serialized(f, people, buffer_size=BUFFER_SIZE, end=''):
+    # Write the records and the summary line to a text stream, as serialize_people would join them.
+    # The text is collected in a buffer of about buffer_size characters, so that
+    # the stream is written in a few large pieces, and a record stream is never held in memory.
+    pieces = []
+    size = 0
+    count = 0
+    for person_id, person in iter_records(people):
+        text = '\n'.join(person.get_record(person_id))
+        pieces.append(text)
+        pieces.append('\n\n')
+        size += len(text) + 2
+        count += 1
+        if size >= buffer_size:
+            f.write(''.join(pieces))
+            pieces.clear()
+            size = 0
+    pieces.append(get_summary(count))
+    pieces.append(end)
+    f.write(''.join(pieces))
+
 
+def print_people(people, buffer_size=BUFFER_SIZE):
+    write_serialized(sys.stdout, people, buffer_size, '\n')
 
-def write_single_text_file(file_path, people):
-    lines = serialize_people(people)
+
+def write_single_text_file(file_path, people, buffer_size=BUFFER_SIZE):
     with open(file_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
+        write_serialized(f, people, buffer_size)
 
 
+@memoize_link
 def sanitize_title(title):
     # Return title with disallowed characters removed.
     return re.sub(r'[\\|\/|\:|\*|\?|\"|\<|\>|\|]+', '', title)
 
 
-def write_obsidian_notes(folder_path, people):
-    os.makedirs(folder_path, exist_ok=True)
+def get_year(text):
+    # Return the first three- or four-digit number in the text, or None.
+    if not text:
+        return None
+
+    match = year_pattern.search(text)
+    if match is None:
+        return None
 
-    for person_id in people:
-        title = sanitize_title(person_id)
-        lines = people[person_id].get_record()
-        with open(f'{folder_path}/{title}.md', 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+    return int(match.group(1))
+
+
+def write_obsidian_notes(folder_path, people, incremental=False, workers=0):
+    # Return the NoteWriter with the statistics and title collisions.
+    os.makedirs(folder_path, exist_ok=True)
+    manifest = None
+    if incremental:
+        # Skip notes whose content is unchanged since the last run, and
+        # remove the notes of vanished records written by an earlier run.
+        manifest = Manifest(f'{folder_path}/{MANIFEST_FILE}')
+        stale_titles = set(manifest.entries)
+
+    with NoteWriter(folder_path, workers) as writer:
+        for person_id, person in iter_records(people):
+            title = sanitize_title(person_id)
+            if not writer.claim(title, person_id):
+                # Another record has the same sanitized title.
+                continue
+
+            content = '\n'.join(person.get_record())
+            if manifest is not None:
+                stale_titles.discard(title)
+                content_hash = hash_text(content)
+                note_path = f'{folder_path}/{title}.md'
+                if manifest.get(title) == content_hash and os.path.isfile(note_path):
+                    continue
+
+                manifest.set(title, content_hash)
+            writer.write(title, content)
+
+    if manifest is not None:
+        for title in stale_titles:
+            note_path = f'{folder_path}/{title}.md'
+            if os.path.isfile(note_path):
+                os.remove(note_path)
+            manifest.remove(title)
+        manifest.write()
+    return writer
+
+
+def print_note_summary(writer):
+    for title, person_id, other_id in writer.collisions:
+        print(f'Titelkollision: "{title}" für {person_id} und {other_id}')
+    print(f'{writer.written} Notizen geschrieben ({writer.get_throughput():.0f} Dateien/s)')
 
 
 def add_person(people, person, key):
@@ -143,119 +393,419 @@ def add_person(people, person, key):
         people[key] = person
 
 
+def append_item(items, item):
+    # Return the item list with the item appended.
+    # An empty tuple, as set by Person, is replaced by a new list;
+    # a list, e.g. set by a subclass, is appended to in place.
+    if not isinstance(items, list):
+        items = list(items)
+    items.append(item)
+    return items
+
+
 def leave_state(state, person, text):
-    if state == EXPECT_NAME:
-        if text:
-            person.name = text.strip()
-    elif state == EXPECT_PROFESSION:
+    # Store the text collected in the state.
+    if not text:
+        return
+
+    leave_action = LEAVE_ACTIONS.get(state)
+    if leave_action is None:
+        return
+
+    attribute, how = leave_action
+    if how == SET_TEXT:
+        setattr(person, attribute, text.strip())
+    elif how == SET_LINK:
+        setattr(person, attribute, sys.intern(text.strip()))
+    elif how == ADD_DESC:
+        text = text.strip()
         if text:
-            person.profession = text.strip()
-    elif state == EXPECT_DESC:
-        if text:
-            text = text.strip()
-            if text:
-                person.desc.append(text)
-    elif state == EXPECT_FATHER:
-        if text:
-            person.father = text.strip()
-    elif state == EXPECT_MOTHER:
-        if text:
-            person.mother = text.strip()
-    elif state == EXPECT_CHILDREN:
-        if text:
-            person.children = text.split('\n')
-    elif state == EXPECT_DOCUMENTS:
-        if text:
-            person.documents = text.split('\n')
+            person.desc = append_item(person.desc, text)
+    elif how == SET_LINKS:
+        setattr(person, attribute, [sys.intern(item) for item in text.split('\n')])
 
 
-def parse_lines(lines, personClass=Person):
-    state = None
+def make_dispatch(schema):
+    # Return {first character: [(marker, action, state), ...]} for a line marker schema.
+    # The order of the schema is kept among markers with the same first character.
+    dispatch = {}
+    for name, marker in schema.items():
+        if not marker:
+            raise ValueError(f'Empty marker: {name}')
+
+        action, state = MARKER_ACTIONS[name]
+        dispatch.setdefault(marker[0], []).append((marker, action, state))
+    return dispatch
+
+
+DEFAULT_DISPATCH = make_dispatch(DEFAULT_SCHEMA)
+
+
+def get_dispatch(schema=None):
+    if schema is None:
+        return DEFAULT_DISPATCH
+
+    return make_dispatch({**DEFAULT_SCHEMA, **schema})
+
+
+def parse_lines(lines, personClass=Person, schema=None):
     people = {}
-    text = []
+    for key, person in metrics.iter_stage('parse_lines', iter_people(lines, personClass, schema), 'records'):
+        add_person(people, person, key)
+    set_link_cache_size(len(people))
+    return people
+
+
+def iter_people(lines, personClass=Person, schema=None):
+    # Yield (person_id, person) pairs from any line iterator, as each record closes.
+    # Unlike parse_lines, duplicate IDs are passed on as they occur; see iter_unique_people.
+    # The schema maps the DEFAULT_SCHEMA keys to the line markers of another Genlog variant.
+    yield from _iter_people(lines, personClass, get_dispatch(schema), [])
+
+
+def _iter_people(lines, personClass, dispatch, text):
+    # The text list is the line buffer; it may be passed in filled and is left as at the end of the lines.
+    state = None
     key = None
     person = None
     image = None
     for line in lines:
-        if line.startswith(RECORD_MARKER):
-            add_person(people, person, key)
+        action = None
+        for marker, marker_action, next_state in dispatch.get(line[:1], ()):
+            if not line.startswith(marker):
+                continue
+
+            # A second birth or death line is text.
+            if marker_action == BIRTH and person.birth:
+                continue
+
+            if marker_action == DEATH and person.death:
+                continue
+
+            action = marker_action
+            break
+
+        if action is None:
+            if line and state == EXPECT_NAME:
+                leave_state(state, person, line)
+                state = EXPECT_PROFESSION
+                text.clear()
+            elif line and state == EXPECT_PROFESSION:
+                leave_state(state, person, line)
+                state = EXPECT_DESC
+                text.clear()
+            elif not line and state != EXPECT_NAME:
+                if text:
+                    leave_state(state, person, '\n'.join(text))
+                    text.clear()
+                state = EXPECT_DESC
+            else:
+                text.append(line)
+        elif action == RECORD:
+            if key:
+                yield key, person
             person = personClass()
-            key = line[len(RECORD_MARKER):].strip()
-            leave_state(state, person, '')
-            state = EXPECT_NAME
-        elif line.startswith(IMAGE_MARKER):
+            key = sys.intern(line[len(marker):].strip())
+            # The text collected so far is kept.
+            state = next_state
+        elif action == IMAGE:
             image = image_pattern.search(line).group(1)
             if image:
                 person.image = f'{image}.jpg'
-        elif line.startswith('oo'):
-            leave_state(state, person, '\n'.join(text))
-            state = EXPECT_DESC
-            text.clear()
-            person.spouses.append(line[2:].strip())
-        elif line.startswith('*') and not person.birth:
-            leave_state(state, person, '\n'.join(text))
-            state = EXPECT_DESC
-            text.clear()
-            person.birth = line[1:].strip()
-        elif line.startswith('+') and not person.death:
-            leave_state(state, person, '\n'.join(text))
-            state = EXPECT_DESC
-            text.clear()
-            person.death = line[1:].strip()
-        elif line.startswith('Vater:'):
-            leave_state(state, person, '\n'.join(text))
-            state = EXPECT_FATHER
-            text.clear()
-        elif line.startswith('Mutter:'):
-            leave_state(state, person, '\n'.join(text))
-            state = EXPECT_MOTHER
-            text.clear()
-        elif line.startswith('Kinder:'):
-            leave_state(state, person, '\n'.join(text))
-            state = EXPECT_CHILDREN
-            text.clear()
-        elif line.startswith('Dokumente:'):
-            leave_state(state, person, '\n'.join(text))
-            state = EXPECT_DOCUMENTS
-            text.clear()
-        elif line and state == EXPECT_NAME:
-            leave_state(state, person, line)
-            state = EXPECT_PROFESSION
-            text.clear()
-        elif line and state == EXPECT_PROFESSION:
-            leave_state(state, person, line)
-            state = EXPECT_DESC
-            text.clear()
-        elif not line and state != EXPECT_NAME:
-            leave_state(state, person, '\n'.join(text))
-            state = EXPECT_DESC
-            text.clear()
         else:
-            text.append(line)
-    add_person(people, person, key)
+            if text:
+                leave_state(state, person, '\n'.join(text))
+                text.clear()
+            state = next_state
+            if action == SPOUSE:
+                person.spouses = append_item(person.spouses, sys.intern(line[len(marker):].strip()))
+            elif action == BIRTH:
+                person.birth = line[len(marker):].strip()
+            elif action == DEATH:
+                person.death = line[len(marker):].strip()
+    if key:
+        yield key, person
+
+
+def split_records(text, parts, marker=DEFAULT_SCHEMA['record']):
+    # Split the text into about parts chunks of equal size, each but the first beginning with a record marker line.
+    # Joining the chunks with '\n' gives the text back.
+    chunks = []
+    start = 0
+    size = len(text) // max(parts, 1) + 1
+    while True:
+        end = text.find(f'\n{marker}', start + size)
+        if end < 0:
+            chunks.append(text[start:])
+            return chunks
+
+        chunks.append(text[start:end])
+        start = end + 1
+
+
+def split_first_record(chunk, marker):
+    # Return the lines of the chunk up to the second record marker line, and the remaining lines.
+    end = chunk.find(f'\n{marker}')
+    if end < 0:
+        return chunk.split('\n'), []
+
+    return chunk[:end].split('\n'), chunk[end + 1:].split('\n')
+
+
+def parse_records(lines, personClass, dispatch, text):
+    # Return the (person_id, person) pairs of the lines and the text buffer left at their end.
+    text = list(text)
+    records = list(_iter_people(lines, personClass, dispatch, text))
+    return records, text
+
+
+def _parse_chunk(chunk, personClass, schema):
+    # Parse a chunk in a worker process, with an empty text buffer at its start.
+    # The first record is parsed apart, so that the parent can parse it again with the buffer
+    # left by the preceding chunk, and check whether the following records depend on it.
+    dispatch = get_dispatch(schema)
+    first_lines, other_lines = split_first_record(chunk, (schema or DEFAULT_SCHEMA)['record'])
+    first_records, first_text = parse_records(first_lines, personClass, dispatch, [])
+    other_records, text = parse_records(other_lines, personClass, dispatch, first_text)
+    return first_records, first_text, other_records, text
+
+
+def parse_text_parallel(text, personClass=Person, schema=None, workers=None, chunks_per_worker=4):
+    # Parse a whole text in a process pool; return the same people dict as parse_lines.
+    # The personClass must be picklable, i.e. defined at module level.
+    # The line buffer is not cleared at a record marker, so a record may take up text from the
+    # preceding one; where this happens, the affected records are parsed again in the parent.
+    # Unpickling the records in the parent is not parallel; it takes about half the serial parse time.
+    if schema is not None:
+        schema = {**DEFAULT_SCHEMA, **schema}
+    dispatch = get_dispatch(schema)
+    marker = (schema or DEFAULT_SCHEMA)['record']
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        # The records would only be passed between the processes.
+        return parse_lines(text.split('\n'), personClass, schema)
+
+    chunks = split_records(text, workers * chunks_per_worker, marker)
+    people = {}
+    carry = []
+    records = 0
+    with metrics.stage('parse_text_parallel', len(text)):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_parse_chunk, chunks, repeat(personClass), repeat(schema))
+            for chunk, (first_records, first_text, other_records, chunk_text) in zip(chunks, results):
+                if carry:
+                    first_lines, other_lines = split_first_record(chunk, marker)
+                    first_records, carried_text = parse_records(first_lines, personClass, dispatch, carry)
+                    if carried_text != first_text:
+                        other_records, chunk_text = parse_records(other_lines, personClass, dispatch, carried_text)
+                for key, person in first_records:
+                    add_person(people, person, key)
+                for key, person in other_records:
+                    add_person(people, person, key)
+                records += len(first_records) + len(other_records)
+                carry = chunk_text
+    metrics.add('records', records)
+    set_link_cache_size(len(people))
     return people
 
 
+def count_record_ids(lines, marker=RECORD_MARKER):
+    # Return {person ID: number of records} for the IDs given to more than one record.
+    counts = {}
+    start = len(marker)
+    for line in lines:
+        if line.startswith(marker):
+            key = line[start:].strip()
+            if key:
+                counts[key] = counts.get(key, 0) + 1
+    return {key: count for key, count in counts.items() if count > 1}
+
+
+def iter_unique_people(records, duplicates):
+    # Yield (person_id, person) pairs with the duplicate ID semantics of parse_lines:
+    # the last record with an ID is passed on, at the position of the first one.
+    # The duplicates are as returned by count_record_ids for the lines of the records.
+    # Records are held back only from the first record with a duplicate ID until its last.
+    remaining = dict(duplicates)
+    entries = {}
+    pending = deque()
+    for key, person in records:
+        count = remaining.get(key)
+        if count is None:
+            if pending:
+                pending.append([key, person, True])
+            else:
+                yield key, person
+            continue
+
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = [key, person, False]
+            pending.append(entry)
+        else:
+            entry[1] = person
+        if count == 1:
+            del remaining[key]
+            entry[2] = True
+        else:
+            remaining[key] = count - 1
+        while pending and pending[0][2]:
+            pending_key, pending_person, __ = pending.popleft()
+            yield pending_key, pending_person
+    for pending_key, pending_person, __ in pending:
+        yield pending_key, pending_person
+
+
+def iter_file_people(file_path, personClass=Person, duplicates=None):
+    # Yield (person_id, person) pairs from a text file, with the duplicate ID semantics of parse_lines.
+    # The file is read twice: first for the IDs given to more than one record, then for the records.
+    # The duplicates may be passed, as returned by count_record_ids, if the file is read repeatedly.
+    if duplicates is None:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            duplicates = count_record_ids(iter_lines(f))
+    with open(file_path, 'r', encoding='utf-8') as f:
+        yield from iter_unique_people(iter_people(iter_lines(f), personClass), duplicates)
+
+
+def iter_chunk_lines(chunks):
+    # Yield the lines of a text given in chunks the way str.split('\n') would return them.
+    rest = ''
+    for chunk in chunks:
+        lines = (rest + chunk).split('\n')
+        rest = lines.pop()
+        yield from lines
+    yield rest
+
+
+def iter_lines(f):
+    # Yield the lines of an open text file the way str.split('\n') would return them.
+    line = ''
+    for line in f:
+        if line.endswith('\n'):
+            yield line[:-1]
+        else:
+            yield line
+    if not line or line.endswith('\n'):
+        yield ''
+
+
 # Output variants.
 SCREEN = 0
 TEXT_FILE = 1
 OBSIDIAN_NOTES = 2
 
 
-def main(file_path, output=SCREEN):
-    root, extension = os.path.splitext(file_path)
-    with open(file_path, 'r', encoding='utf-8') as w:
-        lines = w.read().split('\n')
-    people = parse_lines(lines)
+def write_people(people, root, output=SCREEN, incremental=False, workers=0):
+    # Write a people dict or a record stream to the output variant; root is the input path without extension.
     if output == SCREEN:
-        print_people(people)
+        with metrics.stage('print_people'):
+            print_people(people)
     elif output == TEXT_FILE:
         result_file = f'{root}_parsed.txt'
-        write_single_text_file(result_file, people)
+        with metrics.stage('write_single_text_file') as stage:
+            write_single_text_file(result_file, people)
+            stage.bytes_out = os.path.getsize(result_file)
     elif output == OBSIDIAN_NOTES:
         folder_path = f'{root}_vault'
-        write_obsidian_notes(folder_path, people)
+        with metrics.stage('write_obsidian_notes'):
+            writer = write_obsidian_notes(folder_path, people, incremental, workers)
+        metrics.add('notes', writer.written)
+        print_note_summary(writer)
+
+
+def load_people(file_path, personClass=Person, parse_workers=0):
+    # Return the people dict of a text file from its snapshot, if the snapshot matches the text and the parser.
+    # Otherwise, the text is parsed, and the snapshot is rebuilt.
+    # The records of a class with a __dict__ are always parsed, since they cannot be stored.
+    if not is_slotted(personClass):
+        return parse_file(file_path, personClass, parse_workers)
+
+    root, extension = os.path.splitext(file_path)
+    with metrics.stage('hash_text', os.path.getsize(file_path)):
+        source_hash = hash_file(file_path)
+    snapshot = Snapshot(f'{root}{SNAPSHOT_SUFFIX}', (source_hash, PARSER_VERSION))
+    if snapshot.is_valid(personClass):
+        with metrics.stage('load_snapshot'):
+            people = snapshot.load(personClass)
+        if people is not None:
+            metrics.add('records', len(people))
+            set_link_cache_size(len(people))
+            return people
+
+    people = parse_file(file_path, personClass, parse_workers)
+    with metrics.stage('save_snapshot'):
+        snapshot.save(people, personClass)
+    return people
+
+
+def parse_file(file_path, personClass=Person, parse_workers=0):
+    with open(file_path, 'r', encoding='utf-8') as w:
+        if parse_workers:
+            return parse_text_parallel(w.read(), personClass, workers=parse_workers)
+
+        return parse_lines(iter_lines(w), personClass)
+
+
+def main(file_path, output=SCREEN, incremental=False, workers=0, parse_workers=0, use_snapshot=False):
+    root, extension = os.path.splitext(file_path)
+    if use_snapshot:
+        people = load_people(file_path, parse_workers=parse_workers)
+        write_people(people, root, output, incremental, workers)
+        return
+
+    if parse_workers:
+        with open(file_path, 'r', encoding='utf-8') as w:
+            people = parse_text_parallel(w.read(), workers=parse_workers)
+        write_people(people, root, output, incremental, workers)
+        return
+
+    # The records are parsed while they are written; the parsing time is measured apart.
+    people = metrics.iter_stage('parse_lines', iter_file_people(file_path), 'records', os.path.getsize(file_path))
+    write_people(people, root, output, incremental, workers)
 
 
 if __name__ == "__main__":
-    main(sys.argv[1], OBSIDIAN_NOTES)
+    parser = argparse.ArgumentParser(description='Parse a text file converted from a genlog HLP file.')
+    parser.add_argument('path', help='text file')
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='write only changed notes and remove notes of vanished records'
+    )
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        default=8,
+        help='number of threads writing the notes (default: 8; 0 writes in the main thread)'
+    )
+    parser.add_argument(
+        '-p', '--parse-workers',
+        type=int,
+        default=0,
+        help='number of processes parsing the records (default: 0 parses while writing, in the main process)'
+    )
+    parser.add_argument(
+        '--snapshot',
+        action='store_true',
+        help='keep the parsed records in a snapshot file, and skip parsing while the text is unchanged'
+    )
+    parser.add_argument(
+        '--metrics',
+        default=None,
+        help='JSON file for the stage metrics'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='profile the run and print the hotspots'
+    )
+    args = parser.parse_args()
+    if args.metrics:
+        metrics.enable()
+    arguments = (args.path, OBSIDIAN_NOTES, args.incremental, args.workers, args.parse_workers, args.snapshot)
+    if args.profile:
+        metrics.profile(main, *arguments)
+    else:
+        main(*arguments)
+    if args.metrics:
+        metrics.get_active().write(args.metrics)
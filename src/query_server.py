@@ -0,0 +1,311 @@
+#!/usr/bin/env python
+"""Serves the parsed family records as JSON over local HTTP.
+
+Usage: query_server.py [--host host] [--port port] [--snapshot] path-to-txt-file
+
+Lets the converted data be browsed the way the Genlog hypertext allowed.
+The records are loaded once; links are given in the form of the notes.
+
+GET /                                 number of records
+GET /person/<ID>                      record, with the note text
+GET /neighbours/<ID>                  parents, children, spouses, and documents
+GET /pedigree/<ID>?depth=<N>          ancestors, by generation
+GET /descendants/<ID>?depth=<N>       descendants, by generation
+
+The ID may also be given as the note title.
+The rendered views are kept in an LRU cache. When the text file
+changes, the records are loaded again, and the cache is cleared.
+Meanwhile, and if loading fails, the previous records are served.
+With --snapshot, the records are loaded via a snapshot file.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License
+(https://opensource.org/licenses/mit-license.php)
+"""
+import argparse
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import json
+import logging
+import os
+import threading
+import time
+from urllib.parse import parse_qs
+from urllib.parse import unquote
+from urllib.parse import urlsplit
+
+from family_tree import CACHE_SIZE
+from family_tree import FamilyTree
+from family_tree import LruCache
+from parse_family_data import extract_link
+from parse_family_data import iter_lines
+from parse_family_data import load_people
+from parse_family_data import parse_lines
+from parse_family_data import sanitize_title
+
+DEFAULT_DEPTH = 3
+MAX_DEPTH = 30
+
+# Minimum number of seconds between two checks of the text file.
+CHECK_INTERVAL = 1.0
+
+logger = logging.getLogger('query_server')
+
+# Views.
+PERSON = 'person'
+NEIGHBOURS = 'neighbours'
+PEDIGREE = 'pedigree'
+DESCENDANTS = 'descendants'
+
+
+class QueryError(Exception):
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def get_link(person_id):
+    # Return the link to the note of a record, as written by get_record.
+    return f'[[{sanitize_title(person_id)}]]'
+
+
+def get_generations(generations):
+    # Return a list of link lists, one per generation, from a {person ID: generation} dict.
+    levels = []
+    for person_id, generation in generations.items():
+        while len(levels) < generation:
+            levels.append([])
+        levels[generation - 1].append(get_link(person_id))
+    return levels
+
+
+class FamilyData:
+    # The records of a text file, and the views rendered from them.
+    # The methods may be called from several threads.
+    # The records are loaded outside the lock, and swapped in under it,
+    # so that the views are served while a changed file is loaded.
+
+    def __init__(self, file_path, use_snapshot=False, cache_size=CACHE_SIZE):
+        self.file_path = file_path
+        self.use_snapshot = use_snapshot
+        self._cache = LruCache(cache_size)
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._status = None
+        self._checked = 0.0
+        self.people = {}
+        self.tree = None
+        self.reload()
+
+    def reload(self):
+        # Load the records; if this fails, the records loaded before are kept.
+        status = os.stat(self.file_path)
+        if self.use_snapshot:
+            people = load_people(self.file_path)
+        else:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                people = parse_lines(iter_lines(f))
+        tree = FamilyTree(people)
+        with self._lock:
+            self.people = people
+            self.tree = tree
+            self._cache.clear()
+            self._status = (status.st_mtime_ns, status.st_size)
+
+    def check(self):
+        # Load the records again, if the text file has changed; check at most every CHECK_INTERVAL seconds.
+        # A failed reload is logged, and tried again with the next check;
+        # the interval applies to failed checks as well, so that a missing
+        # or half-written file is not parsed again for each request.
+        if time.monotonic() - self._checked < CHECK_INTERVAL:
+            return
+
+        # Only one thread reloads; the others serve the records loaded before.
+        if not self._reload_lock.acquire(blocking=False):
+            return
+
+        try:
+            status = os.stat(self.file_path)
+            if (status.st_mtime_ns, status.st_size) != self._status:
+                self.reload()
+        except OSError:
+            # The file is being replaced; the records loaded are served meanwhile.
+            pass
+        except Exception as ex:
+            logger.error(f'Fehler beim Laden von {self.file_path}: {type(ex).__name__}: {ex}')
+        finally:
+            self._checked = time.monotonic()
+            self._reload_lock.release()
+
+    def get_view(self, view, person_id=None, depth=None):
+        # Return the view as JSON bytes.
+        self.check()
+        with self._lock:
+            key = (view, person_id, depth)
+            data = self._cache.get(key)
+            if data is None:
+                data = json.dumps(self._render(view, person_id, depth), ensure_ascii=False).encode('utf-8')
+                self._cache.set(key, data)
+            return data
+
+    def _get_id(self, person_id):
+        if person_id in self.people:
+            return person_id
+
+        # A note title.
+        person_id = self.tree.index.ids.get(person_id)
+        if person_id is None:
+            raise QueryError(404, 'Person nicht gefunden')
+
+        return person_id
+
+    def _render(self, view, person_id, depth):
+        if view is None:
+            return {'records': len(self.people)}
+
+        person_id = self._get_id(person_id)
+        if view == PERSON:
+            return self._render_person(person_id)
+
+        if view == NEIGHBOURS:
+            return self._render_neighbours(person_id)
+
+        if view == PEDIGREE:
+            generations = self.tree.ancestors(person_id, depth)
+        else:
+            generations = self.tree.descendants(person_id, depth)
+        return {'id': person_id, 'link': get_link(person_id), 'depth': depth, 'generations': get_generations(generations)}
+
+    def _render_person(self, person_id):
+        person = self.people[person_id]
+        return {
+            'id': person_id,
+            'link': get_link(person_id),
+            'name': person.name,
+            'profession': person.profession,
+            'birth': person.birth,
+            'death': person.death,
+            'father': extract_link(person.father) if person.father else None,
+            'mother': extract_link(person.mother) if person.mother else None,
+            'spouses': [extract_link(spouse) for spouse in person.spouses],
+            'children': [extract_link(child) for child in person.children],
+            'documents': [extract_link(document) for document in person.documents],
+            'image': person.image,
+            'text': '\n'.join(person.get_record(person_id)),
+        }
+
+    def _render_neighbours(self, person_id):
+        person = self.people[person_id]
+        return {
+            'id': person_id,
+            'link': get_link(person_id),
+            'parents': [get_link(parent) for parent in self.tree.parents.get(person_id, ())],
+            'children': [get_link(child) for child in self.tree.children.get(person_id, ())],
+            'spouses': [get_link(spouse) for spouse in self.tree.spouses.get(person_id, ())],
+            'documents': [extract_link(document) for document in person.documents],
+        }
+
+
+def parse_request(path):
+    # Return the view, person ID, and depth requested by a URL path.
+    url = urlsplit(path)
+    parts = [unquote(part) for part in url.path.split('/') if part]
+    if not parts:
+        return None, None, None
+
+    if len(parts) != 2 or parts[0] not in (PERSON, NEIGHBOURS, PEDIGREE, DESCENDANTS):
+        raise QueryError(404, 'Unbekannte Abfrage')
+
+    view, person_id = parts
+    if view not in (PEDIGREE, DESCENDANTS):
+        return view, person_id, None
+
+    depth = parse_qs(url.query).get('depth', [DEFAULT_DEPTH])[0]
+    try:
+        depth = int(depth)
+    except ValueError:
+        raise QueryError(400, 'Ungültige Tiefe')
+
+    if not 1 <= depth <= MAX_DEPTH:
+        raise QueryError(400, f'Die Tiefe muss zwischen 1 und {MAX_DEPTH} liegen')
+
+    return view, person_id, depth
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    # Keep-alive connections, so that clients need not connect for each request.
+    # Without Nagle's algorithm, the body is not held back until the header is acknowledged.
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        try:
+            data = self.server.family_data.get_view(*parse_request(self.path))
+            status = 200
+        except QueryError as ex:
+            status = ex.status
+            data = json.dumps({'error': str(ex)}, ensure_ascii=False).encode('utf-8')
+        except Exception:
+            logger.exception(f'Fehler bei {self.path}')
+            status = 500
+            data = json.dumps({'error': 'Interner Fehler'}, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(family_data, host='127.0.0.1', port=8000, verbose=False):
+    server = ThreadingHTTPServer((host, port), QueryHandler)
+    server.daemon_threads = True
+    server.family_data = family_data
+    server.verbose = verbose
+    return server
+
+
+def main(file_path, host='127.0.0.1', port=8000, use_snapshot=False, verbose=False):
+    logging.basicConfig(format='%(asctime)s %(message)s')
+    family_data = FamilyData(file_path, use_snapshot)
+    server = make_server(family_data, host, port, verbose)
+    print(f'{len(family_data.people)} Datensätze unter http://{host}:{server.server_port}/')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Serve the parsed family records as JSON over local HTTP.')
+    parser.add_argument('path', help='text file')
+    parser.add_argument(
+        '--host',
+        default='127.0.0.1',
+        help='address to listen on (default: 127.0.0.1)'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8000,
+        help='port to listen on (default: 8000)'
+    )
+    parser.add_argument(
+        '--snapshot',
+        action='store_true',
+        help='load the records via a snapshot file'
+    )
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='log the requests'
+    )
+    args = parser.parse_args()
+    main(args.path, args.host, args.port, args.snapshot, args.verbose)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+"""Converts RTF into an Obsidian vault in a single pass.
+
+Usage: rtf_to_vault.py [--output screen|text|notes] [--keep-text] [--incremental] [-j workers] [--mmap] path-to-rtf-file
+
+Chains sanitize_links, rtf_to_text, the record parser, 
+and the writer in memory, without an intermediate text file. 
+The RTF conversion runs in a process of its own, and the parser 
+in a thread of its own; they pass their results through bounded 
+queues, so that the stages overlap. The records are written when 
+all are parsed, since a later record replaces one with the same ID.
+
+The output is the same as with strip_rtf.py and parse_family_data.py, 
+named after the RTF file. With --keep-text, the intermediate text 
+file is written as well, for debugging.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License 
+(https://opensource.org/licenses/mit-license.php)
+"""
+import argparse
+from contextlib import contextmanager
+import mmap
+import multiprocessing
+import os
+import queue
+import threading
+
+from parse_family_data import OBSIDIAN_NOTES
+from parse_family_data import SCREEN
+from parse_family_data import TEXT_FILE
+from parse_family_data import add_person
+from parse_family_data import iter_chunk_lines
+from parse_family_data import iter_people
+from parse_family_data import write_people
+from strip_rtf import get_text_file_path
+from strip_rtf import sanitize_links
+from striprtf.striprtf import rtf_to_text_chunks
+
+# Number of batches a queue holds before the producer waits.
+QUEUE_SIZE = 8
+
+# Number of items passed through the queue at once.
+BATCH_SIZE = 64
+
+# Seconds a blocked producer or consumer waits before checking whether the other side has gone.
+POLL_INTERVAL = 0.1
+
+OUTPUTS = {'screen': SCREEN, 'text': TEXT_FILE, 'notes': OBSIDIAN_NOTES}
+
+
+class _End:
+    # Marks the end of a queue, carrying the exception that stopped the producer, if any.
+
+    def __init__(self, error=None):
+        self.error = error
+
+
+def iter_threaded(iterable, queue_size=QUEUE_SIZE, batch_size=BATCH_SIZE):
+    # Yield the items of the iterable, produced in a thread of its own.
+    # Exceptions of the producer are raised in the consumer.
+    # If the consumer stops early, the producer is stopped as well.
+    batches = queue.Queue(queue_size)
+    stopped = threading.Event()
+
+    def put(batch):
+        # Return False if the consumer has gone.
+        while not stopped.is_set():
+            try:
+                batches.put(batch, timeout=POLL_INTERVAL)
+                return True
+
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        # The items produced before an exception are passed on first.
+        batch = []
+        end = _End()
+        try:
+            for item in iterable:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    if not put(batch):
+                        return
+
+                    batch = []
+        except BaseException as ex:
+            end = _End(ex)
+        if batch and not put(batch):
+            return
+
+        put(end)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            batch = batches.get()
+            if isinstance(batch, _End):
+                if batch.error is not None:
+                    raise batch.error
+
+                return
+
+            yield from batch
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def iter_text_chunks(rtf_text, txt_file=None):
+    # Yield the converted text in chunks; with txt_file, write it there as well.
+    chunks = rtf_to_text_chunks(sanitize_links(rtf_text))
+    if txt_file is None:
+        yield from chunks
+        return
+
+    with open(txt_file, 'w', encoding='utf-8') as f:
+        for chunk in chunks:
+            f.write(chunk)
+            yield chunk
+
+
+def iter_rtf_records(rtf_file, txt_file=None, use_mmap=False):
+    # Yield (person_id, person) pairs from an RTF file,
+    # with the conversion in a process, and the parser in a thread.
+    chunks = iter_converted_chunks(rtf_file, txt_file, use_mmap)
+    return iter_threaded(iter_people(iter_chunk_lines(chunks)))
+
+
+def iter_converted_chunks(rtf_file, txt_file=None, use_mmap=False, queue_size=QUEUE_SIZE):
+    # Yield the text chunks converted from the RTF file by a separate process.
+    # Unlike a thread, the process converts in parallel with the parser and the writer.
+    # If the consumer stops early, the process is terminated.
+    # If the process dies without marking the end, ChildProcessError is raised.
+    chunks = multiprocessing.Queue(queue_size)
+    process = multiprocessing.Process(
+        target=_convert_to_queue,
+        args=(rtf_file, txt_file, use_mmap, chunks),
+        daemon=True,
+    )
+    process.start()
+    try:
+        while True:
+            try:
+                chunk = chunks.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                if process.is_alive():
+                    continue
+
+                # The chunks put before the exit may still be in transit.
+                try:
+                    chunk = chunks.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    raise ChildProcessError(f'Die RTF-Konvertierung wurde abgebrochen (Exit-Code {process.exitcode})')
+
+            if isinstance(chunk, _End):
+                if chunk.error is not None:
+                    raise chunk.error
+
+                return
+
+            yield chunk
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+
+
+def _convert_to_queue(rtf_file, txt_file, use_mmap, chunks):
+    # Process function.
+    try:
+        with open_rtf(rtf_file, use_mmap) as in_rtf:
+            for chunk in iter_text_chunks(in_rtf, txt_file):
+                chunks.put(chunk)
+    except Exception as ex:
+        chunks.put(_End(ex))
+        return
+
+    chunks.put(_End())
+
+
+@contextmanager
+def open_rtf(rtf_file, use_mmap=False):
+    # Provide the content of the RTF file as str, or as mmap.
+    if not use_mmap:
+        with open(rtf_file, 'r', encoding='utf-8') as f:
+            yield f.read()
+    elif os.path.getsize(rtf_file) == 0:
+        # Empty files cannot be mapped.
+        yield b''
+    else:
+        with open(rtf_file, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as in_rtf:
+                yield in_rtf
+
+
+def main(rtf_file, output=OBSIDIAN_NOTES, keep_text=False, incremental=False, workers=0, use_mmap=False):
+    root, extension = os.path.splitext(rtf_file)
+    txt_file = None
+    if keep_text:
+        txt_file = get_text_file_path(rtf_file)
+    # The records are collected first, so that duplicate IDs are resolved as by parse_lines.
+    people = {}
+    for key, person in iter_rtf_records(rtf_file, txt_file, use_mmap):
+        add_person(people, person, key)
+    write_people(people, root, output, incremental, workers)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Convert RTF into an Obsidian vault in a single pass.')
+    parser.add_argument('path', help='RTF file')
+    parser.add_argument(
+        '--output',
+        choices=list(OUTPUTS),
+        default='notes',
+        help='screen, a single text file, or Obsidian notes (default: notes)'
+    )
+    parser.add_argument(
+        '--keep-text',
+        action='store_true',
+        help='write the intermediate text file as well'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='write only changed notes and remove notes of vanished records'
+    )
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        default=8,
+        help='number of threads writing the notes (default: 8; 0 writes in the main thread)'
+    )
+    parser.add_argument(
+        '--mmap',
+        action='store_true',
+        help='memory-map the RTF file and process it as bytes'
+    )
+    args = parser.parse_args()
+    main(args.path, OUTPUTS[args.output], args.keep_text, args.incremental, args.workers, args.mmap)
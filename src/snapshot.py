@@ -0,0 +1,117 @@
+"""Provides an on-disk snapshot of parsed records.
+
+A snapshot holds a dict of objects whose classes all define 
+__slots__, e.g. the people of a parsed text file, together with 
+a key identifying what they were built from, such as the hash 
+of the source and the parser version. The header is checked 
+before the records are read, so an outdated snapshot costs 
+almost nothing.
+
+The records are stored as tuples of their slot values, which
+are loaded much faster than pickled objects.
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License
+(https://opensource.org/licenses/mit-license.php)
+"""
+import gc
+import os
+import pickle
+
+SNAPSHOT_VERSION = 1
+
+# Errors indicating a missing or damaged snapshot.
+SNAPSHOT_ERRORS = (OSError, EOFError, ValueError, pickle.UnpicklingError)
+
+
+def is_slotted(objectClass):
+    # Return True if the instances have no __dict__, i.e. all their attributes are slots.
+    for cls in objectClass.__mro__:
+        if cls is not object and ('__slots__' not in cls.__dict__ or '__dict__' in get_own_slots(cls)):
+            return False
+
+    return True
+
+
+def get_own_slots(cls):
+    slots = cls.__dict__.get('__slots__', ())
+    if isinstance(slots, str):
+        return (slots,)
+
+    return tuple(slots)
+
+
+def get_slots(objectClass):
+    # Return the names of the slots of the class and its base classes, the base classes first.
+    if not is_slotted(objectClass):
+        raise TypeError(f'Class without __slots__: {objectClass.__qualname__}')
+
+    slots = []
+    for cls in reversed(objectClass.__mro__):
+        slots.extend(name for name in get_own_slots(cls) if name != '__weakref__')
+    return tuple(slots)
+
+
+def get_layout(objectClass):
+    return f'{objectClass.__module__}.{objectClass.__qualname__}', get_slots(objectClass)
+
+
+class Snapshot:
+
+    def __init__(self, file_path, key):
+        self.file_path = file_path
+        self.key = key
+
+    def _get_header(self, objectClass):
+        return {'version': SNAPSHOT_VERSION, 'key': self.key, 'layout': get_layout(objectClass)}
+
+    def is_valid(self, objectClass):
+        # Return True if the snapshot exists and was saved with the same key and class.
+        try:
+            with open(self.file_path, 'rb') as f:
+                return pickle.load(f) == self._get_header(objectClass)
+
+        except SNAPSHOT_ERRORS:
+            return False
+
+    def load(self, objectClass):
+        # Return the dict of objects, or None if the snapshot is outdated or damaged.
+        # The garbage collector is paused, since the many new containers
+        # would trigger it again and again, without anything to collect.
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._load(objectClass)
+
+        except SNAPSHOT_ERRORS:
+            return None
+
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _load(self, objectClass):
+        with open(self.file_path, 'rb') as f:
+            if pickle.load(f) != self._get_header(objectClass):
+                return None
+
+            keys, rows = pickle.load(f)
+        slots = get_slots(objectClass)
+        objects = {}
+        for key, row in zip(keys, rows):
+            item = objectClass.__new__(objectClass)
+            for name, value in zip(slots, row):
+                setattr(item, name, value)
+            objects[key] = item
+        return objects
+
+    def save(self, objects, objectClass):
+        # Write a temporary file first, so that an aborted run leaves the old snapshot intact.
+        slots = get_slots(objectClass)
+        rows = [tuple([getattr(item, name) for name in slots]) for item in objects.values()]
+        temp_path = f'{self.file_path}.tmp'
+        with open(temp_path, 'wb') as f:
+            pickle.dump(self._get_header(objectClass), f, pickle.HIGHEST_PROTOCOL)
+            pickle.dump((list(objects), rows), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.file_path)
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+"""Exports parsed genlog records into an SQLite database.
+
+Usage: sqlite_export.py [--fts] path-to-txt-file
+
+Creates or updates an SQLite database 
+with the same file name, but .db extension.
+
+The records are upserted by their ID, so a re-import only 
+rewrites the records that have changed; records missing in 
+the text file are kept. With --fts, a full-text index over 
+the descriptions is maintained in the person_fts table; once 
+created, it is kept up to date by later imports without --fts.
+
+Example query: everyone born before 1800 without a father link:
+
+    SELECT id FROM person WHERE birth_year < 1800 AND id NOT IN
+    (SELECT person_id FROM link WHERE kind = 'father');
+
+Copyright (c) 2025 Peter Triesberger
+For further information see https://github.com/peter88213/cnv_genlog
+Published under the MIT License 
+(https://opensource.org/licenses/mit-license.php)
+"""
+import argparse
+import os
+import sqlite3
+
+from manifest import hash_text
+from parse_family_data import get_link_title
+from parse_family_data import get_year
+from parse_family_data import iter_lines
+from parse_family_data import iter_people
+from parse_family_data import iter_records
+from parse_family_data import sanitize_title
+
+DB_EXTENSION = '.db'
+BATCH_SIZE = 1000
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS person (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    name TEXT,
+    profession TEXT,
+    birth TEXT,
+    birth_year INTEGER,
+    death TEXT,
+    death_year INTEGER,
+    image TEXT,
+    description TEXT,
+    record_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS link (
+    person_id TEXT NOT NULL REFERENCES person(id),
+    kind TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    target TEXT,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS document (
+    person_id TEXT NOT NULL REFERENCES person(id),
+    position INTEGER NOT NULL,
+    target TEXT,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS person_title ON person(title);
+CREATE INDEX IF NOT EXISTS person_birth_year ON person(birth_year);
+CREATE INDEX IF NOT EXISTS link_person_id ON link(person_id, kind);
+CREATE INDEX IF NOT EXISTS link_target ON link(target, kind);
+CREATE INDEX IF NOT EXISTS document_person_id ON document(person_id);
+CREATE INDEX IF NOT EXISTS document_target ON document(target);
+'''
+FTS_SCHEMA = '''
+CREATE VIRTUAL TABLE IF NOT EXISTS person_fts USING fts5(id UNINDEXED, description);
+'''
+
+UPSERT_PERSON = '''
+INSERT INTO person VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    title = excluded.title,
+    name = excluded.name,
+    profession = excluded.profession,
+    birth = excluded.birth,
+    birth_year = excluded.birth_year,
+    death = excluded.death,
+    death_year = excluded.death_year,
+    image = excluded.image,
+    description = excluded.description,
+    record_hash = excluded.record_hash
+'''
+INSERT_LINK = 'INSERT INTO link VALUES (?, ?, ?, ?, ?)'
+INSERT_DOCUMENT = 'INSERT INTO document VALUES (?, ?, ?, ?)'
+INSERT_FTS = 'INSERT INTO person_fts VALUES (?, ?)'
+DELETE_LINKS = 'DELETE FROM link WHERE person_id = ?'
+DELETE_DOCUMENTS = 'DELETE FROM document WHERE person_id = ?'
+DELETE_FTS = 'DELETE FROM person_fts WHERE id = ?'
+
+# Link kinds.
+FATHER = 'father'
+MOTHER = 'mother'
+SPOUSE = 'spouse'
+CHILD = 'child'
+
+
+class SqliteExporter:
+
+    def __init__(self, connection, fts=False):
+        self.connection = connection
+        connection.executescript(SCHEMA)
+        if self._has_table('person_fts'):
+            # An existing index is always maintained; otherwise the records
+            # changed without --fts would be missing from it for good.
+            fts = True
+        elif fts:
+            # Index the records imported without --fts, too.
+            connection.executescript(FTS_SCHEMA)
+            connection.execute('INSERT INTO person_fts SELECT id, description FROM person')
+        self.fts = fts
+        self._hashes = dict(connection.execute('SELECT id, record_hash FROM person'))
+        self._batches = {}
+
+        # IDs of the records in the pending batches.
+        self._pending = set()
+        self._size = 0
+        self.imported = 0
+        self.unchanged = 0
+
+    def add(self, person_id, person):
+        record_hash = hash_text('\n'.join(person.get_record(person_id)))
+        if self._hashes.get(person_id) == record_hash:
+            self.unchanged += 1
+            return
+
+        # Duplicate IDs in the input: the last record wins, as in parse_lines.
+        # Its deletions must not be batched together with the earlier insertions.
+        if person_id in self._pending:
+            self.flush()
+        self._pending.add(person_id)
+        self._hashes[person_id] = record_hash
+        self.imported += 1
+        description = '\n'.join(person.desc)
+        self._add_row(UPSERT_PERSON, (
+            person_id,
+            sanitize_title(person_id),
+            person.name,
+            person.profession,
+            person.birth,
+            get_year(person.birth),
+            person.death,
+            get_year(person.death),
+            person.image,
+            description,
+            record_hash,
+        ))
+
+        # The items of a changed record are replaced as a whole.
+        self._add_row(DELETE_LINKS, (person_id,))
+        self._add_row(DELETE_DOCUMENTS, (person_id,))
+        for kind, texts in (
+            (FATHER, (person.father,)),
+            (MOTHER, (person.mother,)),
+            (SPOUSE, person.spouses),
+            (CHILD, person.children),
+        ):
+            for position, text in enumerate(texts):
+                if text:
+                    self._add_row(INSERT_LINK, (person_id, kind, position, get_link_title(text), text))
+        for position, text in enumerate(person.documents):
+            if text:
+                self._add_row(INSERT_DOCUMENT, (person_id, position, get_link_title(text), text))
+        if self.fts:
+            self._add_row(DELETE_FTS, (person_id,))
+            self._add_row(INSERT_FTS, (person_id, description))
+        if self._size >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        # Execute the pending rows in statement order, so that the deletions precede the insertions.
+        for statement, rows in self._batches.items():
+            self.connection.executemany(statement, rows)
+        self._batches.clear()
+        self._pending.clear()
+        self._size = 0
+
+    def _has_table(self, name):
+        query = "SELECT 1 FROM sqlite_master WHERE name = ?"
+        return self.connection.execute(query, (name,)).fetchone() is not None
+
+    def _add_row(self, statement, row):
+        self._batches.setdefault(statement, []).append(row)
+        self._size += 1
+
+
+def export_people(connection, people, fts=False):
+    # Upsert the records of a people dict or a record stream in a single transaction.
+    # Return the SqliteExporter with the statistics.
+    with connection:
+        exporter = SqliteExporter(connection, fts)
+        for person_id, person in iter_records(people):
+            exporter.add(person_id, person)
+        exporter.flush()
+    return exporter
+
+
+def main(file_path, fts=False):
+    root, extension = os.path.splitext(file_path)
+    connection = sqlite3.connect(f'{root}{DB_EXTENSION}')
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            exporter = export_people(connection, iter_people(iter_lines(f)), fts)
+    finally:
+        connection.close()
+    print(f'{exporter.imported} Datensätze importiert, {exporter.unchanged} unverändert')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Export genlog records into an SQLite database.')
+    parser.add_argument('path', help='text file')
+    parser.add_argument(
+        '--fts',
+        action='store_true',
+        help='maintain a full-text index over the descriptions'
+    )
+    args = parser.parse_args()
+    main(args.path, args.fts)
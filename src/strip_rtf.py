@@ -1,47 +1,345 @@
 #!/usr/bin/env python
 """Converts RTF into plain text.
 
-Usage: strip_rtf.py path-to-rtf-file
+Usage: strip_rtf.py [-j workers] [--mmap] [--manifest file] [--metrics file] [--profile] path-to-rtf-file|directory|glob
 
 Creates a utf-8 encoded text file 
 with the same file name, but .txt extension.
 
+If a directory or a glob pattern is given, all matching
+RTF files are converted in a process pool, and a 
+per-file summary is printed.
+
+With --mmap, the RTF files are memory-mapped and processed 
+as bytes; only \\'xx escapes are decoded, via the font codec.
+
+With --manifest, the content hashes of the RTF and text files 
+are kept in the given manifest file, and RTF files whose text
+file is up to date are skipped.
+
+With --metrics, the time, sizes, and token counts of the stages
+are written to the given file as a JSON report. 
+With --profile, the run is profiled, and the hotspots are printed.
+
 Copyright (c) 2025 Peter Triesberger
 For further information see https://github.com/peter88213/cnv_genlog
 Published under the MIT License 
 (https://opensource.org/licenses/mit-license.php)
 """
 
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import glob
+from itertools import repeat
+import mmap
 import os
-import re
 import sys
 
-from striprtf.striprtf import rtf_to_text
+from manifest import Manifest
+from manifest import hash_file
+import metrics
+from striprtf.striprtf import ConversionStats
+from striprtf.striprtf import rtf_to_text_chunks
+
+RTF_EXTENSION = '.rtf'
+
+# Batch result for files skipped because of an up-to-date manifest entry.
+UNCHANGED = 'unchanged'
+
+LINK_TOKENS = dict(
+    newline='\n',
+    uldb='\\uldb ',
+    jump='\\plain\\fs20 {\\v ',
+    topic_end='>main}',
+    document_start='>main@',
+    document_end='.HLP}',
+    topic_open='\\uldb [[',
+    topic_close='\\plain\\fs20 ]]',
+    document_open='\\uldb [[documents/',
+    document_close='.md]]',
+)
+LINK_TOKENS_BYTES = {key: value.encode('ascii') for key, value in LINK_TOKENS.items()}
 
 
 def sanitize_links(rtf_text):
-    rtf_text = re.sub(
-        r'\\uldb (.*?)\\plain\\fs20 \{\\v .*?>main\}',
-        r'\\uldb [[\1\\plain\\fs20 ]]',
-        rtf_text
-    )
-    rtf_text = re.sub(
-        r'\\uldb .*?\\plain\\fs20 \{\\v .*?>main\@(.*?)\.HLP\}',
-        r'\\uldb [[documents/\1.md]]',
-        rtf_text
-    )
-    return rtf_text
+    # Rewrite help jumps into wiki links.
+    # The text may be a str, or a bytes-like object such as mmap.
+    # Links never span lines, so only the lines containing "\uldb " are rewritten.
+    tokens = LINK_TOKENS if isinstance(rtf_text, str) else LINK_TOKENS_BYTES
+    newline = tokens['newline']
+    start = rtf_text.find(tokens['uldb'])
+    if start < 0:
+        return rtf_text
+
+    pieces = []
+    pos = 0
+    n = len(rtf_text)
+    while start >= 0:
+        line_start = rtf_text.rfind(newline, pos, start) + 1
+        if line_start == 0:
+            line_start = pos
+        line_end = rtf_text.find(newline, start)
+        if line_end < 0:
+            line_end = n
+        pieces.append(rtf_text[pos:line_start])
+        line = rtf_text[line_start:line_end]
+        line = _rewrite_links(line, tokens, 'topic_end', 'topic_open', 'topic_close')
+        line = _rewrite_links(line, tokens, 'document_start', 'document_open', 'document_close')
+        pieces.append(line)
+        pos = line_end
+        start = rtf_text.find(tokens['uldb'], pos)
+    pieces.append(rtf_text[pos:])
+    return rtf_text[:0].join(pieces)
+
+
+def _rewrite_links(line, tokens, target, link_open, link_close):
+    # Rewrite the links of a single line.
+    # A link runs from "\uldb " to the first jump after it, and on to the first target after the jump.
+    # A topic link keeps the text between "\uldb " and the jump as its title; a document link
+    # takes the file name between ">main@" and the first ".HLP}". The next link is searched after it.
+    # Without a jump or a target, there can be no further link in this line.
+    uldb = tokens['uldb']
+    jump = tokens['jump']
+    target_start = tokens[target]
+    document = target == 'document_start'
+    pieces = []
+    pos = 0
+    start = line.find(uldb)
+    while start >= 0:
+        jump_start = line.find(jump, start + len(uldb))
+        if jump_start < 0:
+            break
 
+        target_pos = line.find(target_start, jump_start + len(jump))
+        if target_pos < 0:
+            break
 
-def main(rtf_file):
-    with open(rtf_file, 'r', encoding='utf-8') as w:
-        in_rtf = w.read()
-    content = rtf_to_text(sanitize_links(in_rtf))
+        if document:
+            title_start = target_pos + len(target_start)
+            end = line.find(tokens['document_end'], title_start)
+            if end < 0:
+                break
+
+            title = line[title_start:end]
+            end += len(tokens['document_end'])
+        else:
+            title = line[start + len(uldb):jump_start]
+            end = target_pos + len(target_start)
+        pieces.append(line[pos:start])
+        pieces.append(tokens[link_open])
+        pieces.append(title)
+        pieces.append(tokens[link_close])
+        pos = end
+        start = line.find(uldb, pos)
+    if not pieces:
+        return line
+
+    pieces.append(line[pos:])
+    return line[:0].join(pieces)
+
+
+def write_text(txt_file, in_rtf):
+    with metrics.stage('sanitize_links', len(in_rtf)) as stage:
+        rtf_text = sanitize_links(in_rtf)
+        stage.bytes_out = len(rtf_text)
+    # With metrics, the tokens are counted, and the decoding is timed, while converting.
+    active = metrics.get_active()
+    stats = None
+    if active is not None:
+        stats = ConversionStats()
+    with open(txt_file, 'w', encoding='utf-8') as w:
+        with metrics.stage('rtf_to_text', len(rtf_text)) as stage:
+            for chunk in rtf_to_text_chunks(rtf_text, stats=stats):
+                w.write(chunk)
+                stage.bytes_out += len(chunk)
+    if stats is not None:
+        active.split_stage('rtf_to_text', 'decode_hex', stats.decode_time)
+        for kind, count in stats.tokens.items():
+            active.add(f'tokens.{kind}', count)
+    metrics.add('files')
+
+
+def get_text_file_path(rtf_file):
     root, extension = os.path.splitext(rtf_file)
-    with open(f'{root}.txt', 'w', encoding='utf-8') as w:
-        w.write(content)
+    return f'{root}.txt'
 
 
-if __name__ == "__main__":
-    main(sys.argv[1])
+def convert_file(rtf_file, use_mmap=False):
+    # Convert a single RTF file; return the path of the text file written.
+    txt_file = get_text_file_path(rtf_file)
+    if not use_mmap:
+        with metrics.stage('read', os.path.getsize(rtf_file)) as stage:
+            with open(rtf_file, 'r', encoding='utf-8') as w:
+                in_rtf = w.read()
+            stage.bytes_out = len(in_rtf)
+        write_text(txt_file, in_rtf)
+    elif os.path.getsize(rtf_file) == 0:
+        # Empty files cannot be mapped.
+        write_text(txt_file, b'')
+    else:
+        with open(rtf_file, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as in_rtf:
+                write_text(txt_file, in_rtf)
+    return txt_file
+
+
+def collect_rtf_files(path):
+    # Return the sorted list of RTF files in a directory or matching a glob pattern.
+    if os.path.isdir(path):
+        candidates = [os.path.join(path, entry) for entry in os.listdir(path)]
+    else:
+        candidates = glob.glob(path, recursive=True)
+    rtf_files = []
+    for candidate in candidates:
+        if not os.path.isfile(candidate):
+            continue
+        if os.path.splitext(candidate)[1].lower() == RTF_EXTENSION:
+            rtf_files.append(candidate)
+    rtf_files.sort()
+    return rtf_files
+
+
+def check_manifest(manifest, rtf_file):
+    # Return the hash of the RTF file if it needs to be converted, or None if its text file is up to date.
+    source_hash = hash_file(rtf_file)
+    entry = manifest.get(os.path.abspath(rtf_file))
+    if entry is not None and entry['source'] == source_hash:
+        txt_file = get_text_file_path(rtf_file)
+        if os.path.isfile(txt_file) and hash_file(txt_file) == entry['output']:
+            return None
 
+    return source_hash
+
+
+def update_manifest(manifest, rtf_file, source_hash):
+    manifest.set(
+        os.path.abspath(rtf_file),
+        {'source': source_hash, 'output': hash_file(get_text_file_path(rtf_file))}
+    )
+
+
+def _convert_batch_item(rtf_file, use_mmap=False, collect_metrics=False):
+    # Worker function; errors are returned as text, so that a bad file does not stop the batch.
+    # With collect_metrics, the metrics of the file are returned for merging.
+    item_metrics = None
+    if collect_metrics:
+        item_metrics = metrics.enable()
+    try:
+        convert_file(rtf_file, use_mmap)
+    except Exception as ex:
+        return rtf_file, f'{type(ex).__name__}: {ex}', item_metrics
+    finally:
+        metrics.disable()
+    return rtf_file, None, item_metrics
+
+
+def convert_batch(rtf_files, workers=None, use_mmap=False, manifest=None):
+    # Convert the files in a process pool.
+    # Return a dict {rtf file: error message, UNCHANGED, or None}.
+    # The metrics of the worker processes are merged into the active metrics, if any.
+    results = dict.fromkeys(rtf_files)
+    source_hashes = {}
+    if manifest is not None:
+        for rtf_file in rtf_files:
+            source_hash = check_manifest(manifest, rtf_file)
+            if source_hash is None:
+                results[rtf_file] = UNCHANGED
+            else:
+                source_hashes[rtf_file] = source_hash
+        rtf_files = list(source_hashes)
+    if not rtf_files:
+        return results
+
+    active = metrics.get_active()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        items = executor.map(_convert_batch_item, rtf_files, repeat(use_mmap), repeat(active is not None))
+        for rtf_file, error, item_metrics in items:
+            results[rtf_file] = error
+            if item_metrics is not None:
+                active.merge(item_metrics)
+            if error is None and manifest is not None:
+                update_manifest(manifest, rtf_file, source_hashes[rtf_file])
+    return results
+
+
+def print_summary(results):
+    errors = 0
+    for rtf_file, error in results.items():
+        if error is None:
+            print(f'OK     {rtf_file}')
+        elif error is UNCHANGED:
+            print(f'--     {rtf_file}')
+        else:
+            errors += 1
+            print(f'FEHLER {rtf_file}: {error}')
+    print(f'{len(results)} Dateien verarbeitet, {errors} Fehler')
+    return errors
+
+
+def main_batch(path, workers=None, use_mmap=False, manifest_file=None):
+    manifest = None
+    if manifest_file:
+        manifest = Manifest(manifest_file)
+    results = convert_batch(collect_rtf_files(path), workers, use_mmap, manifest)
+    if manifest is not None:
+        manifest.write()
+    return print_summary(results)
+
+
+def main(rtf_file, use_mmap=False, manifest_file=None):
+    if not manifest_file:
+        convert_file(rtf_file, use_mmap)
+        return
+
+    manifest = Manifest(manifest_file)
+    source_hash = check_manifest(manifest, rtf_file)
+    if source_hash is not None:
+        convert_file(rtf_file, use_mmap)
+        update_manifest(manifest, rtf_file, source_hash)
+        manifest.write()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Convert RTF into plain text.')
+    parser.add_argument('path', help='RTF file, directory, or glob pattern')
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        default=None,
+        help='number of worker processes in batch mode (default: number of CPUs)'
+    )
+    parser.add_argument(
+        '--mmap',
+        action='store_true',
+        help='memory-map the RTF files and process them as bytes'
+    )
+    parser.add_argument(
+        '--manifest',
+        default=None,
+        help='manifest file for skipping unchanged RTF files'
+    )
+    parser.add_argument(
+        '--metrics',
+        default=None,
+        help='JSON file for the stage metrics'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='profile the run and print the hotspots'
+    )
+    args = parser.parse_args()
+    if args.metrics:
+        metrics.enable()
+    if os.path.isfile(args.path):
+        function, arguments = main, (args.path, args.mmap, args.manifest)
+    else:
+        function, arguments = main_batch, (args.path, args.workers, args.mmap, args.manifest)
+    if args.profile:
+        errors = metrics.profile(function, *arguments)
+    else:
+        errors = function(*arguments)
+    if args.metrics:
+        metrics.get_active().write(args.metrics)
+    if errors:
+        sys.exit(1)
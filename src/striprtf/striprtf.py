@@ -1,5 +1,6 @@
 import re
 import codecs
+import time
 
 """
 Taken from https://gist.github.com/gilsondev/7c1d2d753ddb522e7bc22511cfb08676
@@ -126,6 +127,35 @@ HYPERLINKS = re.compile(
     r"(\{\\field\{\s*\\\*\\fldinst\{.*HYPERLINK\s(\".*\")\}{2}\s*\{.*?\s+(.*?)\}{2,3})",
     re.IGNORECASE,
 )
+FIELD_START = re.compile(r"\{\\field\{", re.IGNORECASE)
+
+# PATTERN, with runs of plain text matched as a whole instead of one character
+# at a time; a backslash at the very end is still matched as a character.
+# In the bytes variant, runs of raw 8-bit characters get a group of their own,
+# because they are decoded like \'xx escapes.
+RUN_PATTERN = re.compile(
+    r"\\([a-z]{1,32})(-?\d{1,10})?[ ]?|\\'([0-9a-f]{2})|\\([^a-z])|([{}])|[\r\n]+|([^\\{}\r\n]+|.)",
+    re.IGNORECASE,
+)
+RUN_PATTERN_BYTES = re.compile(
+    rb"\\([a-z]{1,32})(-?\d{1,10})?[ ]?|\\'([0-9a-f]{2})|\\([^a-z])|([{}])|[\r\n]+|([\x80-\xff]+)|([^\\{}\r\n\x80-\xff]+|.)",
+    re.IGNORECASE,
+)
+
+# Group indexes of the run patterns, as returned by match.lastindex.
+WORD = 1
+WORD_ARG = 2
+HEX = 3
+SYMBOL = 4
+BRACE = 5
+RUN = 6
+RUN_BYTES = 7
+RAW_BYTES = 6
+# Tokens matched by [\r\n]+ have no group; their lastindex is None.
+
+
+PICT_BIN_LENGTH = re.compile(r"\d*")
+PICT_BIN_LENGTH_BYTES = re.compile(rb"\d*")
 
 
 def remove_pict_groups(rtf_text):
@@ -133,50 +163,312 @@ def remove_pict_groups(rtf_text):
     Remove all \\pict groups with binary data from the RTF text.
     If no binary-encoded \\pict groups are found, return the original text.
     See issue 58
+
+    The text is not scanned character by character: the positions of the next
+    \\pict, \\bin and closing brace are looked up with str.find, and the
+    untouched spans between the \\pict groups are copied as whole slices.
+    The text may be a str, or a bytes-like object such as mmap.
     """
+    if isinstance(rtf_text, str):
+        pict, binary, brace, bin_length = "\\pict", "\\bin", "}", PICT_BIN_LENGTH
+    else:
+        pict, binary, brace, bin_length = b"\\pict", b"\\bin", b"}", PICT_BIN_LENGTH_BYTES
     # Fast check to see if \pict and \bin exist together in the text
-    if "\\pict" not in rtf_text or "\\bin" not in rtf_text:
+    if rtf_text.find(pict) < 0 or rtf_text.find(binary) < 0:
         return rtf_text
     result = []  # Stores the final RTF text without binary-encoded \pict groups
     i = 0
     n = len(rtf_text)
-    in_pict = False  # Flag to track if we're inside a \pict group
-    binary_length = 0  # Length of binary data to skip
-
+    # Cached positions of the next \bin and closing brace, to keep the search linear
+    next_bin = -1
+    close = -1
     while i < n:
-        if not in_pict and rtf_text.startswith("\\pict", i):
-            # Start of a \pict group
-            in_pict = True
-            i += len("\\pict")  # Skip the \pict keyword
-            continue
+        start = rtf_text.find(pict, i)
+        if start < 0:
+            break
 
-        if in_pict:
-            if rtf_text.startswith("\\bin", i):
-                # Extract the length of binary data
-                i += len("\\bin")
-                length_str = ""
-                while i < n and rtf_text[i].isdigit():
-                    length_str += rtf_text[i]
-                    i += 1
-                binary_length = int(length_str)
+        # Copy everything up to the \pict keyword, then skip the group
+        result.append(rtf_text[i:start])
+        i = start + len(pict)
+        while True:
+            if close != n and close < i:
+                close = rtf_text.find(brace, i)
+                if close < 0:
+                    close = n
+            if next_bin != n and next_bin < i:
+                next_bin = rtf_text.find(binary, i)
+                if next_bin < 0:
+                    next_bin = n
+            if next_bin < close:
                 # Skip the binary data
-                i += binary_length
-                continue
-            elif rtf_text[i] == "}":
-                # End of the \pict group
-                in_pict = False
-                i += 1  # Skip the closing brace
-                continue
+                match = bin_length.match(rtf_text, next_bin + len(binary))
+                i = match.end() + int(match.group())
+            elif close < n:
+                # End of the \pict group; skip the closing brace
+                i = close + 1
+                break
+            else:
+                i = n
+                break
+
+    result.append(rtf_text[i:])
+    return rtf_text[:0].join(result)
+
+
+# Building blocks of HYPERLINKS, for the linear-time scanner in expand_hyperlinks.
+_HYPERLINK_TOKENS = dict(
+    field_start=FIELD_START,
+    fldinst=re.compile(r"\s*\\\*\\fldinst\{", re.IGNORECASE),
+    keyword=re.compile(r"HYPERLINK\s", re.IGNORECASE),
+    space=re.compile(r"\s"),
+    spaces=re.compile(r"\s*"),
+    newline=re.compile(r"\n"),
+    braces=re.compile(r"\}\}"),
+    quote_braces=re.compile(r"\"\}\}"),
+    quote='"',
+    open_brace="{",
+    close_brace="}",
+    open_paren="(",
+    close_paren=")",
+)
+_HYPERLINK_TOKENS_BYTES = {
+    key: (
+        re.compile(value.pattern.encode("ascii"), value.flags & re.IGNORECASE)
+        if isinstance(value, re.Pattern)
+        else value.encode("ascii")
+    )
+    for key, value in _HYPERLINK_TOKENS.items()
+}
+
+
+class _NextMatch:
+    """Finds the first match of a fixed-length pattern at or after a position.
+
+    The last result is kept, so that a series of queries with ascending
+    or descending positions scans each character about once.
+    """
+
+    def __init__(self, text, pattern, length):
+        self.text = text
+        self.pattern = pattern
+        self.length = length
+        self.pos = None  # Position of the last query
+        self.result = None  # Result of the last query; len(text) if there was no match
+
+    def __call__(self, pos):
+        if self.pos is not None:
+            if pos >= self.pos and self.result >= pos:
+                return self.result
+
+            if pos < self.pos:
+                # Only the span before the last query position needs to be searched
+                match = self.pattern.search(self.text, pos, self.pos + self.length - 1)
+                if match is not None:
+                    self.result = match.start()
+                self.pos = pos
+                return self.result
 
-        if not in_pict:
-            # Append characters outside \pict groups
-            result.append(rtf_text[i])
+        match = self.pattern.search(self.text, pos)
+        self.pos = pos
+        self.result = match.start() if match is not None else len(self.text)
+        return self.result
 
-        i += 1  # Move to the next character
 
-    return "".join(result)
+def expand_hyperlinks(text):
+    """
+    Append the target to \\field hyperlinks, as in link_text("http://link_dest").
+    The text may be a str, or a bytes-like object such as mmap.
+
+    The result is the same as substituting HYPERLINKS with "\\1(\\2)", but the
+    text is scanned in linear time, without backtracking. Every choice the
+    regular expression would make by backtracking depends only on the position
+    of the chosen keyword or quote, so the best candidate of each line is
+    determined once and cached.
+    """
+    tokens = _HYPERLINK_TOKENS if isinstance(text, str) else _HYPERLINK_TOKENS_BYTES
+    field = tokens["field_start"].search(text)
+    if field is None:
+        return text
+
+    n = len(text)
+    spaces = tokens["spaces"]
+    close_brace = tokens["close_brace"]
+    next_space = _NextMatch(text, tokens["space"], 1)
+    next_newline = _NextMatch(text, tokens["newline"], 1)
+    next_braces = _NextMatch(text, tokens["braces"], 2)
+    keyword_cache = {}  # line end: [lowest start scanned, (keyword, quote, end) or None]
+    quote_cache = {}  # line end: [lowest start scanned, (quote, end) or None]
+
+    def get_tail_end(start):
+        # Match "(.*?)\}{2,3}" at start; return the end or None.
+        braces = next_braces(start)
+        if braces == n or next_newline(start) < braces:
+            return None
+
+        if text[braces + 2 : braces + 3] == close_brace:
+            return braces + 3
+
+        return braces + 2
+
+    def get_end(quote):
+        # Match '"\}{2}\s*\{.*?\s+(.*?)\}{2,3}' at the closing quote; return the end or None.
+        # Of all the starts for "\s+", only the first one and the one at the line end can differ.
+        brace = spaces.match(text, quote + 3).end()
+        if text[brace : brace + 1] != tokens["open_brace"]:
+            return None
+
+        space = next_space(brace + 1)
+        if space == n:
+            return None
+
+        after_space = spaces.match(text, space).end()
+        end = get_tail_end(after_space)
+        if end is None:
+            newline = next_newline(brace + 1)
+            if after_space <= newline < n:
+                end = get_tail_end(spaces.match(text, newline).end())
+        return end
+
+    def find_quote(low, line_end):
+        # Return the last closing quote in [low, line_end) with a match end, or None.
+        state = quote_cache.setdefault(line_end, [line_end, None])
+        if state[1] is None and low < state[0]:
+            candidates = [
+                match.start()
+                for match in tokens["quote_braces"].finditer(text, low, state[0] + 2)
+            ]
+            for quote in reversed(candidates):
+                end = get_end(quote)
+                if end is not None:
+                    state[1] = (quote, end)
+                    break
+
+            state[0] = low
+        found = state[1]
+        if found is not None and found[0] >= low:
+            return found
+
+        return None
+
+    def find_keyword(low, line_end):
+        # Return the last "HYPERLINK" in [low, line_end] that can be completed, or None.
+        state = keyword_cache.setdefault(line_end, [line_end - 8, None])
+        if state[1] is None and low < state[0]:
+            candidates = [
+                match.start()
+                for match in tokens["keyword"].finditer(text, low, state[0] + 9)
+            ]
+            for keyword in reversed(candidates):
+                if text[keyword + 10 : keyword + 11] != tokens["quote"]:
+                    continue
+
+                if keyword + 9 < line_end:
+                    quote_line_end = line_end
+                else:
+                    quote_line_end = next_newline(keyword + 10)
+                found = find_quote(keyword + 11, quote_line_end)
+                if found is not None:
+                    state[1] = (keyword, *found)
+                    break
+
+            state[0] = low
+        found = state[1]
+        if found is not None and found[0] >= low:
+            return found
+
+        return None
+
+    pieces = []
+    pos = 0
+    while field is not None:
+        found = None
+        instruction = tokens["fldinst"].match(text, field.end())
+        if instruction is not None:
+            found = find_keyword(instruction.end(), next_newline(instruction.end()))
+        if found is None:
+            field = tokens["field_start"].search(text, field.start() + 1)
+            continue
+
+        keyword, quote, end = found
+        pieces.append(text[pos:end])
+        pieces.append(tokens["open_paren"])
+        pieces.append(text[keyword + 10 : quote + 1])
+        pieces.append(tokens["close_paren"])
+        pos = end
+        field = tokens["field_start"].search(text, end)
+    if not pieces:
+        return text
+
+    pieces.append(text[pos:])
+    return text[:0].join(pieces)
+
 
 FONTTABLE = re.compile(r"\\f(\d+).*?\\fcharset(\d+).*?([^;]+);")
+FONTTABLE_BYTES = re.compile(FONTTABLE.pattern.encode("ascii"))
+
+# Control word actions.
+DESTINATION = 0
+ANSICPG = 1
+SPECIAL = 2
+UC = 3
+U = 4
+FONT = 5
+DEFAULT_FONT = 6
+SUPPRESS = 7
+
+
+def _make_word_actions():
+    # Return {control word: (action, text)}; destinations take precedence.
+    actions = {word: (DESTINATION, None) for word in destinations}
+    actions.setdefault("ansicpg", (ANSICPG, None))
+    for word, text in specialchars.items():
+        actions.setdefault(word, (SPECIAL, text))
+    actions.setdefault("uc", (UC, None))
+    actions.setdefault("u", (U, None))
+    actions.setdefault("f", (FONT, None))
+    actions.setdefault("deff", (DEFAULT_FONT, None))
+    actions.setdefault("fonttbl", (SUPPRESS, None))
+    actions.setdefault("colortbl", (SUPPRESS, None))
+    return actions
+
+
+WORD_ACTIONS = _make_word_actions()
+WORD_ACTIONS_BYTES = {
+    word.encode("latin-1"): action for word, action in WORD_ACTIONS.items()
+}
+
+# Control symbols: text to output, or None for \*.
+SYMBOL_TEXTS = {char: text for char, text in specialchars.items() if len(char) == 1}
+SYMBOL_TEXTS["*"] = None
+SYMBOL_TEXTS_BYTES = {
+    char.encode("latin-1"): text for char, text in SYMBOL_TEXTS.items()
+}
+
+# Number of text fragments per chunk yielded by rtf_to_text_chunks.
+CHUNK_SIZE = 65536
+
+# Token kinds counted by `rtf_to_text_chunks`.
+TOKEN_KINDS = ("newline", "control_word", "hex", "control_symbol", "brace", "text")
+
+
+class ConversionStats:
+    """Statistics collected by `rtf_to_text_chunks` in its single pass.
+
+    Attributes
+    ----------
+    tokens : dict
+        token kind: number of tokens in the text, after removing the
+        \\pict groups and expanding the hyperlinks; plain text counts
+        one token per character, and raw 8-bit characters in bytes
+        input count as hex, as they are decoded like \\'xx escapes
+    decode_time : float
+        seconds spent decoding \\'xx escapes and raw 8-bit characters
+    """
+
+    def __init__(self):
+        self.tokens = dict.fromkeys(TOKEN_KINDS, 0)
+        self.decode_time = 0.0
+
 
 def rtf_to_text(text, encoding="cp1252", errors="strict"):
     """Converts the rtf text to plain text.
@@ -197,12 +489,51 @@ def rtf_to_text(text, encoding="cp1252", errors="strict"):
     str
         the converted rtf text as a python unicode string
     """
+    return "".join(rtf_to_text_chunks(text, encoding=encoding, errors=errors))
+
+
+def rtf_to_text_chunks(
+    text, encoding="cp1252", errors="strict", chunk_size=CHUNK_SIZE, stats=None
+):
+    """Converts the rtf text to plain text, yielding the result in chunks.
+
+    Parameters
+    ----------
+    text : str, bytes, or mmap
+        The rtf text. If given as bytes, the text is tokenized without decoding;
+        only \\'xx escapes and raw 8-bit characters are decoded, using the
+        codec of the current font.
+    encoding : str
+        See `rtf_to_text`.
+    errors : str
+        See `rtf_to_text`.
+    chunk_size : int
+        Number of text fragments collected before a chunk is yielded.
+        Fragments are runs of plain text, decoded hex runs, or special
+        characters.
+    stats : ConversionStats or None
+        If given, the tokens are counted and the decoding is timed there.
+
+    Yields
+    ------
+    str
+        consecutive pieces of the converted text; joined, they are equal
+        to the result of `rtf_to_text`.
+    """
+    binary = not isinstance(text, str)
+    if binary:
+        pattern, fonttable = RUN_PATTERN_BYTES, FONTTABLE_BYTES
+        word_actions, symbol_texts = WORD_ACTIONS_BYTES, SYMBOL_TEXTS_BYTES
+        run_group, raw_group, open_brace = RUN_BYTES, RAW_BYTES, b"{"
+    else:
+        pattern, fonttable = RUN_PATTERN, FONTTABLE
+        word_actions, symbol_texts = WORD_ACTIONS, SYMBOL_TEXTS
+        run_group, raw_group, open_brace = RUN, -1, "{"
+
     # Preprocess the RTF text to remove \pict groups
     text = remove_pict_groups(text)
 
-    text = re.sub(
-        HYPERLINKS, "\\1(\\2)", text
-    )  # captures links like link_text(http://link_dest)
+    text = expand_hyperlinks(text)  # captures links like link_text(http://link_dest)
     stack = []
     fonttbl = {}
     default_font = None
@@ -211,70 +542,101 @@ def rtf_to_text(text, encoding="cp1252", errors="strict"):
     suppress_output = False  # Whether this group (and all inside it) are "ignorable".
     ucskip = 1  # Number of ASCII characters to skip after a unicode character.
     curskip = 0  # Number of ASCII characters left to skip
-    hexes = None
-    out = ""
+    hexes = bytearray()  # Bytes of \'xx escapes and raw 8-bit characters to decode
+    decoders = {}  # Incremental decoders, by encoding
+    decoder = None  # Decoder for the current font, or None if to be looked up
+    out = []
 
     # Simplified font table regex
-    fonttbl_matches = FONTTABLE.findall(text)
+    fonttbl_matches = fonttable.findall(text)
     for font_id, fcharset, font_name in fonttbl_matches:
+        if binary:
+            font_id, fcharset, font_name = (
+                font_id.decode("latin-1"),
+                fcharset.decode("latin-1"),
+                font_name.decode("latin-1"),
+            )
         fonttbl[font_id] = {
             "name": font_name.strip(),
             "charset": fcharset,
             "encoding": charset_map.get(int(fcharset), encoding),
         }
-    for match in PATTERN.finditer(text):
-        word, arg, _hex, char, brace, tchar = match.groups()
-        if hexes and not _hex:
+    if stats is not None:
+        # Token kind by match.lastindex; plain text and raw 8-bit runs count per character.
+        token_kinds = {
+            None: "newline",
+            WORD: "control_word",
+            WORD_ARG: "control_word",
+            HEX: "hex",
+            SYMBOL: "control_symbol",
+            BRACE: "brace",
+            run_group: "text",
+        }
+        if binary:
+            token_kinds[raw_group] = "hex"
+        tokens = stats.tokens
+    for match in pattern.finditer(text):
+        if len(out) >= chunk_size:
+            yield "".join(out)
+            out.clear()
+        kind = match.lastindex
+        if stats is not None:
+            if kind == run_group or kind == raw_group:
+                tokens[token_kinds[kind]] += match.end() - match.start()
+            else:
+                tokens[token_kinds[kind]] += 1
+        if hexes and kind != HEX and kind != raw_group:
             # Decode accumulated hexes
-            out += bytes.fromhex(hexes).decode(
-                encoding=fonttbl.get(current_font, {"encoding": encoding}).get(
-                    "encoding", encoding
-                ),
-                errors=errors,
-            )
-            hexes = None
-        if brace:
-            curskip = 0
-            if brace == "{":
-                # Push state
-                stack.append((ucskip, ignorable, suppress_output))
-            elif brace == "}":
-                # Pop state
-                if stack:
-                    ucskip, ignorable, suppress_output = stack.pop()
-                # sample_3.rtf throws an IndexError because of stack being empty.
-                # don't know right now how this could happen, so for now this is
-                # a ugly hack to prevent it
-                else:
-                    ucskip = 0
-                    ignorable = True
-        elif char:  # \x (not a letter)
-            curskip = 0
-            if char in specialchars:
-                if char in sectionchars:
-                    current_font = default_font
-                if not ignorable:
-                    out += specialchars[char]
-            elif char == "*":
-                ignorable = True
-        elif word:  # \foo
+            if decoder is None:
+                font_encoding = fonttbl.get(current_font, {"encoding": encoding})[
+                    "encoding"
+                ]
+                decoder = decoders.get(font_encoding)
+                if decoder is None:
+                    decoder = decoders[font_encoding] = codecs.getincrementaldecoder(
+                        font_encoding
+                    )(errors)
+            if stats is None:
+                out.append(decoder.decode(hexes, True))
+            else:
+                start = time.perf_counter()
+                out.append(decoder.decode(hexes, True))
+                stats.decode_time += time.perf_counter() - start
+            hexes.clear()
+        if kind == run_group:
+            run = match.group(kind)
+            if curskip > 0:
+                skipped = min(curskip, len(run))
+                curskip -= skipped
+                run = run[skipped:]
+            if run and not ignorable and not suppress_output:
+                out.append(run.decode("latin-1") if binary else run)
+        elif kind == WORD or kind == WORD_ARG:  # \foo
             curskip = 0
-            if word in destinations:
+            action, word_text = word_actions.get(match.group(WORD), (None, None))
+            if action is None:
+                continue
+
+            arg = match.group(WORD_ARG)
+            if binary and arg is not None:
+                arg = arg.decode("latin-1")
+            if action == DESTINATION:
                 ignorable = True
             # http://www.biblioscape.com/rtf15_spec.htm#Heading8
-            elif word == "ansicpg":
+            elif action == ANSICPG:
                 encoding = f"cp{arg}"
                 try:
                     codecs.lookup(encoding)
                 except LookupError:
                     encoding = "utf8"
-            if ignorable or suppress_output:
+                decoder = None
+            elif ignorable or suppress_output:
                 pass
-            elif word in specialchars:
-                out += specialchars[word]
-            elif word == "uc":
+            elif action == SPECIAL:
+                out.append(word_text)
+            elif action == UC:
                 ucskip = int(arg)
-            elif word == "u":
+            elif action == U:
                 # because of https://github.com/joshy/striprtf/issues/6
                 if arg is None:
                     curskip = ucskip
@@ -282,30 +644,53 @@ def rtf_to_text(text, encoding="cp1252", errors="strict"):
                     c = int(arg)
                     if c < 0:
                         c += 0x10000
-                    out += chr(c)
+                    out.append(chr(c))
                     curskip = ucskip
-            elif word == "f":
+            elif action == FONT:
                 current_font = arg
-            elif word == "deff":
+                decoder = None
+            elif action == DEFAULT_FONT:
                 default_font = arg
-            elif word == "fonttbl":
-                suppress_output = True
-            elif word == "colortbl":
+            elif action == SUPPRESS:
                 suppress_output = True
-
-        elif _hex:  # \'xx
+        elif kind == HEX:  # \'xx
             if curskip > 0:
                 curskip -= 1
             elif not ignorable:
                 # Accumulate hex characters to decode later
-                if not hexes:
-                    hexes = _hex
-                else:
-                    hexes += _hex
-        elif tchar:
+                hexes.append(int(match.group(HEX), 16))
+        elif kind == raw_group:
+            # Raw 8-bit characters: decode them like \'xx escapes
+            run = match.group(kind)
             if curskip > 0:
-                curskip -= 1
-            elif not ignorable and not suppress_output:
-                out += tchar
+                skipped = min(curskip, len(run))
+                curskip -= skipped
+                run = run[skipped:]
+            if not ignorable:
+                hexes += run
+        elif kind == BRACE:
+            curskip = 0
+            if match.group(BRACE) == open_brace:
+                # Push state
+                stack.append((ucskip, ignorable, suppress_output))
+            # Pop state
+            elif stack:
+                ucskip, ignorable, suppress_output = stack.pop()
+            # sample_3.rtf throws an IndexError because of stack being empty.
+            # don't know right now how this could happen, so for now this is
+            # a ugly hack to prevent it
+            else:
+                ucskip = 0
+                ignorable = True
+        elif kind == SYMBOL:  # \x (not a letter)
+            curskip = 0
+            char = match.group(SYMBOL)
+            if char in symbol_texts:
+                symbol_text = symbol_texts[char]
+                if symbol_text is None:
+                    ignorable = True
+                elif not ignorable:
+                    out.append(symbol_text)
 
-    return out
+    if out:
+        yield "".join(out)
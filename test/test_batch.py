@@ -0,0 +1,95 @@
+from contextlib import redirect_stdout
+import io
+import os
+import tempfile
+
+from strip_rtf import collect_rtf_files
+from strip_rtf import convert_batch
+from strip_rtf import main_batch
+from test_bytes_input import RTF_IN
+
+import unittest
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.rtf_files = []
+        for i in range(4):
+            rtf_file = os.path.join(self.folder.name, f'genlog_{i}.rtf')
+            with open(rtf_file, 'w', encoding='utf-8') as f:
+                f.write(RTF_IN.replace('Mouse_Mickey_1928', f'Mouse_Mickey_{1928 + i}'))
+            self.rtf_files.append(rtf_file)
+
+        # Not UTF-8.
+        self.bad_file = os.path.join(self.folder.name, 'genlog_bad.rtf')
+        with open(self.bad_file, 'wb') as f:
+            f.write(b'{\\rtf1 \xff}')
+
+        os.mkdir(os.path.join(self.folder.name, 'sub.rtf'))
+        with open(os.path.join(self.folder.name, 'notes.txt'), 'w', encoding='utf-8') as f:
+            f.write('Kein RTF')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def read_texts(self):
+        texts = {}
+        for rtf_file in self.rtf_files:
+            with open(f'{os.path.splitext(rtf_file)[0]}.txt', encoding='utf-8') as f:
+                texts[rtf_file] = f.read()
+        return texts
+
+    def testCollect(self):
+        expected = self.rtf_files + [self.bad_file]
+        self.assertEqual(collect_rtf_files(self.folder.name), expected)
+        self.assertEqual(collect_rtf_files(os.path.join(self.folder.name, '*.rtf')), expected)
+        self.assertEqual(collect_rtf_files(os.path.join(self.folder.name, 'missing')), [])
+
+    def testResults(self):
+        results = convert_batch(collect_rtf_files(self.folder.name), workers=2)
+        self.assertEqual(list(results), self.rtf_files + [self.bad_file])
+        for rtf_file in self.rtf_files:
+            self.assertIsNone(results[rtf_file])
+
+        # The bad file is reported, without stopping the batch.
+        self.assertTrue(results[self.bad_file].startswith('UnicodeDecodeError: '))
+        self.assertEqual(len(self.read_texts()), 4)
+
+    def testSummary(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            errors = main_batch(self.folder.name, workers=2)
+        self.assertEqual(errors, 1)
+        lines = output.getvalue().split('\n')
+        self.assertEqual(lines[:4], [f'OK     {rtf_file}' for rtf_file in self.rtf_files])
+        self.assertTrue(lines[4].startswith(f'FEHLER {self.bad_file}: UnicodeDecodeError: '))
+        self.assertEqual(lines[5:], ['5 Dateien verarbeitet, 1 Fehler', ''])
+
+    def testWorkers(self):
+        # The output does not depend on the number of worker processes.
+        serial = convert_batch(self.rtf_files + [self.bad_file], workers=1)
+        expected = self.read_texts()
+        for rtf_file in self.rtf_files:
+            os.remove(f'{os.path.splitext(rtf_file)[0]}.txt')
+        parallel = convert_batch(self.rtf_files + [self.bad_file], workers=3)
+        self.assertEqual(parallel, serial)
+        self.assertEqual(self.read_texts(), expected)
+        self.assertIn('Mouse_Mickey_1931', expected[self.rtf_files[3]])
+
+    def testUnchanged(self):
+        # With a manifest, converted files are skipped in the next batch; the bad file is tried again.
+        manifest_file = os.path.join(self.folder.name, 'manifest.json')
+        with redirect_stdout(io.StringIO()):
+            main_batch(self.folder.name, 1, manifest_file=manifest_file)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            errors = main_batch(self.folder.name, 1, manifest_file=manifest_file)
+        self.assertEqual(errors, 1)
+        self.assertIn(f'--     {self.rtf_files[0]}\n', output.getvalue())
+        self.assertIn(f'FEHLER {self.bad_file}', output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
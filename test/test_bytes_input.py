@@ -0,0 +1,60 @@
+import mmap
+import os
+import tempfile
+
+from strip_rtf import convert_file
+from strip_rtf import sanitize_links
+from striprtf.striprtf import remove_pict_groups
+from striprtf.striprtf import rtf_to_text
+
+RTF_IN = r'''{\rtf1\ansi\deff0{\fonttbl{\f0\fswiss\fcharset0 Arial;}{\f1\fcharset204 Arial Cyr;}}
+\f0 $#K Mouse_Mickey_1928\par
+M\'fcller, Hans{\pict\bin3}}}}\par
+\uldb Mouse,Mickey,1928\plain\fs20 {\v Mouse_Mickey_1928>main}\par
+\uldb Reference\plain\fs20 {\v 2GNTK0>main@Reference.HLP}\par
+{\field{\*\fldinst{HYPERLINK "http://example.com"}}{\fldrslt{\ul Beispiel}}}\par
+\f1 \'c8\'e2\'e0\'ed\par
+}'''
+
+import unittest
+
+
+class Test(unittest.TestCase):
+
+    def testSanitizeLinks(self):
+        self.assertEqual(
+            sanitize_links(RTF_IN.encode('ascii')),
+            sanitize_links(RTF_IN).encode('ascii')
+        )
+
+    def testRemovePictGroups(self):
+        self.assertEqual(
+            remove_pict_groups(RTF_IN.encode('ascii')),
+            remove_pict_groups(RTF_IN).encode('ascii')
+        )
+
+    def testRtfToText(self):
+        self.assertEqual(
+            rtf_to_text(sanitize_links(RTF_IN.encode('ascii'))),
+            rtf_to_text(sanitize_links(RTF_IN))
+        )
+
+    def testRawHighBytes(self):
+        self.assertEqual(rtf_to_text(b'{\\rtf1 K\xf6ln}'), 'Köln')
+
+    def testMmap(self):
+        with tempfile.TemporaryDirectory() as folder:
+            rtf_file = os.path.join(folder, 'test.rtf')
+            with open(rtf_file, 'w', encoding='ascii') as f:
+                f.write(RTF_IN)
+            with open(convert_file(rtf_file), encoding='utf-8') as f:
+                expected = f.read()
+            with open(rtf_file, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as in_rtf:
+                    self.assertEqual(rtf_to_text(sanitize_links(in_rtf)), expected)
+            with open(convert_file(rtf_file, use_mmap=True), encoding='utf-8') as f:
+                self.assertEqual(f.read(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import tempfile
+import time
+
+from corpus_index import DOCUMENT_MISSING
+from corpus_index import IMAGE_MISSING
+from corpus_index import TOPIC_MISSING
+from corpus_index import CorpusIndex
+from corpus_index import write_document_notes
+
+import unittest
+
+RTF_HEADER = '{\\rtf1\\ansi\\ansicpg1252\\deff0\n{\\fonttbl{\\f0\\fswiss\\fcharset0 Arial;}}\n'
+
+MAIN_RTF = RTF_HEADER + '''\\page
+\\plain\\f0\\fs20 $#K Mouse_Mickey_1928\\par
+Mouse, Mickey\\par
+\\{bmc MICKEY.BMP\\}\\par
+\\{bmc MINNIE.BMP\\}\\par
+oo \\uldb Mouse_Minnie_1928\\plain\\fs20 {\\v Mouse_Minnie_1928>main}\\par
+Vater:\\par
+\\uldb Mouse_Marcus_1900\\plain\\fs20 {\\v Mouse_Marcus_1900>main}\\par
+Dokumente:\\par
+\\uldb Urkunde\\plain\\fs20 {\\v 2GNTK0>main@Urkunde1.HLP}\\par
+\\uldb Brief\\plain\\fs20 {\\v 2GNTK0>main@Brief.HLP}\\par
+\\page
+\\plain\\f0\\fs20 $#K Mouse_Minnie_1928\\par
+Mouse, Minnie\\par
+}
+'''
+
+DOCUMENT_RTF = RTF_HEADER + '''\\plain\\f0\\fs20 Geburtsurkunde\\par
+M\\'fcnchen\\par
+}
+'''
+
+
+def write_file(file_path, text):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.folder.name, 'helpdeco')
+        write_file(os.path.join(self.root, 'GENLOG.RTF'), MAIN_RTF)
+        write_file(os.path.join(self.root, 'docs', 'URKUNDE1.RTF'), DOCUMENT_RTF)
+        write_file(os.path.join(self.root, 'bmp', 'Mickey.bmp'), '')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def update(self):
+        index = CorpusIndex(self.root)
+        index.update(workers=0)
+        index.write()
+        return index
+
+    def testCheck(self):
+        index = self.update()
+        self.assertEqual(index.scanned, ['GENLOG.RTF', 'docs/URKUNDE1.RTF'])
+        self.assertEqual(
+            index.check(),
+            [
+                (TOPIC_MISSING, 'GENLOG.RTF', 'Mouse_Marcus_1900'),
+                (DOCUMENT_MISSING, 'GENLOG.RTF', 'Brief.HLP'),
+                (IMAGE_MISSING, 'GENLOG.RTF', 'MINNIE.BMP'),
+            ]
+        )
+
+    def testIncremental(self):
+        self.update()
+        index = self.update()
+        self.assertEqual(index.scanned, [])
+        self.assertEqual(len(index.check()), 3)
+
+        write_file(os.path.join(self.root, 'BRIEF.RTF'), DOCUMENT_RTF)
+        document = os.path.join(self.root, 'docs', 'URKUNDE1.RTF')
+        write_file(document, DOCUMENT_RTF.replace('Geburtsurkunde', 'Taufurkunde'))
+        stamp = time.time() + 10
+        os.utime(document, (stamp, stamp))
+        index = self.update()
+        self.assertEqual(index.scanned, ['BRIEF.RTF', 'docs/URKUNDE1.RTF'])
+        self.assertEqual(len(index.check()), 2)
+
+        # A touched file with the same content is not scanned again.
+        os.utime(document, (stamp + 10, stamp + 10))
+        self.assertEqual(self.update().scanned, [])
+
+        os.remove(document)
+        index = self.update()
+        self.assertEqual(sorted(index.manifest.entries), ['BRIEF.RTF', 'GENLOG.RTF'])
+        self.assertIn((DOCUMENT_MISSING, 'GENLOG.RTF', 'Urkunde1.HLP'), index.check())
+
+    def testScanError(self):
+        # A file that cannot be scanned is reported, and the others are indexed.
+        with open(os.path.join(self.root, 'BAD.RTF'), 'wb') as f:
+            f.write(b'{\\rtf1 \xff}')
+        index = self.update()
+        self.assertEqual(sorted(index.manifest.entries), ['GENLOG.RTF', 'docs/URKUNDE1.RTF'])
+        self.assertEqual(list(index.errors), ['BAD.RTF'])
+        self.assertTrue(index.errors['BAD.RTF'].startswith('UnicodeDecodeError: '))
+
+    def testDocumentNotes(self):
+        vault = os.path.join(self.folder.name, 'vault')
+        index = self.update()
+        writer = write_document_notes(index, vault)
+        self.assertEqual(writer.written, 1)
+        with open(os.path.join(vault, 'documents', 'Urkunde1.md'), 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'Geburtsurkunde\nMünchen\n')
+
+        # Unchanged documents with a note are not converted again.
+        index = self.update()
+        self.assertEqual(write_document_notes(index, vault).written, 0)
@@ -0,0 +1,82 @@
+from difflib import SequenceMatcher
+from itertools import combinations
+import random
+
+from duplicates import Candidate
+from duplicates import cologne_phonetic
+from duplicates import find_duplicates
+from duplicates import score_pair
+from parse_family_data import Person
+
+import unittest
+
+SURNAMES = ('Müller', 'Mueller', 'Möller', 'Schmidt', 'Schmitt', 'Meier', 'Mayr')
+GIVEN_NAMES = ('Hans', 'Hannes', 'Anna', 'Ana', 'Karl', 'Carl')
+FATHERS = (None, '[[Vater_1]]', '[[Vater_2]]')
+
+
+def make_person(name, birth=None, death=None, father=None):
+    person = Person()
+    person.name = name
+    person.birth = birth
+    person.death = death
+    person.father = father
+    return person
+
+
+def make_people(count, seed):
+    rnd = random.Random(seed)
+    people = {}
+    for i in range(count):
+        people[f'P_{i}'] = make_person(
+            f'{rnd.choice(SURNAMES)}, {rnd.choice(GIVEN_NAMES)}',
+            rnd.choice((None, f'{rnd.randint(1, 3)}.5.{rnd.randint(1800, 1803)}')),
+            rnd.choice((None, '1870', '1871')),
+            rnd.choice(FATHERS),
+        )
+    return people
+
+
+class Test(unittest.TestCase):
+
+    def testColognePhonetic(self):
+        self.assertEqual(cologne_phonetic('Müller-Lüdenscheidt'), '65752682')
+        self.assertEqual(cologne_phonetic('Wikipedia'), '3412')
+        self.assertEqual(cologne_phonetic('Breschnew'), '17863')
+        self.assertEqual(cologne_phonetic('Meier'), cologne_phonetic('Mayr'))
+        self.assertEqual(cologne_phonetic('Schmidt'), cologne_phonetic('Schmitt'))
+        self.assertEqual(cologne_phonetic(''), '')
+
+    def testFind(self):
+        people = {
+            'Mouse_Mickey_1928': make_person('Mouse, Mickey', '18.11.1928 in Hollywood'),
+            'Mouse_Micky_1928': make_person('Mouse, Micky', '18.11.1928 in Hollywood'),
+            'Mouse_Minnie_1928': make_person('Mouse, Minnie', '18.11.1928'),
+            'Mouse_Mickey_1950': make_person('Mouse, Mickey', '1950'),
+        }
+        candidates = find_duplicates(people)
+        self.assertEqual([pair for score, *pair in candidates], [['Mouse_Mickey_1928', 'Mouse_Micky_1928']])
+
+    def testBlocks(self):
+        # With a window covering the blocks, all pairs sharing a blocking key are found.
+        for seed in range(3):
+            people = make_people(200, seed)
+            candidates = {person_id: Candidate(person_id, person) for person_id, person in people.items()}
+            expected = {}
+            matcher = SequenceMatcher(autojunk=False)
+            for a, b in combinations(candidates.values(), 2):
+                if not set(a.get_blocking_keys()).intersection(b.get_blocking_keys()):
+                    continue
+
+                matcher.set_seq2(b.name)
+                score = score_pair(a, b, matcher)
+                if score is not None:
+                    expected[tuple(sorted((a.person_id, b.person_id)))] = score
+            found = {(person_id, other_id): score for score, person_id, other_id in find_duplicates(people, window=200)}
+            self.assertEqual(found, expected)
+
+    def testRanking(self):
+        candidates = find_duplicates(make_people(500, 1), window=10)
+        scores = [score for score, __, __ in candidates]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertTrue(candidates)
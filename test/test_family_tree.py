@@ -0,0 +1,72 @@
+from collections import deque
+import random
+
+from family_tree import PARENT
+from family_tree import FamilyTree
+from link_index import CHILD
+from link_index import SPOUSE
+from parse_family_data import Person
+from parse_family_data import parse_lines
+from test_link_index import TXT_IN
+
+import unittest
+
+
+def make_people(size, seed):
+    # Random pedigree with cycles, self links, and dangling links.
+    rnd = random.Random(seed)
+    people = {}
+    for i in range(size):
+        person = Person()
+        person.father = f'[[P{rnd.randrange(size + 2)}]]'
+        if rnd.random() < 0.7:
+            person.mother = f'[[P{rnd.randrange(size + 2)}]]'
+        people[f'P{i}'] = person
+    return people
+
+
+def reference_closure(edges, person_id, depth):
+    generations = {}
+    queue = deque([(person_id, 0)])
+    while queue:
+        current_id, generation = queue.popleft()
+        if depth is not None and generation >= depth:
+            continue
+
+        for next_id in edges.get(current_id, ()):
+            if next_id not in generations:
+                generations[next_id] = generation + 1
+                queue.append((next_id, generation + 1))
+    return generations
+
+
+class Test(unittest.TestCase):
+
+    def testSample(self):
+        tree = FamilyTree(parse_lines(TXT_IN.split('\n')))
+        self.assertEqual(tree.ancestors('Mouse_Mickey_1928'), {'Mouse_Marcus_1890': 1, 'Mouse_Mathilda_1895': 1})
+        self.assertEqual(tree.descendants('Mouse_Marcus_1890', 1), {'Mouse_Mickey_1928': 1, 'Mouse_Morty_1950?': 1})
+        self.assertEqual(tree.descendants('Mouse_Marcus_1890', 0), {})
+        self.assertEqual(
+            tree.relationship_path('Mouse_Minnie_1928', 'Mouse_Morty_1950?'),
+            [('Mouse_Mickey_1928', SPOUSE), ('Mouse_Marcus_1890', PARENT), ('Mouse_Morty_1950?', CHILD)]
+        )
+        self.assertEqual(tree.relationship_path('Mouse_Minnie_1928', 'Mouse_Minnie_1928'), [])
+        self.assertIsNone(tree.relationship_path('Mouse_Minnie_1928', 'Unbekannt'))
+
+    def testCachedClosure(self):
+        for seed in range(20):
+            people = make_people(60, seed)
+            tree = FamilyTree(people, cache_size=50)
+            rnd = random.Random(seed)
+            for __ in range(200):
+                person_id = f'P{rnd.randrange(60)}'
+                depth = rnd.choice((None, 1, 2, 3, 5))
+                self.assertEqual(
+                    tree.ancestors(person_id, depth),
+                    reference_closure(tree.parents, person_id, depth)
+                )
+                self.assertEqual(
+                    tree.descendants(person_id, depth),
+                    reference_closure(tree.children, person_id, depth)
+                )
@@ -0,0 +1,107 @@
+from contextlib import redirect_stdout
+import io
+import os
+import tempfile
+
+from gedcom import get_date_and_place
+from gedcom import get_name
+from gedcom import main
+from gedcom import write_gedcom
+from parse_family_data import iter_lines
+from parse_family_data import iter_people
+from parse_family_data import parse_lines
+from test_link_index import TXT_IN
+
+import unittest
+
+
+def get_gedcom(people):
+    f = io.StringIO()
+    writer = write_gedcom(f, people)
+    return f.getvalue(), writer
+
+
+class Test(unittest.TestCase):
+
+    def testStream(self):
+        ged, writer = get_gedcom(parse_lines(TXT_IN.split('\n')))
+        streamed, __ = get_gedcom(lambda: iter_people(iter_lines(io.StringIO(TXT_IN))))
+        self.assertEqual(ged, streamed)
+        self.assertEqual(writer.individuals, 6)
+        self.assertEqual(writer.families, 4)
+        self.assertTrue(ged.startswith('0 HEAD\n'))
+        self.assertTrue(ged.endswith('0 TRLR\n'))
+
+    def testFamilies(self):
+        ged, __ = get_gedcom(parse_lines(TXT_IN.split('\n')))
+        families = ged.split('0 @F')[1:]
+        families[-1] = families[-1].split('0 @I')[0]
+        self.assertEqual(families, [
+            '1@ FAM\n1 HUSB @I1@\n1 WIFE @I4@\n1 CHIL @I2@\n',
+            '2@ FAM\n1 HUSB @I2@\n1 WIFE @I6@\n',
+            # Only the father lists Mouse_Morty_1950?.
+            '3@ FAM\n1 HUSB @I1@\n1 CHIL @I3@\n',
+            '4@ FAM\n1 HUSB @I2@\n1 CHIL @I5@\n',
+        ])
+
+        # Mouse_Ferdie_1950 has no record.
+        self.assertTrue(ged.endswith('0 @I5@ INDI\n1 NAME Mouse_Ferdie_1950\n1 NOTE Kein Datensatz\n1 FAMC @F4@\n0 TRLR\n'))
+
+    def testMain(self):
+        # The file is read in two passes; a later record with the same ID replaces the first.
+        text = f'{TXT_IN}\n$#K Mouse_Minnie_1928\nMouse, Minni\noo [[Mouse,Mickey,1928]]\n'
+        expected, __ = get_gedcom(parse_lines(text.split('\n')))
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, 'genlog.txt')
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            with redirect_stdout(io.StringIO()):
+                main(file_path)
+            with open(os.path.join(folder, 'genlog.ged'), encoding='utf-8') as f:
+                self.assertEqual(f.read(), expected)
+        self.assertIn('1 NAME Minni /Mouse/\n', expected)
+
+    def testSubmitter(self):
+        ged, __ = get_gedcom({})
+        self.assertEqual(ged.split('0 TRLR')[0].split('1 CHAR UTF-8\n')[1], '1 SUBM @SUBM@\n0 @SUBM@ SUBM\n1 NAME cnv_genlog\n')
+
+    def testFamilyPointers(self):
+        # Each pointer of a FAM record to an individual has its back-pointer in the INDI record.
+        ged, __ = get_gedcom(parse_lines(TXT_IN.split('\n')))
+        links = set()
+        back_links = set()
+        for record in ged.split('\n0 ')[1:]:
+            lines = record.split('\n')
+            xref, tag = (lines[0].split(' ') + [''])[:2]
+            for line in lines[1:]:
+                level, pointer_tag, pointer = (line.split(' ') + ['', ''])[:3]
+                if tag == 'FAM' and pointer_tag in ('HUSB', 'WIFE'):
+                    links.add((pointer, 'FAMS', xref))
+                elif tag == 'FAM' and pointer_tag == 'CHIL':
+                    links.add((pointer, 'FAMC', xref))
+                elif tag == 'INDI' and pointer_tag in ('FAMS', 'FAMC'):
+                    back_links.add((xref, pointer_tag, pointer))
+        self.assertEqual(len(links), 9)
+        self.assertEqual(back_links, links)
+        self.assertIn('1 REFN Mouse_Mickey_1928\n1 FAMC @F1@\n1 FAMS @F2@\n1 FAMS @F4@\n', ged)
+
+    def testIndividual(self):
+        ged, __ = get_gedcom(parse_lines('$#K A_1\nA, Bert\nBauer\n* 1.2.1900 in Ulm\n+ nach 1950\n\nZeile 1\nx@y\n'.split('\n')))
+        self.assertIn(
+            '0 @I1@ INDI\n1 NAME Bert /A/\n1 REFN A_1\n1 OCCU Bauer\n'
+            '1 BIRT\n2 DATE 1 FEB 1900\n2 PLAC Ulm\n1 DEAT\n2 DATE (nach 1950)\n'
+            '1 NOTE Zeile 1\n2 CONT x@@y\n',
+            ged
+        )
+
+    def testDates(self):
+        self.assertEqual(get_date_and_place('18.11.1928 in Hollywood'), ('18 NOV 1928', 'Hollywood'))
+        self.assertEqual(get_date_and_place('11.1928'), ('NOV 1928', ''))
+        self.assertEqual(get_date_and_place('1928'), ('1928', ''))
+        self.assertEqual(get_date_and_place('unbekannt'), ('(unbekannt)', ''))
+        self.assertEqual(get_date_and_place('in Ulm'), ('(in Ulm)', ''))
+        self.assertEqual(get_date_and_place('30.13.1928'), ('(30.13.1928)', ''))
+
+    def testName(self):
+        self.assertEqual(get_name('Mouse, Mickey'), 'Mickey /Mouse/')
+        self.assertEqual(get_name('Mickey'), 'Mickey')
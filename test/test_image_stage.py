@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+
+from image_stage import COPIED
+from image_stage import MISSING
+from image_stage import UNCHANGED
+from image_stage import Image
+from image_stage import collect_images
+from image_stage import convert_bitmap
+from image_stage import convert_images
+from parse_family_data import parse_lines
+from test_parse_family_data import TXT_IN
+
+import unittest
+
+BITMAPS = {
+    'MICKEY.BMP': b'mickey',
+    'sub/Minnie.bmp': b'same',
+    'sub/MORTY.BMP': b'same',
+    'bad.bmp': b'bad',
+}
+
+
+def copy_bitmap(bmp_file, jpg_file):
+    if os.path.basename(bmp_file) == 'bad.bmp':
+        raise ValueError('bad bitmap')
+
+    shutil.copyfile(bmp_file, jpg_file)
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.bmp_folder = os.path.join(self.folder.name, 'bmp')
+        self.image_folder = os.path.join(self.folder.name, 'vault', 'images')
+        for file_name, data in BITMAPS.items():
+            file_path = os.path.join(self.bmp_folder, file_name)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, 'wb') as f:
+                f.write(data)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def convert(self, images, workers=0):
+        return convert_images(images, self.bmp_folder, self.image_folder, workers, copy_bitmap)
+
+    def testCollectImages(self):
+        people = parse_lines(TXT_IN.split('\n'))
+        images = collect_images(people)
+        self.assertEqual(images, sorted(set(person.image for person in people.values() if person.image)))
+
+    def testConvert(self):
+        images = ['Mickey.jpg', 'Minnie.jpg', 'Morty.jpg', 'Pluto.jpg', 'bad.jpg']
+        for workers in (0, 1):
+            shutil.rmtree(self.image_folder, ignore_errors=True)
+            self.assertEqual(
+                self.convert(images, workers),
+                {
+                    'Mickey.jpg': None,
+                    'Minnie.jpg': None,
+                    'Morty.jpg': COPIED,
+                    'Pluto.jpg': MISSING,
+                    'bad.jpg': 'ValueError: bad bitmap',
+                }
+            )
+            with open(os.path.join(self.image_folder, 'Morty.jpg'), 'rb') as f:
+                self.assertEqual(f.read(), b'same')
+
+    def testIncremental(self):
+        images = ['Mickey.jpg', 'Minnie.jpg', 'Morty.jpg']
+        self.convert(images)
+        self.assertEqual(set(self.convert(images).values()), {UNCHANGED})
+
+        with open(os.path.join(self.bmp_folder, 'MICKEY.BMP'), 'wb') as f:
+            f.write(b'changed')
+        os.remove(os.path.join(self.image_folder, 'Morty.jpg'))
+        self.assertEqual(
+            self.convert(images),
+            {'Mickey.jpg': None, 'Minnie.jpg': UNCHANGED, 'Morty.jpg': None}
+        )
+
+    @unittest.skipIf(Image is None, 'Pillow is not installed')
+    def testPillow(self):
+        bmp_file = os.path.join(self.bmp_folder, 'PICTURE.BMP')
+        Image.new('RGB', (4, 4), 'red').save(bmp_file, 'BMP')
+        self.assertEqual(convert_images(['Picture.jpg'], self.bmp_folder, self.image_folder, 0), {'Picture.jpg': None})
+        with Image.open(os.path.join(self.image_folder, 'Picture.jpg')) as image:
+            self.assertEqual(image.format, 'JPEG')
+
+    @unittest.skipIf(Image is None, 'Pillow is not installed')
+    def testFailedConversion(self):
+        # The temporary file is removed when the JPEG cannot be put in place.
+        bmp_file = os.path.join(self.bmp_folder, 'PICTURE.BMP')
+        Image.new('RGB', (4, 4), 'red').save(bmp_file, 'BMP')
+        jpg_file = os.path.join(self.folder.name, 'Picture.jpg')
+        os.mkdir(jpg_file)
+        with self.assertRaises(OSError):
+            convert_bitmap(bmp_file, jpg_file)
+        self.assertFalse(os.path.exists(f'{jpg_file}.tmp'))
@@ -0,0 +1,73 @@
+from link_index import CHILD_MISSING
+from link_index import DANGLING
+from link_index import PARENT_MISSING
+from link_index import SPOUSE_MISSING
+from link_index import LinkIndex
+from parse_family_data import parse_lines
+
+TXT_IN = '''Genlog
+$#K Mouse_Marcus_1890
+Mouse, Marcus
+oo [[Mouse_Mathilda_1895]]
+Kinder:
+[[Mouse_Mickey_1928]]
+[[Mouse_Morty_1950]]
+
+$#K Mouse_Mathilda_1895
+Mouse, Mathilda
+oo [[Mouse_Marcus_1890]]
+Kinder:
+[[Mouse_Mickey_1928]]
+
+$#K Mouse_Mickey_1928
+Mouse, Mickey
+oo [[Mouse_Minnie_1928]]
+Vater:
+[[Mouse_Marcus_1890]]
+Mutter:
+[[Mouse_Mathilda_1895]]
+Kinder:
+[[Mouse_Ferdie_1950]]
+
+$#K Mouse_Minnie_1928
+Mouse, Minnie
+oo Unbekannt
+
+$#K Mouse_Morty_1950?
+Mouse, Morty
+Vater:
+[[Mouse_Marcus_1890]]
+'''
+
+import unittest
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.index = LinkIndex(parse_lines(TXT_IN.split('\n')))
+
+    def testResolve(self):
+        self.assertEqual(self.index.resolve('[[Mouse_Mickey_1928]]'), 'Mouse_Mickey_1928')
+        self.assertEqual(self.index.resolve('[[Mouse_Morty_1950]]'), 'Mouse_Morty_1950?')
+        self.assertIsNone(self.index.resolve('[[Mouse_Ferdie_1950]]'))
+        self.assertIsNone(self.index.resolve('Unbekannt'))
+
+    def testAdjacency(self):
+        self.assertEqual(self.index.get_parents('Mouse_Mickey_1928'), ['Mouse_Marcus_1890', 'Mouse_Mathilda_1895'])
+        self.assertEqual(self.index.children['Mouse_Marcus_1890'], ['Mouse_Mickey_1928', 'Mouse_Morty_1950?'])
+        self.assertEqual(self.index.cited_as_child['Mouse_Mickey_1928'], ['Mouse_Marcus_1890', 'Mouse_Mathilda_1895'])
+        self.assertEqual(self.index.cited_as_parent['Mouse_Marcus_1890'], ['Mouse_Mickey_1928', 'Mouse_Morty_1950?'])
+        self.assertEqual(self.index.cited_as_spouse['Mouse_Minnie_1928'], ['Mouse_Mickey_1928'])
+
+    def testCheck(self):
+        issues = self.index.check()
+        self.assertEqual(sorted(issues), sorted([
+            (DANGLING, 'Mouse_Mickey_1928', 'Kind: [[Mouse_Ferdie_1950]]'),
+            (SPOUSE_MISSING, 'Mouse_Mickey_1928', 'Mouse_Minnie_1928'),
+        ]))
+        del self.index.children['Mouse_Marcus_1890']
+        issues = self.index.check()
+        self.assertIn((CHILD_MISSING, 'Mouse_Mickey_1928', 'Mouse_Marcus_1890'), issues)
+        self.assertIn((CHILD_MISSING, 'Mouse_Morty_1950?', 'Mouse_Marcus_1890'), issues)
+        self.assertNotIn(PARENT_MISSING, [issue[0] for issue in issues])
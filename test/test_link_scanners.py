@@ -0,0 +1,118 @@
+import random
+import re
+import time
+
+from strip_rtf import sanitize_links
+from striprtf.striprtf import HYPERLINKS
+from striprtf.striprtf import expand_hyperlinks
+
+# The help jumps, as regular expressions. sanitize_links produces the same
+# result as substituting them one after the other, but scans linearly.
+TOPIC_LINK = re.compile(r'\\uldb (.*?)\\plain\\fs20 \{\\v .*?>main\}')
+TOPIC_LINK_REPL = r'\\uldb [[\1\\plain\\fs20 ]]'
+DOCUMENT_LINK = re.compile(r'\\uldb .*?\\plain\\fs20 \{\\v .*?>main\@(.*?)\.HLP\}')
+DOCUMENT_LINK_REPL = r'\\uldb [[documents/\1.md]]'
+
+HELP_PIECES = [
+    '\\uldb ', '\\plain\\fs20 {\\v ', '>main}', '>main@', '.HLP}', 'Doc', 'x',
+    ' ', '\n', '\r', '}', '{', '\\', '>', '@', '.HLP',
+]
+FIELD_TEMPLATE = [
+    '{\\field{', ' ', '\\*\\fldinst{', 'a', 'HYPERLINK', ' ', '"', 'http://a.b', '"', '}}',
+    ' ', '{', 'b', ' ', 'c', '}}', '}',
+]
+FIELD_NOISE = [
+    'x', ' ', '\n', '\r', '\t', '"', '}', '}}', '{', '"}}', 'HYPERLINK ', 'hyperlink\n',
+    '{\\FIELD{', '\\*\\FldInst{',
+]
+
+
+def reference_sanitize_links(rtf_text):
+    rtf_text = TOPIC_LINK.sub(TOPIC_LINK_REPL, rtf_text)
+    return DOCUMENT_LINK.sub(DOCUMENT_LINK_REPL, rtf_text)
+
+
+def reference_expand_hyperlinks(text):
+    return re.sub(HYPERLINKS, '\\1(\\2)', text)
+
+
+def random_text(rng, pieces, length):
+    return ''.join(rng.choice(pieces) for _ in range(rng.randint(0, length)))
+
+
+def random_fields(rng):
+    # Field hyperlinks with pieces dropped and noise inserted.
+    pieces = []
+    for _ in range(rng.randint(1, 3)):
+        for piece in FIELD_TEMPLATE:
+            if rng.random() < 0.15:
+                continue
+
+            pieces.append(piece)
+            while rng.random() < 0.3:
+                pieces.append(rng.choice(FIELD_NOISE))
+    return ''.join(pieces)
+
+
+import unittest
+
+
+class Test(unittest.TestCase):
+
+    def testHelpLinksRandom(self):
+        rng = random.Random(5)
+        for _ in range(5000):
+            text = random_text(rng, HELP_PIECES, 25)
+            self.assertEqual(sanitize_links(text), reference_sanitize_links(text), repr(text))
+            self.assertEqual(
+                sanitize_links(text.encode('ascii')),
+                reference_sanitize_links(text).encode('ascii'),
+                repr(text)
+            )
+
+    def testHelpLinksSameLine(self):
+        # The second jump swallows the first link, as with the regular expressions.
+        text = (
+            '\\uldb A\\plain\\fs20 {\\v a>main} '
+            '\\uldb D\\plain\\fs20 {\\v d>main@D.HLP}\n'
+        )
+        self.assertEqual(sanitize_links(text), reference_sanitize_links(text))
+        self.assertEqual(sanitize_links(text), '\\uldb [[documents/D.md]]\n')
+
+    def testHyperlinksRandom(self):
+        rng = random.Random(6)
+        for _ in range(5000):
+            text = random_fields(rng)
+            self.assertEqual(expand_hyperlinks(text), reference_expand_hyperlinks(text), repr(text))
+            self.assertEqual(
+                expand_hyperlinks(text.encode('ascii')),
+                reference_expand_hyperlinks(text).encode('ascii'),
+                repr(text)
+            )
+
+    def testHyperlink(self):
+        text = (
+            '{\\field{\\*\\fldinst{HYPERLINK "http://example.com"}}'
+            '{\\fldrslt{\\ul Beispiel}}}'
+        )
+        self.assertEqual(expand_hyperlinks(text), f'{text}("http://example.com")')
+
+    def testAdversarialInput(self):
+        # Long unterminated lines make the regular expressions backtrack
+        # polynomially; the scanners must stay linear.
+        texts = [
+            '\\uldb ' * 20000 + '\\plain\\fs20 {\\v ' * 20000,
+            ('\\uldb x\\plain\\fs20 {\\v >main@' * 20000),
+            '{\\field{\\*\\fldinst{' + 'HYPERLINK "x"}}{ ' * 10000,
+            '{\\field{\\*\\fldinst{' * 10000 + 'HYPERLINK "' + '"}}{' * 10000,
+            '{\\field{\\*\\fldinst{HYPERLINK "' + '"}}{x ' * 10000 + '\n' + 'x' * 100000,
+        ]
+        for text in texts:
+            start = time.perf_counter()
+            sanitize_links(text)
+            expand_hyperlinks(text)
+            self.assertLess(time.perf_counter() - start, 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+import time
+
+import metrics
+from parse_family_data import parse_lines
+from strip_rtf import write_text
+from test_parse_family_data import TXT_IN
+
+import unittest
+
+
+class Test(unittest.TestCase):
+
+    def tearDown(self):
+        metrics.disable()
+
+    def testDisabled(self):
+        with metrics.stage('x', 10) as stage:
+            stage.bytes_out = 5
+        items = [1, 2]
+        self.assertIs(metrics.iter_stage('x', items), items)
+        metrics.add('x')
+        self.assertIsNone(metrics.get_active())
+
+    def testNestedStages(self):
+        active = metrics.enable()
+
+        def produce():
+            time.sleep(0.02)
+            yield 1
+
+        with metrics.stage('outer', 3) as stage:
+            self.assertEqual(list(metrics.iter_stage('inner', produce(), 'items')), [1])
+            stage.bytes_out = 2
+        outer = active.stages['outer']
+        inner = active.stages['inner']
+        self.assertGreaterEqual(inner['wall'], 0.02)
+        self.assertLess(outer['wall'], 0.02)
+        self.assertEqual((outer['bytes_in'], outer['bytes_out']), (3, 2))
+        self.assertEqual(inner['calls'], 2)
+        self.assertEqual(active.counters, {'items': 1})
+
+        other = metrics.Metrics()
+        other.add('items', 2)
+        with other.stage('inner'):
+            pass
+        active.merge(other)
+        self.assertEqual(active.stages['inner']['calls'], 3)
+        self.assertEqual(active.counters, {'items': 3})
+
+    def testPipeline(self):
+        active = metrics.enable()
+        parse_lines(TXT_IN.split('\n'))
+        self.assertEqual(active.counters['records'], 2)
+        with tempfile.TemporaryDirectory() as folder:
+            txt_file = os.path.join(folder, 'test.txt')
+            write_text(txt_file, "{\\rtf1 M\\'fcller\\par}")
+            report_file = os.path.join(folder, 'metrics.json')
+            active.write(report_file)
+            with open(report_file, encoding='utf-8') as f:
+                report = json.load(f)
+        self.assertEqual(report['stages']['rtf_to_text']['bytes_out'], len('Müller\n'))
+        self.assertEqual(report['counters']['tokens.hex'], 1)
+        self.assertEqual(report['stages']['decode_hex']['calls'], 1)
+        self.assertNotIn('count_tokens', report['stages'])
+        self.assertEqual(report['counters']['tokens.control_word'], 2)
+        self.assertEqual(report['counters']['files'], 1)
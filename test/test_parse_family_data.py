@@ -0,0 +1,231 @@
+from contextlib import redirect_stdout
+import io
+import os
+import tempfile
+
+from parse_family_data import LINK_CACHE_SIZE
+from parse_family_data import TEXT_FILE
+from parse_family_data import Person
+from parse_family_data import append_item
+from parse_family_data import get_link_title
+from parse_family_data import iter_lines
+from parse_family_data import iter_people
+from parse_family_data import main
+from parse_family_data import parse_lines
+from parse_family_data import print_people
+from parse_family_data import serialize_people
+from parse_family_data import set_link_cache_size
+from parse_family_data import write_obsidian_notes
+from parse_family_data import write_single_text_file
+
+TXT_IN = '''Genlog
+$#K Mouse_Mickey_1928
+Mouse, Mickey
+Schauspieler
+{bmc MICKEY.BMP}
+* 18.11.1928 in Hollywood
+oo [[Mouse,Minnie,1928]]
+Vater:
+[[Mouse,Marcus,1890]]
+Mutter:
+[[Mouse,Mathilda,1895]]
+Kinder:
+[[Mouse,Morty,1950]]
+[[Mouse,Ferdie,1950]]
+Dokumente:
+[[documents/Reference.md]]
+
+Erster Auftritt in Steamboat Willie.
+
+$#K Mouse_Minnie_1928
+Mouse, Minnie
+* 18.11.1928
++ unbekannt
+oo [[Mouse,Mickey,1928]]
+'''
+
+import unittest
+
+
+class ListPerson(Person):
+    # A subclass initializing the item attributes with lists, as Person did before it had __slots__.
+
+    def __init__(self):
+        super().__init__()
+        self.desc = []
+        self.children = []
+        self.documents = []
+        self.spouses = []
+
+
+class Test(unittest.TestCase):
+
+    def testParseLines(self):
+        people = parse_lines(TXT_IN.split('\n'))
+        self.assertEqual(list(people), ['Mouse_Mickey_1928', 'Mouse_Minnie_1928'])
+        mickey = people['Mouse_Mickey_1928']
+        self.assertEqual(mickey.name, 'Mouse, Mickey')
+        self.assertEqual(mickey.profession, 'Schauspieler')
+        self.assertEqual(mickey.image, 'MICKEY.jpg')
+        self.assertEqual(mickey.birth, '18.11.1928 in Hollywood')
+        self.assertEqual(mickey.father, '[[Mouse,Marcus,1890]]')
+        self.assertEqual(mickey.children, ['[[Mouse,Morty,1950]]', '[[Mouse,Ferdie,1950]]'])
+        self.assertEqual(mickey.documents, ['[[documents/Reference.md]]'])
+        self.assertEqual(mickey.desc, ['Erster Auftritt in Steamboat Willie.'])
+        self.assertEqual(people['Mouse_Minnie_1928'].death, 'unbekannt')
+
+    def testPersonItems(self):
+        # Records without items share the empty tuple.
+        person = Person()
+        for name in ('desc', 'children', 'documents', 'spouses'):
+            self.assertIs(getattr(person, name), ())
+        people = parse_lines(TXT_IN.split('\n'))
+        minnie = people['Mouse_Minnie_1928']
+        self.assertIs(minnie.children, ())
+        self.assertIs(minnie.documents, ())
+        self.assertEqual(minnie.spouses, ['[[Mouse,Mickey,1928]]'])
+        self.assertNotIn('Kinder', '\n'.join(minnie.get_record()))
+
+    def testAppendItem(self):
+        items = append_item((), 'a')
+        self.assertEqual(items, ['a'])
+        self.assertIs(append_item(items, 'b'), items)
+        self.assertEqual(items, ['a', 'b'])
+        self.assertEqual(append_item(('a',), 'b'), ['a', 'b'])
+
+    def testListPersonClass(self):
+        # The lists set by a subclass are appended to, and the records are the same.
+        people = parse_lines(TXT_IN.split('\n'))
+        list_people = parse_lines(TXT_IN.split('\n'), ListPerson)
+        for person_id, person in list_people.items():
+            self.assertIsInstance(person, ListPerson)
+            self.assertEqual(person.get_record(person_id), people[person_id].get_record(person_id))
+        mickey = list_people['Mouse_Mickey_1928']
+        self.assertEqual(mickey.desc, ['Erster Auftritt in Steamboat Willie.'])
+        self.assertEqual(list_people['Mouse_Minnie_1928'].children, [])
+
+        desc = []
+        person = ListPerson()
+        person.desc = desc
+        person.desc = append_item(person.desc, 'Text')
+        self.assertIs(person.desc, desc)
+
+    def testLinkCache(self):
+        # The memoized link helpers keep a bounded number of results.
+        for i in range(LINK_CACHE_SIZE + 10):
+            self.assertEqual(get_link_title(f'[[Mouse:Mickey?{i}]]'), f'MouseMickey{i}')
+        self.assertEqual(get_link_title.cache_info().currsize, LINK_CACHE_SIZE)
+
+    def testLinkCacheSize(self):
+        # The caches are sized from the number of records, and kept while the size is unchanged.
+        parse_lines(TXT_IN.split('\n'))
+        self.assertEqual(get_link_title.cache_info().maxsize, LINK_CACHE_SIZE)
+        try:
+            set_link_cache_size(100000)
+            self.assertEqual(get_link_title.cache_info().maxsize, 1 << 18)
+            self.assertEqual(get_link_title('[[Mouse:Mickey]]'), 'MouseMickey')
+            set_link_cache_size(90000)
+            self.assertEqual(get_link_title('[[Mouse:Mickey]]'), 'MouseMickey')
+            self.assertEqual(get_link_title.cache_info().hits, 1)
+        finally:
+            set_link_cache_size(0)
+        self.assertEqual(get_link_title.cache_info().maxsize, LINK_CACHE_SIZE)
+
+    def testIterLines(self):
+        for text in ('', 'a', 'a\n', 'a\n\nb', TXT_IN):
+            self.assertEqual(list(iter_lines(io.StringIO(text))), text.split('\n'))
+
+    def testStream(self):
+        people = parse_lines(TXT_IN.split('\n'))
+        records = iter_people(iter_lines(io.StringIO(TXT_IN)))
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, 'parsed.txt')
+            write_single_text_file(file_path, records)
+            with open(file_path, encoding='utf-8') as f:
+                self.assertEqual(f.read(), '\n'.join(serialize_people(people)))
+
+    def testDuplicateIds(self):
+        # The streamed output keeps the last record with an ID, at the position of the first.
+        text = TXT_IN.replace('$#K Mouse_Minnie_1928', '$#K Mouse_Mickey_1928', 1)
+        text = f'{text}\n$#K Mouse_Minnie_1928\nMouse, Minnie\n\n$#K Mouse_Mickey_1928\nMouse, Mickey\n'
+        people = parse_lines(text.split('\n'))
+        self.assertEqual(list(people), ['Mouse_Mickey_1928', 'Mouse_Minnie_1928'])
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, 'genlog.txt')
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            expected_file = os.path.join(folder, 'expected.txt')
+            write_single_text_file(expected_file, people)
+            main(file_path, TEXT_FILE)
+            with open(os.path.join(folder, 'genlog_parsed.txt'), encoding='utf-8') as f:
+                result = f.read()
+            with open(expected_file, encoding='utf-8') as f:
+                self.assertEqual(result, f.read())
+
+    def testPrintPeople(self):
+        people = parse_lines(TXT_IN.split('\n'))
+        expected = ''.join(f'{line}\n' for line in serialize_people(people))
+        for buffer_size in (1, 100, 1 << 16):
+            output = io.StringIO()
+            with redirect_stdout(output):
+                print_people(people, buffer_size)
+            self.assertEqual(output.getvalue(), expected)
+
+    def testEmpty(self):
+        self.assertEqual(serialize_people({}), ['0 Datensätze gefunden'])
+        output = io.StringIO()
+        with redirect_stdout(output):
+            print_people(iter(()))
+        self.assertEqual(output.getvalue(), '0 Datensätze gefunden\n')
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, 'parsed.txt')
+            write_single_text_file(file_path, {})
+            with open(file_path, encoding='utf-8') as f:
+                self.assertEqual(f.read(), '0 Datensätze gefunden')
+
+    def testIncrementalNotes(self):
+        people = parse_lines(TXT_IN.split('\n'))
+        with tempfile.TemporaryDirectory() as folder:
+            write_obsidian_notes(folder, people, incremental=True)
+            mickey = os.path.join(folder, 'Mouse_Mickey_1928.md')
+            minnie = os.path.join(folder, 'Mouse_Minnie_1928.md')
+            os.utime(mickey, (0, 0))
+            del people['Mouse_Minnie_1928']
+            write_obsidian_notes(folder, people, incremental=True)
+            self.assertEqual(os.path.getmtime(mickey), 0)
+            self.assertFalse(os.path.exists(minnie))
+            people['Mouse_Mickey_1928'].profession = 'Zeichentrickfigur'
+            write_obsidian_notes(folder, people, incremental=True)
+            self.assertNotEqual(os.path.getmtime(mickey), 0)
+
+    def testNoteMode(self):
+        # The notes get the mode of a file created by open(), not that of the temporary file.
+        people = parse_lines(TXT_IN.split('\n'))
+        with tempfile.TemporaryDirectory() as folder:
+            reference = os.path.join(folder, 'reference.txt')
+            with open(reference, 'w', encoding='utf-8'):
+                pass
+            for workers in (0, 2):
+                write_obsidian_notes(folder, people, workers=workers)
+                self.assertEqual(
+                    os.stat(os.path.join(folder, 'Mouse_Mickey_1928.md')).st_mode,
+                    os.stat(reference).st_mode
+                )
+
+    def testConcurrentNotes(self):
+        people = parse_lines(TXT_IN.split('\n'))
+        people['Mouse_Mickey_1928?'] = people['Mouse_Minnie_1928']
+        with tempfile.TemporaryDirectory() as folder:
+            writer = write_obsidian_notes(folder, people, workers=4)
+            self.assertEqual(writer.written, 2)
+            self.assertEqual(
+                writer.collisions,
+                [('Mouse_Mickey_1928', 'Mouse_Mickey_1928', 'Mouse_Mickey_1928?')]
+            )
+            self.assertEqual(sorted(os.listdir(folder)), ['Mouse_Mickey_1928.md', 'Mouse_Minnie_1928.md'])
+            with open(os.path.join(folder, 'Mouse_Mickey_1928.md'), encoding='utf-8') as f:
+                self.assertEqual(f.read(), '\n'.join(people['Mouse_Mickey_1928'].get_record()))
+
+
+if __name__ == "__main__":
+    unittest.main()
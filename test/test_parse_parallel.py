@@ -0,0 +1,69 @@
+import random
+
+from parse_family_data import parse_lines
+from parse_family_data import parse_text_parallel
+from parse_family_data import split_records
+from test_parse_family_data import TXT_IN
+from test_parse_schema import LINES
+from test_parse_schema import get_fields
+
+import unittest
+
+# Records ending with text that is taken up by the following record.
+TXT_CARRY = '''$#K A_1
+Mouse, Mickey
+Beruf
+Vater:
+[[B_2]]
+Text
+$#K B_2
+
+$#K C_3
+oo [[A_1]]
+$#K D_4
+Mouse, Minnie
+$#K A_1
+Vater:
+[[C_3]]'''
+
+
+class Test(unittest.TestCase):
+
+    def assert_same_people(self, text, workers=2, chunks_per_worker=4):
+        self.assertEqual(
+            get_fields(parse_text_parallel(text, workers=workers, chunks_per_worker=chunks_per_worker).items()),
+            get_fields(parse_lines(text.split('\n')).items()),
+            text
+        )
+
+    def testSplitRecords(self):
+        for parts in range(1, 20):
+            chunks = split_records(TXT_IN, parts)
+            self.assertEqual('\n'.join(chunks), TXT_IN)
+            for chunk in chunks[1:]:
+                self.assertTrue(chunk.startswith('$#K'))
+
+    def testSample(self):
+        self.assert_same_people(TXT_IN)
+
+    def testCarry(self):
+        self.assert_same_people(TXT_CARRY, workers=2, chunks_per_worker=8)
+
+    def testEmpty(self):
+        self.assertEqual(parse_text_parallel('', workers=2), {})
+
+    def testFuzz(self):
+        rnd = random.Random(1)
+        texts = []
+        for __ in range(50):
+            lines = ['$#K A_1']
+            for __ in range(rnd.randint(0, 20)):
+                lines.append(rnd.choice(('$#K A_1', '$#K B_2', '$#K C_3', '$#K ')))
+                lines.extend(rnd.choices(LINES, k=rnd.randint(0, 6)))
+            texts.append('\n'.join(lines))
+        for text in texts:
+            self.assert_same_people(text, workers=2, chunks_per_worker=rnd.randint(1, 8))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import random
+import sys
+
+from parse_family_data import EXPECT_CHILDREN
+from parse_family_data import EXPECT_DESC
+from parse_family_data import EXPECT_DOCUMENTS
+from parse_family_data import EXPECT_FATHER
+from parse_family_data import EXPECT_MOTHER
+from parse_family_data import EXPECT_NAME
+from parse_family_data import EXPECT_PROFESSION
+from parse_family_data import IMAGE_MARKER
+from parse_family_data import RECORD_MARKER
+from parse_family_data import Person
+from parse_family_data import append_item
+from parse_family_data import count_record_ids
+from parse_family_data import image_pattern
+from parse_family_data import iter_people
+from parse_family_data import iter_unique_people
+from parse_family_data import parse_lines
+from test_parse_family_data import TXT_IN
+
+import unittest
+
+
+def legacy_leave_state(state, person, text):
+    if state == EXPECT_NAME:
+        if text:
+            person.name = text.strip()
+    elif state == EXPECT_PROFESSION:
+        if text:
+            person.profession = text.strip()
+    elif state == EXPECT_DESC:
+        if text:
+            text = text.strip()
+            if text:
+                person.desc = append_item(person.desc, text)
+    elif state == EXPECT_FATHER:
+        if text:
+            person.father = sys.intern(text.strip())
+    elif state == EXPECT_MOTHER:
+        if text:
+            person.mother = sys.intern(text.strip())
+    elif state == EXPECT_CHILDREN:
+        if text:
+            person.children = [sys.intern(child) for child in text.split('\n')]
+    elif state == EXPECT_DOCUMENTS:
+        if text:
+            person.documents = [sys.intern(document) for document in text.split('\n')]
+
+
+def legacy_iter_people(lines, personClass=Person):
+    # The former parser, with a chain of startswith tests.
+    state = None
+    text = []
+    key = None
+    person = None
+    image = None
+    for line in lines:
+        if line.startswith(RECORD_MARKER):
+            if key:
+                yield key, person
+            person = personClass()
+            key = sys.intern(line[len(RECORD_MARKER):].strip())
+            legacy_leave_state(state, person, '')
+            state = EXPECT_NAME
+        elif line.startswith(IMAGE_MARKER):
+            image = image_pattern.search(line).group(1)
+            if image:
+                person.image = f'{image}.jpg'
+        elif line.startswith('oo'):
+            legacy_leave_state(state, person, '\n'.join(text))
+            state = EXPECT_DESC
+            text.clear()
+            person.spouses = append_item(person.spouses, sys.intern(line[2:].strip()))
+        elif line.startswith('*') and not person.birth:
+            legacy_leave_state(state, person, '\n'.join(text))
+            state = EXPECT_DESC
+            text.clear()
+            person.birth = line[1:].strip()
+        elif line.startswith('+') and not person.death:
+            legacy_leave_state(state, person, '\n'.join(text))
+            state = EXPECT_DESC
+            text.clear()
+            person.death = line[1:].strip()
+        elif line.startswith('Vater:'):
+            legacy_leave_state(state, person, '\n'.join(text))
+            state = EXPECT_FATHER
+            text.clear()
+        elif line.startswith('Mutter:'):
+            legacy_leave_state(state, person, '\n'.join(text))
+            state = EXPECT_MOTHER
+            text.clear()
+        elif line.startswith('Kinder:'):
+            legacy_leave_state(state, person, '\n'.join(text))
+            state = EXPECT_CHILDREN
+            text.clear()
+        elif line.startswith('Dokumente:'):
+            legacy_leave_state(state, person, '\n'.join(text))
+            state = EXPECT_DOCUMENTS
+            text.clear()
+        elif line and state == EXPECT_NAME:
+            legacy_leave_state(state, person, line)
+            state = EXPECT_PROFESSION
+            text.clear()
+        elif line and state == EXPECT_PROFESSION:
+            legacy_leave_state(state, person, line)
+            state = EXPECT_DESC
+            text.clear()
+        elif not line and state != EXPECT_NAME:
+            legacy_leave_state(state, person, '\n'.join(text))
+            state = EXPECT_DESC
+            text.clear()
+        else:
+            text.append(line)
+    if key:
+        yield key, person
+
+
+LINES = (
+    '$#K A_1', '$#K B_2', '$#K ', '$#K A_1 ', 'Mouse, Mickey', 'Beruf', '', '', '', ' ',
+    '{bmc MICKEY.BMP}', '{bmc .BMP}', 'oo [[B_2]]', 'oo', '* 1.2.1900', '*', '+ 1950', '+ ',
+    'Vater:', 'Mutter:', 'Kinder:', 'Dokumente:', 'Vater: [[X]]', '[[A_1]]', '[[documents/X.md]]',
+    'Text', '  Text  ', 'o', 'V', '$', '{', 'Verheiratet',
+)
+
+
+def get_fields(records):
+    return [(key, [getattr(person, name) for name in Person.__slots__]) for key, person in records]
+
+
+def parse(function, lines):
+    try:
+        return get_fields(function(lines))
+
+    except AttributeError as ex:
+        return type(ex)
+
+
+class Test(unittest.TestCase):
+
+    def testFuzz(self):
+        rnd = random.Random(1)
+        for __ in range(5000):
+            lines = rnd.choices(LINES, k=rnd.randint(0, 30))
+            if rnd.random() < 0.8:
+                lines.insert(0, '$#K A_1')
+            self.assertEqual(parse(iter_people, lines), parse(legacy_iter_people, lines), lines)
+
+    def testUniquePeople(self):
+        # Duplicate IDs are resolved as by parse_lines: the last record, at the position of the first.
+        rnd = random.Random(2)
+        for __ in range(5000):
+            lines = rnd.choices(LINES, k=rnd.randint(0, 30))
+            if rnd.random() < 0.8:
+                lines.insert(0, '$#K A_1')
+            self.assertEqual(
+                parse(lambda lines: iter_unique_people(iter_people(lines), count_record_ids(lines)), lines),
+                parse(lambda lines: parse_lines(lines).items(), lines),
+                lines
+            )
+
+    def testSample(self):
+        lines = TXT_IN.split('\n')
+        self.assertEqual(parse(iter_people, lines), parse(legacy_iter_people, lines))
+
+    def testSchema(self):
+        schema = dict(father='Father:', mother='Mother:', children='Children:', documents='Documents:', spouse='m.')
+        english = TXT_IN.replace('Vater:', 'Father:').replace('Mutter:', 'Mother:')
+        english = english.replace('Kinder:', 'Children:').replace('Dokumente:', 'Documents:').replace('oo ', 'm. ')
+        people = parse_lines(english.split('\n'), schema=schema)
+        self.assertEqual(
+            get_fields(people.items()),
+            get_fields(parse_lines(TXT_IN.split('\n')).items())
+        )
+
+    def testEmptyMarker(self):
+        with self.assertRaises(ValueError):
+            parse_lines([], schema=dict(spouse=''))
@@ -0,0 +1,128 @@
+from http.client import HTTPConnection
+import json
+import os
+import tempfile
+import threading
+
+from query_server import DESCENDANTS
+from query_server import NEIGHBOURS
+from query_server import PEDIGREE
+from query_server import PERSON
+from query_server import FamilyData
+from query_server import QueryError
+from query_server import make_server
+from query_server import parse_request
+from test_link_index import TXT_IN
+
+import unittest
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.txt_file = os.path.join(self.folder.name, 'genlog.txt')
+        self.write_text(TXT_IN)
+        self.data = FamilyData(self.txt_file)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def write_text(self, text):
+        with open(self.txt_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def get_view(self, *args):
+        return json.loads(self.data.get_view(*args))
+
+    def testParseRequest(self):
+        self.assertEqual(parse_request('/'), (None, None, None))
+        self.assertEqual(parse_request('/person/Mouse_Morty_1950%3F'), (PERSON, 'Mouse_Morty_1950?', None))
+        self.assertEqual(parse_request('/pedigree/X?depth=2'), (PEDIGREE, 'X', 2))
+        self.assertEqual(parse_request('/descendants/X'), (DESCENDANTS, 'X', 3))
+        for path in ('/unknown/X', '/person', '/pedigree/X?depth=0', '/pedigree/X?depth=x'):
+            with self.assertRaises(QueryError):
+                parse_request(path)
+
+    def testViews(self):
+        self.assertEqual(self.get_view(None), {'records': 5})
+        person = self.get_view(PERSON, 'Mouse_Mickey_1928')
+        self.assertEqual(person['father'], '[[Mouse_Marcus_1890]]')
+        self.assertEqual(person['spouses'], ['[[Mouse_Minnie_1928]]'])
+        self.assertTrue(person['text'].startswith('---\nID: Mouse_Mickey_1928\n'))
+
+        # A note title is accepted as well.
+        neighbours = self.get_view(NEIGHBOURS, 'Mouse_Morty_1950')
+        self.assertEqual(neighbours['id'], 'Mouse_Morty_1950?')
+        self.assertEqual(neighbours['parents'], ['[[Mouse_Marcus_1890]]'])
+
+        pedigree = self.get_view(PEDIGREE, 'Mouse_Mickey_1928', 2)
+        self.assertEqual(pedigree['generations'], [['[[Mouse_Marcus_1890]]', '[[Mouse_Mathilda_1895]]']])
+        descendants = self.get_view(DESCENDANTS, 'Mouse_Marcus_1890', 1)
+        self.assertEqual(descendants['generations'], [['[[Mouse_Mickey_1928]]', '[[Mouse_Morty_1950]]']])
+
+        with self.assertRaises(QueryError):
+            self.data.get_view(PERSON, 'Mouse_Ferdie_1950')
+
+    def testReload(self):
+        self.assertEqual(self.get_view(PERSON, 'Mouse_Minnie_1928')['name'], 'Mouse, Minnie')
+        self.write_text(TXT_IN.replace('Mouse, Minnie', 'Maus, Minni') + '\n')
+        self.data._checked = 0.0
+        self.assertEqual(self.get_view(PERSON, 'Mouse_Minnie_1928')['name'], 'Maus, Minni')
+
+    def testReloadError(self):
+        # The records loaded before are served, and the reload is tried again after the check interval.
+        with open(self.txt_file, 'wb') as f:
+            f.write(b'$#K \xff\n')
+        self.data._checked = 0.0
+        with self.assertLogs('query_server', 'ERROR') as logs:
+            self.assertEqual(self.get_view(PERSON, 'Mouse_Minnie_1928')['name'], 'Mouse, Minnie')
+
+            # Within the check interval, the file is not loaded again.
+            self.get_view(PERSON, 'Mouse_Minnie_1928')
+            self.data.check()
+        self.assertEqual(len(logs.records), 1)
+        self.assertNotEqual(self.data._checked, 0.0)
+
+        self.write_text(TXT_IN.replace('Mouse, Minnie', 'Maus, Minni'))
+        self.data._checked = 0.0
+        self.assertEqual(self.get_view(PERSON, 'Mouse_Minnie_1928')['name'], 'Maus, Minni')
+
+    def testServer(self):
+        server = make_server(self.data, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        connection = HTTPConnection('127.0.0.1', server.server_port)
+        try:
+            for path, status in (('/person/Mouse_Mickey_1928', 200), ('/person/Nobody', 404), ('/', 200)):
+                connection.request('GET', path)
+                response = connection.getresponse()
+                body = json.loads(response.read())
+                self.assertEqual(response.status, status)
+            self.assertEqual(body, {'records': 5})
+        finally:
+            connection.close()
+            server.shutdown()
+            server.server_close()
+
+    def testInternalError(self):
+
+        def fail(*args):
+            raise RuntimeError('kaputt')
+
+        self.data.get_view = fail
+        server = make_server(self.data, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        connection = HTTPConnection('127.0.0.1', server.server_port)
+        try:
+            with self.assertLogs('query_server', 'ERROR'):
+                connection.request('GET', '/')
+                response = connection.getresponse()
+                body = json.loads(response.read())
+            self.assertEqual(response.status, 500)
+            self.assertEqual(body, {'error': 'Interner Fehler'})
+        finally:
+            connection.close()
+            server.shutdown()
+            server.server_close()
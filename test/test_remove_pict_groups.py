@@ -0,0 +1,73 @@
+import random
+
+from striprtf.striprtf import remove_pict_groups
+
+RTF_IN = r'''{\rtf1 Vorher{\*\shppict{\pict\wmetafile8\picw10\bin6 }{}\x}}Nachher
+{\pict\bin3abc\bin2de}Ende'''
+RTF_OUT = r'''{\rtf1 Vorher{\*\shppict{}Nachher
+{Ende'''
+
+
+def reference_remove_pict_groups(rtf_text):
+    # The former character-by-character implementation.
+    if "\\pict" not in rtf_text or "\\bin" not in rtf_text:
+        return rtf_text
+    result = []
+    i = 0
+    n = len(rtf_text)
+    in_pict = False
+    while i < n:
+        if not in_pict and rtf_text.startswith("\\pict", i):
+            in_pict = True
+            i += len("\\pict")
+            continue
+        if in_pict:
+            if rtf_text.startswith("\\bin", i):
+                i += len("\\bin")
+                length_str = ""
+                while i < n and rtf_text[i].isdigit():
+                    length_str += rtf_text[i]
+                    i += 1
+                i += int(length_str)
+                continue
+            elif rtf_text[i] == "}":
+                in_pict = False
+                i += 1
+                continue
+        if not in_pict:
+            result.append(rtf_text[i])
+        i += 1
+    return "".join(result)
+
+
+import unittest
+
+
+class Test(unittest.TestCase):
+
+    def testPictGroups(self):
+        self.assertEqual(remove_pict_groups(RTF_IN), RTF_OUT)
+
+    def testNoBinary(self):
+        rtf = r'{\pict\wmetafile8 0123abcd}'
+        self.assertIs(remove_pict_groups(rtf), rtf)
+
+    def testUnterminated(self):
+        self.assertEqual(remove_pict_groups(r'a{\pict\bin2}}b'), 'a{')
+
+    def testRandomInput(self):
+        rng = random.Random(58)
+        pieces = ['\\pict', '\\bin', '\\bin0', '\\bin1', '\\bin12', '}', '{', 'x', '\\', '1', ' ']
+        for _ in range(2000):
+            rtf = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 30)))
+            try:
+                expected = reference_remove_pict_groups(rtf)
+            except ValueError:
+                with self.assertRaises(ValueError):
+                    remove_pict_groups(rtf)
+                continue
+            self.assertEqual(remove_pict_groups(rtf), expected, rtf)
+
+
+if __name__ == "__main__":
+    unittest.main()
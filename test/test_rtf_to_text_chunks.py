@@ -0,0 +1,29 @@
+from striprtf.striprtf import rtf_to_text
+from striprtf.striprtf import rtf_to_text_chunks
+
+RTF_IN = r'''{\rtf1\ansi\deff0{\fonttbl{\f0\fswiss\fcharset0 Arial;}}
+\f0 M\'fcller, Hans\par
+* 1.2.1850 in K\'f6ln\par
+\u8364?uro\tab{\*\comment hidden}sichtbar\par
+}'''
+TEXT_OUT = 'Müller, Hans\n* 1.2.1850 in Köln\n€uro\tsichtbar\n'
+
+import unittest
+
+
+class Test(unittest.TestCase):
+
+    def testWhole(self):
+        self.assertEqual(rtf_to_text(RTF_IN), TEXT_OUT)
+
+    def testChunks(self):
+        chunks = list(rtf_to_text_chunks(RTF_IN, chunk_size=3))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(''.join(chunks), TEXT_OUT)
+
+    def testEmpty(self):
+        self.assertEqual(list(rtf_to_text_chunks('')), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
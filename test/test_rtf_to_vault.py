@@ -0,0 +1,88 @@
+import os
+import signal
+import tempfile
+
+from parse_family_data import TEXT_FILE
+from parse_family_data import iter_chunk_lines
+import parse_family_data
+from rtf_to_vault import iter_threaded
+import rtf_to_vault
+import strip_rtf
+from test_bytes_input import RTF_IN
+
+import unittest
+
+
+def fail_after(count):
+    yield from range(count)
+    raise ValueError('bad data')
+
+
+def kill_converter(rtf_file, txt_file, use_mmap, chunks):
+    # Replaces the process function; the process dies without marking the end of the queue.
+    chunks.put('a\n')
+    chunks.close()
+    chunks.join_thread()
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+class Test(unittest.TestCase):
+
+    def testIterThreaded(self):
+        for count in (0, 1, 63, 64, 65, 1000):
+            self.assertEqual(list(iter_threaded(range(count))), list(range(count)))
+
+    def testError(self):
+        items = []
+        with self.assertRaises(ValueError):
+            for item in iter_threaded(fail_after(100)):
+                items.append(item)
+        self.assertEqual(items, list(range(100)))
+
+    def testEarlyStop(self):
+        # The producer must not block forever on the full queue.
+        items = iter_threaded(iter(range(100000)), queue_size=1, batch_size=1)
+        self.assertEqual(next(items), 0)
+        items.close()
+
+    def testConversionError(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with self.assertRaises(FileNotFoundError):
+                list(rtf_to_vault.iter_converted_chunks(os.path.join(folder, 'missing.rtf')))
+
+    def testKilledConverter(self):
+        convert_to_queue = rtf_to_vault._convert_to_queue
+        rtf_to_vault._convert_to_queue = kill_converter
+        try:
+            chunks = []
+            with self.assertRaises(ChildProcessError) as context:
+                for chunk in rtf_to_vault.iter_converted_chunks('missing.rtf'):
+                    chunks.append(chunk)
+        finally:
+            rtf_to_vault._convert_to_queue = convert_to_queue
+        self.assertEqual(chunks, ['a\n'])
+        self.assertIn(str(-signal.SIGKILL), str(context.exception))
+
+    def testIterChunkLines(self):
+        text = 'a\nbc\n\nd\n'
+        for size in range(1, len(text) + 1):
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            self.assertEqual(list(iter_chunk_lines(chunks)), text.split('\n'))
+        self.assertEqual(list(iter_chunk_lines([])), [''])
+
+    def testSameOutput(self):
+        rtf = RTF_IN.replace('\\uldb Reference', 'Vater:\\par\n\\uldb Reference')
+        with tempfile.TemporaryDirectory() as folder:
+            two_step = os.path.join(folder, 'two_step.rtf')
+            single_pass = os.path.join(folder, 'single_pass.rtf')
+            for rtf_file in (two_step, single_pass):
+                with open(rtf_file, 'w', encoding='utf-8') as f:
+                    f.write(rtf)
+            strip_rtf.main(two_step)
+            parse_family_data.main(os.path.join(folder, 'two_step.txt'), TEXT_FILE)
+            rtf_to_vault.main(single_pass, TEXT_FILE, keep_text=True)
+            for suffix in ('.txt', '_parsed.txt'):
+                with open(os.path.join(folder, f'two_step{suffix}'), encoding='utf-8') as f:
+                    expected = f.read()
+                with open(os.path.join(folder, f'single_pass{suffix}'), encoding='utf-8') as f:
+                    self.assertEqual(f.read(), expected)
@@ -0,0 +1,249 @@
+import codecs
+import random
+import re
+
+from striprtf.striprtf import CHUNK_SIZE
+from striprtf.striprtf import ConversionStats
+from striprtf.striprtf import FONTTABLE
+from striprtf.striprtf import FONTTABLE_BYTES
+from striprtf.striprtf import PATTERN
+from striprtf.striprtf import charset_map
+from striprtf.striprtf import destinations
+from striprtf.striprtf import expand_hyperlinks
+from striprtf.striprtf import remove_pict_groups
+from striprtf.striprtf import rtf_to_text
+from striprtf.striprtf import rtf_to_text_chunks
+from striprtf.striprtf import sectionchars
+from striprtf.striprtf import specialchars
+
+import unittest
+
+# Byte string variant of PATTERN, for RTF read as bytes.
+PATTERN_BYTES = re.compile(PATTERN.pattern.encode('ascii'), re.IGNORECASE)
+
+# Token kinds, by the index of the last PATTERN group matched.
+PATTERN_KINDS = {
+    None: 'newline',
+    1: 'control_word',
+    2: 'control_word',
+    3: 'hex',
+    4: 'control_symbol',
+    5: 'brace',
+    6: 'text',
+}
+
+
+def count_tokens(text):
+    # Counts the tokens by kind, one match per plain-text character;
+    # raw 8-bit characters in bytes input count as hex.
+    binary = not isinstance(text, str)
+    pattern = PATTERN_BYTES if binary else PATTERN
+    counts = dict.fromkeys(PATTERN_KINDS.values(), 0)
+    for match in pattern.finditer(text):
+        kind = PATTERN_KINDS[match.lastindex]
+        if binary and kind == 'text' and match.group(6)[0] > 0x7F:
+            kind = 'hex'
+        counts[kind] += 1
+    return counts
+
+
+def legacy_rtf_to_text_chunks(text, encoding="cp1252", errors="strict", chunk_size=CHUNK_SIZE):
+    # The former implementation, with one match per plain-text character.
+    binary = not isinstance(text, str)
+    if binary:
+        pattern, fonttable = PATTERN_BYTES, FONTTABLE_BYTES
+    else:
+        pattern, fonttable = PATTERN, FONTTABLE
+
+    # Preprocess the RTF text to remove \pict groups
+    text = remove_pict_groups(text)
+
+    text = expand_hyperlinks(text)  # captures links like link_text(http://link_dest)
+    stack = []
+    fonttbl = {}
+    default_font = None
+    current_font = None
+    ignorable = False  # Whether this group (and all inside it) are "ignorable".
+    suppress_output = False  # Whether this group (and all inside it) are "ignorable".
+    ucskip = 1  # Number of ASCII characters to skip after a unicode character.
+    curskip = 0  # Number of ASCII characters left to skip
+    hexes = None
+    out = []
+
+    # Simplified font table regex
+    fonttbl_matches = fonttable.findall(text)
+    for font_id, fcharset, font_name in fonttbl_matches:
+        if binary:
+            font_id, fcharset, font_name = (
+                font_id.decode("latin-1"),
+                fcharset.decode("latin-1"),
+                font_name.decode("latin-1"),
+            )
+        fonttbl[font_id] = {
+            "name": font_name.strip(),
+            "charset": fcharset,
+            "encoding": charset_map.get(int(fcharset), encoding),
+        }
+    for match in pattern.finditer(text):
+        if len(out) >= chunk_size:
+            yield "".join(out)
+            out.clear()
+        if binary:
+            word, arg, _hex, char, brace, tchar = [
+                group.decode("latin-1") if group is not None else None
+                for group in match.groups()
+            ]
+            if tchar and tchar > "\x7f":
+                # Raw 8-bit character: decode it like a \'xx escape
+                _hex = f"{ord(tchar):02x}"
+                tchar = None
+        else:
+            word, arg, _hex, char, brace, tchar = match.groups()
+        if hexes and not _hex:
+            # Decode accumulated hexes
+            out.append(
+                bytes.fromhex(hexes).decode(
+                    encoding=fonttbl.get(current_font, {"encoding": encoding}).get(
+                        "encoding", encoding
+                    ),
+                    errors=errors,
+                )
+            )
+            hexes = None
+        if brace:
+            curskip = 0
+            if brace == "{":
+                # Push state
+                stack.append((ucskip, ignorable, suppress_output))
+            elif brace == "}":
+                # Pop state
+                if stack:
+                    ucskip, ignorable, suppress_output = stack.pop()
+                # sample_3.rtf throws an IndexError because of stack being empty.
+                # don't know right now how this could happen, so for now this is
+                # a ugly hack to prevent it
+                else:
+                    ucskip = 0
+                    ignorable = True
+        elif char:  # \x (not a letter)
+            curskip = 0
+            if char in specialchars:
+                if char in sectionchars:
+                    current_font = default_font
+                if not ignorable:
+                    out.append(specialchars[char])
+            elif char == "*":
+                ignorable = True
+        elif word:  # \foo
+            curskip = 0
+            if word in destinations:
+                ignorable = True
+            # http://www.biblioscape.com/rtf15_spec.htm#Heading8
+            elif word == "ansicpg":
+                encoding = f"cp{arg}"
+                try:
+                    codecs.lookup(encoding)
+                except LookupError:
+                    encoding = "utf8"
+            if ignorable or suppress_output:
+                pass
+            elif word in specialchars:
+                out.append(specialchars[word])
+            elif word == "uc":
+                ucskip = int(arg)
+            elif word == "u":
+                # because of https://github.com/joshy/striprtf/issues/6
+                if arg is None:
+                    curskip = ucskip
+                else:
+                    c = int(arg)
+                    if c < 0:
+                        c += 0x10000
+                    out.append(chr(c))
+                    curskip = ucskip
+            elif word == "f":
+                current_font = arg
+            elif word == "deff":
+                default_font = arg
+            elif word == "fonttbl":
+                suppress_output = True
+            elif word == "colortbl":
+                suppress_output = True
+
+        elif _hex:  # \'xx
+            if curskip > 0:
+                curskip -= 1
+            elif not ignorable:
+                # Accumulate hex characters to decode later
+                if not hexes:
+                    hexes = _hex
+                else:
+                    hexes += _hex
+        elif tchar:
+            if curskip > 0:
+                curskip -= 1
+            elif not ignorable and not suppress_output:
+                out.append(tchar)
+
+    if out:
+        yield "".join(out)
+
+
+TOKENS = (
+    '\\par ', '\\par', '\\line', '\\tab', '\\page', '\\cell', '\\PAR ', '\\b0 ', '\\fs20 ',
+    '\\u8364?', '\\u-4064 ', '\\u', '\\uc0', '\\uc1 ', '\\uc2', '\\f0 ', '\\f1 ', '\\f2 ', '\\f9 ', '\\deff1',
+    '\\ansicpg1251', '\\ansicpg999', '\\*', '\\~', '\\-', '\\{', '\\}', '\\\\', '\\\n', '\\\'',
+    '\\comment ', '\\fonttbl', '\\info', "\\'e4", "\\'fc", "\\'c8", "\\'82", "\\'A0", "\\'9", '{', '}', '}',
+    '\n', '\r\n', ' ', 'a', 'Text ', 'M', '\xe4', '\xfc\xdf', '?', '.', '1',
+)
+FONTTBL = '{\\fonttbl{\\f0\\fswiss\\fcharset0 Arial;}{\\f1\\fcharset204 Arial Cyr;}{\\f2\\fcharset128 MS Mincho;}}'
+
+
+def convert(function, text, errors='strict'):
+    try:
+        return ''.join(function(text, errors=errors))
+
+    except (TypeError, ValueError, UnicodeDecodeError) as ex:
+        return type(ex)
+
+
+class Test(unittest.TestCase):
+
+    def check(self, text):
+        for errors in ('strict', 'ignore'):
+            self.assertEqual(
+                convert(rtf_to_text, text, errors),
+                convert(lambda t, errors: ''.join(legacy_rtf_to_text_chunks(t, errors=errors)), text, errors),
+                repr(text)
+            )
+
+    def testFuzz(self):
+        rnd = random.Random(1)
+        for __ in range(3000):
+            tokens = rnd.choices(TOKENS, k=rnd.randint(0, 40))
+            if rnd.random() < 0.5:
+                tokens.insert(0, FONTTBL)
+            if rnd.random() < 0.2:
+                tokens.append('\\')
+            text = ''.join(tokens)
+            self.check(text)
+            self.check(text.encode('latin-1'))
+
+    def testStats(self):
+        # The tokens counted while converting are those of the text without \pict groups, with the hyperlinks expanded.
+        rnd = random.Random(2)
+        for __ in range(1000):
+            tokens = rnd.choices(TOKENS, k=rnd.randint(0, 40))
+            tokens.insert(0, FONTTBL)
+            text = ''.join(tokens)
+            for rtf in (text, text.encode('latin-1')):
+                stats = ConversionStats()
+                try:
+                    converted = ''.join(rtf_to_text_chunks(rtf, errors='ignore', stats=stats))
+                except (TypeError, ValueError, UnicodeDecodeError):
+                    continue
+
+                self.assertEqual(converted, rtf_to_text(rtf, errors='ignore'))
+                self.assertEqual(stats.tokens, count_tokens(expand_hyperlinks(remove_pict_groups(rtf))), repr(rtf))
+                self.assertGreaterEqual(stats.decode_time, 0.0)
+
@@ -0,0 +1,123 @@
+import os
+import tempfile
+
+from parse_family_data import Person
+from parse_family_data import load_people
+from parse_family_data import parse_lines
+import metrics
+import parse_family_data
+from snapshot import Snapshot
+from snapshot import get_slots
+from test_parse_family_data import TXT_IN
+from test_parse_family_data import ListPerson
+
+import unittest
+
+
+def get_fields(people, personClass=Person):
+    return [(key, [getattr(person, name) for name in get_slots(personClass)]) for key, person in people.items()]
+
+
+class TaggedPerson(Person):
+    # A subclass adding a slot of its own.
+    __slots__ = ('tag',)
+
+    def __init__(self):
+        super().__init__()
+        self.tag = 'getaggt'
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.txt_file = os.path.join(self.folder.name, 'genlog.txt')
+        self.snapshot_file = os.path.join(self.folder.name, 'genlog.snapshot')
+        self.write_text(TXT_IN)
+
+    def tearDown(self):
+        metrics.disable()
+        self.folder.cleanup()
+
+    def write_text(self, text):
+        with open(self.txt_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def load(self):
+        # Return the people and the names of the stages run.
+        active = metrics.enable()
+        people = load_people(self.txt_file)
+        metrics.disable()
+        return people, set(active.stages)
+
+    def testSnapshot(self):
+        people = parse_lines(TXT_IN.split('\n'))
+        snapshot = Snapshot(self.snapshot_file, 'key')
+        self.assertFalse(snapshot.is_valid(Person))
+        self.assertIsNone(snapshot.load(Person))
+        snapshot.save(people, Person)
+        self.assertTrue(snapshot.is_valid(Person))
+        self.assertEqual(get_fields(snapshot.load(Person)), get_fields(people))
+        self.assertFalse(Snapshot(self.snapshot_file, 'other key').is_valid(Person))
+
+    def testSubclass(self):
+        # The slots of the base classes are stored as well.
+        self.assertEqual(get_slots(TaggedPerson), Person.__slots__ + ('tag',))
+        people = parse_lines(TXT_IN.split('\n'), TaggedPerson)
+        snapshot = Snapshot(self.snapshot_file, 'key')
+        snapshot.save(people, TaggedPerson)
+        self.assertFalse(snapshot.is_valid(Person))
+        loaded = snapshot.load(TaggedPerson)
+        self.assertEqual(get_fields(loaded, TaggedPerson), get_fields(people, TaggedPerson))
+        self.assertEqual(loaded['Mouse_Mickey_1928'].name, 'Mouse, Mickey')
+        self.assertEqual(loaded['Mouse_Mickey_1928'].tag, 'getaggt')
+
+    def testClassWithoutSlots(self):
+        people = parse_lines(TXT_IN.split('\n'), ListPerson)
+        with self.assertRaises(TypeError):
+            Snapshot(self.snapshot_file, 'key').save(people, ListPerson)
+
+        # load_people parses the text instead.
+        active = metrics.enable()
+        people = load_people(self.txt_file, ListPerson)
+        metrics.disable()
+        self.assertEqual(people['Mouse_Mickey_1928'].name, 'Mouse, Mickey')
+        self.assertIn('parse_lines', active.stages)
+        self.assertFalse(os.path.exists(self.snapshot_file))
+
+    def testLoadPeople(self):
+        expected = get_fields(parse_lines(TXT_IN.split('\n')))
+        people, stages = self.load()
+        self.assertEqual(get_fields(people), expected)
+        self.assertIn('parse_lines', stages)
+        self.assertTrue(os.path.isfile(self.snapshot_file))
+
+        people, stages = self.load()
+        self.assertEqual(get_fields(people), expected)
+        self.assertIn('load_snapshot', stages)
+        self.assertNotIn('parse_lines', stages)
+
+    def testInvalidation(self):
+        self.load()
+        self.write_text(TXT_IN.replace('Mouse, Mickey', 'Maus, Micky'))
+        people, stages = self.load()
+        self.assertIn('parse_lines', stages)
+        self.assertEqual(people['Mouse_Mickey_1928'].name, 'Maus, Micky')
+
+        version = parse_family_data.PARSER_VERSION
+        parse_family_data.PARSER_VERSION += 1
+        try:
+            people, stages = self.load()
+        finally:
+            parse_family_data.PARSER_VERSION = version
+        self.assertIn('parse_lines', stages)
+
+    def testDamagedSnapshot(self):
+        self.load()
+        with open(self.snapshot_file, 'rb') as f:
+            data = f.read()
+        with open(self.snapshot_file, 'wb') as f:
+            f.write(data[:len(data) // 2])
+        people, stages = self.load()
+        self.assertIn('parse_lines', stages)
+        self.assertEqual(list(people), ['Mouse_Mickey_1928', 'Mouse_Minnie_1928'])
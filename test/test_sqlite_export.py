@@ -0,0 +1,86 @@
+import io
+import sqlite3
+
+from parse_family_data import iter_lines
+from parse_family_data import iter_people
+from parse_family_data import parse_lines
+from sqlite_export import export_people
+from test_link_index import TXT_IN
+
+import unittest
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = sqlite3.connect(':memory:')
+
+    def tearDown(self):
+        self.connection.close()
+
+    def query(self, sql, *args):
+        return self.connection.execute(sql, args).fetchall()
+
+    def testExport(self):
+        exporter = export_people(self.connection, parse_lines(TXT_IN.split('\n')))
+        self.assertEqual(exporter.imported, 5)
+        self.assertEqual(
+            self.query("SELECT target FROM link WHERE person_id = ? AND kind = 'child' ORDER BY position", 'Mouse_Marcus_1890'),
+            [('Mouse_Mickey_1928',), ('Mouse_Morty_1950',)]
+        )
+
+        # Persons without a father link.
+        self.assertEqual(
+            self.query(
+                "SELECT id FROM person WHERE id NOT IN "
+                "(SELECT person_id FROM link WHERE kind = 'father') ORDER BY id"
+            ),
+            [('Mouse_Marcus_1890',), ('Mouse_Mathilda_1895',), ('Mouse_Minnie_1928',)]
+        )
+
+        # Plain text links have no target.
+        self.assertEqual(
+            self.query("SELECT target, text FROM link WHERE person_id = ?", 'Mouse_Minnie_1928'),
+            [(None, 'Unbekannt')]
+        )
+
+    def testUpsert(self):
+        export_people(self.connection, parse_lines(TXT_IN.split('\n')))
+        changed = TXT_IN.replace('Mouse, Minnie\n', 'Mouse, Minnie\n* 1928\n\nSchauspielerin\n')
+        changed = changed.replace('oo Unbekannt', 'oo [[Mouse_Mickey_1928]]')
+        exporter = export_people(self.connection, iter_people(iter_lines(io.StringIO(changed))), fts=True)
+        self.assertEqual((exporter.imported, exporter.unchanged), (1, 4))
+        self.assertEqual(self.query('SELECT count(*) FROM person'), [(5,)])
+        self.assertEqual(self.query('SELECT birth_year FROM person WHERE id = ?', 'Mouse_Minnie_1928'), [(1928,)])
+        self.assertEqual(
+            self.query("SELECT target FROM link WHERE person_id = ?", 'Mouse_Minnie_1928'),
+            [('Mouse_Mickey_1928',)]
+        )
+        self.assertEqual(
+            self.query("SELECT id FROM person_fts WHERE person_fts MATCH 'Schauspielerin'"),
+            [('Mouse_Minnie_1928',)]
+        )
+
+    def testExistingIndex(self):
+        # Once created, the full-text index is maintained by imports without fts, too.
+        export_people(self.connection, parse_lines(TXT_IN.split('\n')), fts=True)
+        changed = TXT_IN.replace('Mouse, Minnie\n', 'Mouse, Minnie\n* 1928\n\nSchauspielerin\n')
+        export_people(self.connection, parse_lines(changed.split('\n')))
+        exporter = export_people(self.connection, parse_lines(changed.split('\n')), fts=True)
+        self.assertEqual(exporter.imported, 0)
+        self.assertEqual(
+            self.query("SELECT id FROM person_fts WHERE person_fts MATCH 'Schauspielerin'"),
+            [('Mouse_Minnie_1928',)]
+        )
+
+    def testDuplicateIds(self):
+        records = [(person_id, person) for person_id, person in iter_people(TXT_IN.split('\n'))]
+        records.append(('Mouse_Marcus_1890', records[4][1]))
+        exporter = export_people(self.connection, records)
+        self.assertEqual(exporter.imported, 6)
+
+        # The last record wins.
+        self.assertEqual(
+            self.query("SELECT kind, target FROM link WHERE person_id = ?", 'Mouse_Marcus_1890'),
+            [('father', 'Mouse_Marcus_1890')]
+        )